@@ -2,7 +2,17 @@
 # https://chat.openai.com/
 
 from django.contrib import admin
-from .models import UtilityMeter, UtilityBill, ElectricityBill, WaterBill
+from .models import (
+    BillImage,
+    ElectricityBill,
+    ImageBlob,
+    MonthlyUsageRollup,
+    OcrCacheEntry,
+    OcrJob,
+    UtilityBill,
+    UtilityMeter,
+    WaterBill,
+)
 
 
 @admin.register(UtilityMeter)
@@ -30,3 +40,39 @@ class ElectricityBillAdmin(admin.ModelAdmin):
 class WaterBillAdmin(admin.ModelAdmin):
     list_display = ("id", "bill", "billed_m3")
     search_fields = ("bill__meter__meter_number",)
+
+
+@admin.register(MonthlyUsageRollup)
+class MonthlyUsageRollupAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "meter", "utility_type", "year", "month", "total_amount", "net_kwh", "consumption_m3", "bill_count", "updated_at")
+    list_filter = ("utility_type", "year")
+    search_fields = ("meter__meter_number", "user__username", "user__email")
+    readonly_fields = [f.name for f in MonthlyUsageRollup._meta.fields]
+
+
+@admin.register(OcrJob)
+class OcrJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "utility_type", "engine", "status", "attempts", "worker", "created_at", "finished_at")
+    list_filter = ("status", "engine", "utility_type")
+    search_fields = ("user__username", "user__email", "worker")
+
+
+@admin.register(OcrCacheEntry)
+class OcrCacheEntryAdmin(admin.ModelAdmin):
+    list_display = ("id", "engine", "options", "image_sha256", "hits", "created_at", "last_used_at")
+    list_filter = ("engine",)
+    search_fields = ("image_sha256",)
+
+
+@admin.register(ImageBlob)
+class ImageBlobAdmin(admin.ModelAdmin):
+    list_display = ("id", "sha256", "content_type", "width", "height", "original_size", "stored_size", "created_at", "last_used_at")
+    list_filter = ("content_type",)
+    search_fields = ("sha256",)
+
+
+@admin.register(BillImage)
+class BillImageAdmin(admin.ModelAdmin):
+    list_display = ("id", "bill", "position", "blob", "created_at")
+    search_fields = ("blob__sha256", "bill__meter__meter_number")
+    raw_id_fields = ("bill", "blob")
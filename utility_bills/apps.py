@@ -1,6 +1,8 @@
 # 2026-02-11 07:39 
 # https://chat.openai.com/
 
+import os
+
 from django.apps import AppConfig
 
 
@@ -8,3 +10,15 @@ class UtilityBillsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "utility_bills"
     verbose_name = "Utility Bills"
+
+    def ready(self) -> None:
+        from . import signals  # noqa: F401  (connects rollup maintenance receivers)
+        from .conf import app_setting
+
+        omp_limit = app_setting("OCR_TESSERACT_OMP_THREAD_LIMIT")
+        if omp_limit:
+            # Set once per process and inherited by every tesseract subprocess, so parallel images
+            # don't each spawn one OpenMP thread per core. A value already in the environment wins.
+            os.environ.setdefault("OMP_THREAD_LIMIT", str(omp_limit))
+        # PaddleOCR pre-warming is not started here: ready() also runs for migrate and every other
+        # management command. See services.ocr_engine.start_paddle_prewarm.
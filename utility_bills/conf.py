@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.conf import settings
+
+
+# Defaults for the app's optional settings. Override any of them in the project's
+# settings.py with the `UTILITY_BILLS_` prefix, e.g. UTILITY_BILLS_DASHBOARD_CACHE_TIMEOUT = 600.
+DEFAULTS: dict[str, Any] = {
+    # Cache alias (from settings.CACHES) used for computed dashboard statistics.
+    "DASHBOARD_CACHE_ALIAS": "default",
+    # Seconds a cached dashboard stays valid; None caches until invalidated, 0 disables caching.
+    "DASHBOARD_CACHE_TIMEOUT": 300,
+    # Tesseract binding: "tesserocr" (in-process, models loaded once), "pytesseract" (subprocess per image)
+    # or "auto" (tesserocr when installed).
+    "OCR_TESSERACT_BACKEND": "auto",
+    # Images OCR'd concurrently by Tesseract within one request; 1 = sequential, None = one per CPU core.
+    "OCR_TESSERACT_WORKERS": 1,
+    # OMP_THREAD_LIMIT set at startup unless already in the environment (1 is recommended when workers > 1); None leaves it.
+    "OCR_TESSERACT_OMP_THREAD_LIMIT": None,
+    # Longest side (px) images are decoded at; larger JPEGs are decoded at 1/2, 1/4 or 1/8 scale (draft mode),
+    # other formats are reduced right after decoding. None disables.
+    "OCR_DECODE_MAX_SIDE": 3000,
+    # Hard limit on the pixels of one decoded image (after draft mode); larger images are rejected. None disables.
+    "OCR_MAX_IMAGE_PIXELS": 25_000_000,
+    # Memory (MB, estimated at 8 bytes per decoded pixel) for images OCR'd concurrently in one process;
+    # further images wait for budget. None disables.
+    "OCR_MEMORY_BUDGET_MB": 512,
+    # Seconds an image waits for memory budget before OCR fails; None waits indefinitely.
+    "OCR_MEMORY_WAIT_TIMEOUT": 120,
+    # Image preprocessing before OCR, applied in order. Available: grayscale, autocrop, deskew, resize, binarize.
+    "OCR_PREPROCESS_STEPS": ["grayscale", "autocrop", "resize"],
+    # Height (px) the "resize" step downscales taller images to.
+    "OCR_PREPROCESS_TARGET_HEIGHT": 2000,
+    # Largest rotation (degrees, either direction) the "deskew" step searches.
+    "OCR_PREPROCESS_DESKEW_MAX_ANGLE": 5.0,
+    # Region-of-interest OCR: per-layout field boxes measured on the provider's bills (none are built in), e.g.
+    # {"electricity_detailed": {"label": "Official bill", "regions": [{"name": "meter", "box": [0, 0.12, 0.5, 0.155]}],
+    # "required_fields": ["meter_number"]}}. Only these layouts are offered on the upload form.
+    "OCR_LAYOUT_TEMPLATES": {},
+    # Layouts recognised from the OCR text besides (or replacing) services/classifiers.DEFAULT_LAYOUTS, e.g.
+    # {"acme_electricity": {"utility_type": "electricity", "keywords": {"ACME Power": 3, "kWh": 1}}}; "parser" defaults
+    # to the utility type.
+    "OCR_LAYOUTS": {},
+    # Mean word confidence (0..1) below which region OCR falls back to the full page.
+    "OCR_ROI_MIN_CONFIDENCE": 0.6,
+    # "auto" engine: images with a lower mean Tesseract confidence (0..1) are re-OCR'd with PaddleOCR.
+    "OCR_AUTO_MIN_CONFIDENCE": 0.75,
+    # "auto" engine: parsed fields per utility type that must be found, else remaining images are escalated too.
+    "OCR_AUTO_REQUIRED_FIELDS": {
+        "electricity": ["meter_number", "period_end", "import_previous", "import_current"],
+        "water": ["previous_reading", "current_reading"],
+    },
+    # Processes parsing the pages of large uploads in parallel; 1 = parse in the request's process.
+    "OCR_PARSE_WORKERS": 1,
+    # Pages an upload needs before its parsing is spread over the OCR_PARSE_WORKERS processes.
+    "OCR_PARSE_PARALLEL_MIN_PAGES": 64,
+    # Characters of one page's OCR text that are parsed; the rest is ignored. None disables.
+    "OCR_PARSE_MAX_CHARS": 100_000,
+    # Seconds parsing one upload's pages may take; pages not reached by then stay unparsed. None disables.
+    "OCR_PARSE_TIME_BUDGET": 5.0,
+    # Max PaddleOCR engines kept per language in each process (also the per-language concurrency limit).
+    "OCR_PADDLE_POOL_SIZE": 1,
+    # Seconds to wait for a free PaddleOCR engine before failing; None waits indefinitely.
+    "OCR_PADDLE_ACQUIRE_TIMEOUT": 120,
+    # Languages start_paddle_prewarm() loads in the background (OCR worker, opt-in web), e.g. ["ar", "en"].
+    "OCR_PADDLE_PREWARM_LANGS": [],
+    # Reuse stored OCR text for images whose bytes (and engine options) were seen before.
+    "OCR_CACHE_ENABLED": True,
+    # Max OcrCacheEntry rows; least recently used entries beyond this are evicted. None = unbounded.
+    "OCR_CACHE_MAX_ENTRIES": 5000,
+    # Evict after this many new entries per process (and with `manage.py evict_ocr_cache`); None = only the command.
+    "OCR_CACHE_EVICT_EVERY": 100,
+    # Keep the original uploaded images (content-addressed ImageBlob files in default storage) and link them to saved bills.
+    "OCR_STORE_ORIGINALS": True,
+    # How originals are stored: "original" bytes, or recompressed to "webp", "webp_lossless" or "png" when smaller.
+    "OCR_BLOB_FORMAT": "original",
+    # Quality of the lossy "webp" blob format.
+    "OCR_BLOB_WEBP_QUALITY": 90,
+    # Days bill images are kept after the bill was created (`manage.py purge_image_blobs`); None keeps them forever.
+    "OCR_BLOB_RETENTION_DAYS": None,
+    # Days an image that no bill links to (an upload never confirmed, or a deleted bill) is kept.
+    "OCR_BLOB_UNLINKED_RETENTION_DAYS": 7,
+    # Cache alias holding OCR admission slots and counters; use a shared cache (Redis, memcached, database)
+    # so the limits below apply across all server processes.
+    "OCR_ADMISSION_CACHE_ALIAS": "default",
+    # OCR uploads processed at once across the site; None = unlimited.
+    "OCR_MAX_CONCURRENT": 4,
+    # OCR uploads processed at once per user; None = unlimited.
+    "OCR_MAX_CONCURRENT_PER_USER": 1,
+    # Uploads waiting for a free slot; beyond this, requests are rejected with HTTP 429 immediately.
+    "OCR_MAX_QUEUED": 8,
+    # Seconds a queued upload waits for a slot before HTTP 429.
+    "OCR_QUEUE_WAIT_SECONDS": 15,
+    # Retry-After (seconds) sent with HTTP 429.
+    "OCR_RETRY_AFTER_SECONDS": 10,
+    # Seconds a slot is held at most (frees capacity held by crashed processes); keep above the slowest OCR run.
+    "OCR_ADMISSION_LEASE_SECONDS": 300,
+    # Cache alias holding OCR results between the confirm page and saving (must be shared by all processes).
+    "OCR_SESSION_CACHE_ALIAS": "default",
+    # Seconds an OCR result can be confirmed and saved after it was shown.
+    "OCR_SESSION_TIMEOUT": 3600,
+    # Run OCR uploads through the background job queue (`manage.py run_ocr_worker`) instead of in the request.
+    "OCR_ASYNC": False,
+    # A running OCR job whose worker hasn't finished it after this many seconds is handed to another worker.
+    "OCR_JOB_STALE_SECONDS": 600,
+    # Claims per job before it is marked failed (protects against images that crash the worker).
+    "OCR_JOB_MAX_ATTEMPTS": 3,
+    # `manage.py expire_ocr_jobs` fails jobs not finished this many seconds after upload and deletes their images.
+    "OCR_JOB_EXPIRE_SECONDS": 86400,
+}
+
+
+def app_setting(name: str) -> Any:
+    """Return `settings.UTILITY_BILLS_<name>` or the app default (read lazily)."""
+    return getattr(settings, f"UTILITY_BILLS_{name}", DEFAULTS[name])
@@ -4,12 +4,13 @@
 from __future__ import annotations
 
 from decimal import Decimal
-from typing import Any
+from typing import Any, Optional
 
 from django import forms
 from django.core.exceptions import ValidationError
 
 from .models import UtilityType
+from .services.layout_templates import layout_template_choices
 
 
 class DashboardFilterForm(forms.Form):
@@ -104,10 +105,41 @@ class MultipleFileInput(forms.FileInput):
         super().__init__(attrs=default_attrs)
 
 
+class MultipleFileField(forms.FileField):
+    """FileField that validates every file of a multi-file upload."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        kwargs.setdefault("widget", MultipleFileInput())
+        super().__init__(*args, **kwargs)
+
+    def clean(self, data: Any, initial: Any = None) -> Any:
+        single_file_clean = super().clean
+        if isinstance(data, (list, tuple)):
+            return [single_file_clean(d, initial) for d in data] or single_file_clean(None, initial)
+        return single_file_clean(data, initial)
+
+
 class OcrUploadForm(forms.Form):
     utility_type = forms.ChoiceField(choices=UtilityType.choices)
-    engine = forms.ChoiceField(choices=[("tesseract", "Tesseract"), ("paddleocr", "PaddleOCR")])
-    images = forms.FileField(widget=MultipleFileInput(attrs={"accept": "image/*"}))
+    engine = forms.ChoiceField(
+        choices=[
+            ("auto", "Auto (Tesseract, PaddleOCR only when needed)"),
+            ("tesseract", "Tesseract"),
+            ("paddleocr", "PaddleOCR"),
+        ]
+    )
+    # Known layouts let Tesseract read only the field regions instead of the whole page.
+    layout = forms.ChoiceField(choices=[("", "Unknown (full page)")], required=False)
+    images = MultipleFileField(widget=MultipleFileInput(attrs={"accept": "image/*"}))
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        # Only layouts with configured field regions; without any, every page is OCR'd in full.
+        layouts = layout_template_choices()
+        if layouts:
+            self.fields["layout"].choices = [("", "Unknown (full page)"), *layouts]
+        else:
+            del self.fields["layout"]
 
 
 class OcrConfirmElectricityForm(forms.Form):
@@ -131,9 +163,8 @@ class OcrConfirmElectricityForm(forms.Form):
     network_services_fees = forms.DecimalField(max_digits=12, decimal_places=3, required=False)
     fixed_subsidy_amount = forms.DecimalField(max_digits=12, decimal_places=3, required=False)
 
-    # Hidden fields for OCR metadata
-    ocr_engine = forms.CharField(max_length=32, widget=forms.HiddenInput())
-    raw_ocr_text = forms.CharField(widget=forms.HiddenInput(), required=False)
+    # Token of the server-side OCR session (OCR text, engine, parsed fields, original images).
+    ocr_token = forms.CharField(max_length=64, widget=forms.HiddenInput())
 
     def clean(self) -> dict[str, Any]:
         cleaned = super().clean()
@@ -156,10 +187,15 @@ class OcrConfirmElectricityForm(forms.Form):
 
         return cleaned
 
-    def compute_needs_review(self, meter_found: bool) -> tuple[bool, list[str]]:
+    def compute_needs_review(
+        self, meter_found: bool, parsed: Optional[dict[str, Any]] = None
+    ) -> tuple[bool, list[str]]:
         """
         Determine if the bill needs manual review and return reasons.
 
+        `parsed` is the OCR parse from the server-side session; readings the OCR didn't find
+        were typed in by hand and can't be checked against the bill image.
+
         Returns:
             (needs_review, reasons) tuple
         """
@@ -168,6 +204,11 @@ class OcrConfirmElectricityForm(forms.Form):
         if not meter_found:
             reasons.append("Meter not found in user's registered meters")
 
+        if parsed is not None:
+            missing = [f for f in ("import_previous", "import_current") if parsed.get(f) is None]
+            if missing:
+                reasons.append(f"Not found by OCR, entered manually: {', '.join(missing)}")
+
         # Check billed_kwh vs computed net_kwh
         import_prev = self.cleaned_data.get("import_previous")
         import_cur = self.cleaned_data.get("import_current")
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from ...services.parser_benchmark import (
+    benchmark_environment,
+    compare_reports,
+    generate_corpus,
+    load_corpus,
+    run_parser_benchmark,
+    run_worst_case_benchmark,
+    save_corpus,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark parse_electricity_text, parse_water_text and classify_layout on a synthetic corpus "
+        "of Arabic/English bill texts: throughput, p50/p99 latency and field/layout accuracy, as JSON. "
+        "--worst-case times them on adversarial inputs of growing size instead."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--docs", type=int, default=2000, help="Documents to generate (default 2000).")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed; the same seed gives the same corpus.")
+        parser.add_argument(
+            "--arabic-digits", type=float, default=0.5, help="Share of documents with Arabic-Indic digits (default 0.5)."
+        )
+        parser.add_argument("--noise", type=float, default=0.3, help="Chance of a noise line after each line (default 0.3).")
+        parser.add_argument(
+            "--corruption", type=float, default=0.0,
+            help="Chance of OCR-style corruption per confusable character, e.g. 0.02 (default 0).",
+        )
+        parser.add_argument("--repeat", type=int, default=3, help="Timed runs per document (default 3).")
+        parser.add_argument("--corpus", help="Benchmark this JSON-lines corpus instead of generating one.")
+        parser.add_argument("--save-corpus", help="Write the generated corpus to this JSON-lines file and exit.")
+        parser.add_argument("--output", help="Write the JSON report to this file as well.")
+        parser.add_argument("--compare", help="Baseline report (from --output) to compare against.")
+        parser.add_argument(
+            "--worst-case", action="store_true",
+            help="Time adversarial inputs at growing sizes and report how the time grows, instead of the corpus.",
+        )
+        parser.add_argument(
+            "--sizes", default="10000,40000,160000",
+            help="Comma-separated input sizes (characters) for --worst-case (default 10000,40000,160000).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["docs"] < 1 or options["repeat"] < 1:
+            raise CommandError("--docs and --repeat must be >= 1")
+        for opt in ("arabic_digits", "noise", "corruption"):
+            if not 0 <= options[opt] <= 1:
+                raise CommandError(f"--{opt.replace('_', '-')} must be between 0 and 1")
+        if options["worst_case"]:
+            self._worst_case(options)
+            return
+
+        settings = {k: options[k] for k in ("docs", "seed", "arabic_digits", "noise", "corruption")}
+        corpus = generate_corpus(**settings)
+        if options["save_corpus"]:
+            count = save_corpus(corpus, options["save_corpus"])
+            self.stdout.write(f"Wrote {count} documents to {options['save_corpus']}")
+            return
+        if options["corpus"]:
+            if not Path(options["corpus"]).is_file():
+                raise CommandError(f"No corpus file at {options['corpus']}")
+            corpus = load_corpus(options["corpus"])
+            settings = {"file": options["corpus"]}
+
+        report: dict[str, Any] = {**benchmark_environment(), "corpus": settings}
+        report.update(run_parser_benchmark(corpus, repeat=options["repeat"]))
+        if options["compare"]:
+            baseline = json.loads(Path(options["compare"]).read_text(encoding="utf-8"))
+            report["compared_to"] = {
+                "file": options["compare"],
+                "created_at": baseline.get("created_at"),
+                "results": compare_reports(report, baseline),
+            }
+
+        self._write(report, options)
+
+    def _worst_case(self, options: dict[str, Any]) -> None:
+        if options["compare"] or options["corpus"] or options["save_corpus"]:
+            raise CommandError("--worst-case can't be combined with --compare, --corpus or --save-corpus")
+        try:
+            sizes = tuple(int(size) for size in options["sizes"].split(","))
+        except ValueError:
+            raise CommandError("--sizes must be comma-separated integers") from None
+        if not sizes or min(sizes) < 1:
+            raise CommandError("--sizes must be >= 1")
+        report: dict[str, Any] = benchmark_environment()
+        report.update(run_worst_case_benchmark(sizes, repeat=options["repeat"]))
+        self._write(report, options)
+
+    def _write(self, report: dict[str, Any], options: dict[str, Any]) -> None:
+        text = json.dumps(report, indent=2, ensure_ascii=False)
+        if options["output"]:
+            Path(options["output"]).write_text(text, encoding="utf-8")
+        self.stdout.write(text)
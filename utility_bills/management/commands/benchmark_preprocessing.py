@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+from pathlib import Path
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.test.utils import override_settings
+
+from ...conf import app_setting
+from ...models import UtilityType
+from ...services.ocr_engine import ocr_images_paddle, ocr_images_tesseract
+from ...services.page_parsing import parse_ocr_text
+from ...services.preprocessing import configured_steps
+
+
+_IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".webp", ".bmp", ".tif", ".tiff"}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare OCR time and field accuracy with and without image preprocessing on a sample set. "
+        "Expected values come from a JSON file mapping image file name -> {field: value} "
+        "(fields of ElectricityParsed, values as strings, e.g. dates as YYYY-MM-DD)."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("images", help="Directory with sample bill images.")
+        parser.add_argument("--expected", help="JSON file with expected field values per image.")
+        parser.add_argument("--engine", choices=["tesseract", "paddleocr"], default="tesseract")
+        parser.add_argument("--lang", help="Engine language (default: ara+eng for tesseract, ar for paddleocr).")
+        parser.add_argument("--steps", help="Comma-separated preprocessing steps (default: configured steps).")
+        parser.add_argument("--output", help="Write the JSON report to this file as well.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        directory = Path(options["images"])
+        images = sorted(p for p in directory.iterdir() if p.suffix.lower() in _IMAGE_SUFFIXES) if directory.is_dir() else []
+        if not images:
+            raise CommandError(f"No images found in {directory}")
+
+        expected: dict[str, dict[str, str]] = {}
+        if options["expected"]:
+            expected = json.loads(Path(options["expected"]).read_text(encoding="utf-8"))
+
+        steps = configured_steps(options["steps"].split(",") if options["steps"] else None)
+        # "raw" is the image as uploaded: no preprocessing and no decode-time downscaling
+        # (OCR_DECODE_MAX_SIDE), which would otherwise shrink large JPEGs in both variants.
+        variants = {"raw": ([], None), "preprocessed": (steps, app_setting("OCR_DECODE_MAX_SIDE"))}
+
+        report: dict[str, Any] = {"engine": options["engine"], "images": len(images), "steps": steps, "variants": {}}
+        for name, (variant_steps, max_side) in variants.items():
+            with override_settings(UTILITY_BILLS_OCR_DECODE_MAX_SIDE=max_side):
+                run = self._run(images, expected, options["engine"], options["lang"], variant_steps)
+            report["variants"][name] = {"decode_max_side": max_side, **run}
+
+        raw, pre = report["variants"]["raw"], report["variants"]["preprocessed"]
+        if raw["ocr_seconds_total"]:
+            report["speedup"] = round(raw["ocr_seconds_total"] / max(pre["ocr_seconds_total"], 1e-9), 2)
+
+        text = json.dumps(report, indent=2, ensure_ascii=False)
+        if options["output"]:
+            Path(options["output"]).write_text(text, encoding="utf-8")
+        self.stdout.write(text)
+
+    def _run(self, images: list[Path], expected: dict[str, dict[str, str]], engine: str, lang: str | None, steps: list[str]) -> dict[str, Any]:
+        seconds: list[float] = []
+        checked = correct = downscaled = 0
+        for path in images:
+            # One image per call so timings and parses are per image; the OCR cache is not involved.
+            if engine == "paddleocr":
+                res = ocr_images_paddle([str(path)], lang=lang or "ar", preprocess=steps)
+            else:
+                res = ocr_images_tesseract([str(path)], lang=lang or "ara+eng", psm=6, workers=1, preprocess=steps)
+            seconds.extend(res.image_seconds)
+            downscaled += sum(any(s.startswith(("draft(", "reduce(")) for s in applied) for applied in res.preprocessing)
+
+            wanted = expected.get(path.name)
+            if not wanted:
+                continue
+            # Parsed the way uploads are, so page markers and per-page parsing match production.
+            result = parse_ocr_text(res.text, UtilityType.ELECTRICITY).parsed
+            parsed = dataclasses.asdict(result) if result is not None else {}
+            for field_name, value in wanted.items():
+                checked += 1
+                got = parsed.get(field_name)
+                if got is not None and str(got) == str(value):
+                    correct += 1
+
+        ordered = sorted(seconds)
+        return {
+            "ocr_seconds_total": round(sum(seconds), 3),
+            "ocr_seconds_mean": round(sum(seconds) / len(seconds), 3) if seconds else None,
+            "ocr_seconds_max": ordered[-1] if ordered else None,
+            "images_downscaled_on_decode": downscaled,
+            "fields_checked": checked,
+            "fields_correct": correct,
+            "field_accuracy": round(correct / checked, 4) if checked else None,
+        }
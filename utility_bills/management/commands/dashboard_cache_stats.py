@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from ...services.dashboard import dashboard_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Print dashboard cache hit/miss/invalidation counters (as JSON)."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--reset", action="store_true", help="Reset the counters after printing them.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        self.stdout.write(json.dumps(dashboard_cache_stats(reset=options["reset"]), indent=2))
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from ...services.ocr_cache import evict_ocr_cache
+
+
+class Command(BaseCommand):
+    help = "Delete the least recently used OCR cache entries beyond OCR_CACHE_MAX_ENTRIES."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--max-entries", type=int, default=None,
+            help="Entries to keep (default: OCR_CACHE_MAX_ENTRIES).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["max_entries"] is not None and options["max_entries"] < 0:
+            raise CommandError("--max-entries must be >= 0")
+        deleted = evict_ocr_cache(options["max_entries"])
+        self.stdout.write(self.style.SUCCESS(f"Evicted {deleted} OCR cache entries."))
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from ...services.ocr_jobs import expire_ocr_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Fail OCR jobs no worker finished in time and delete the uploaded images of stale or "
+        "finished jobs. Prints a JSON summary."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--max-age", type=int, default=None,
+            help="Seconds after upload a job expires (default: OCR_JOB_EXPIRE_SECONDS).",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Only report what would be removed.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["max_age"] is not None and options["max_age"] < 0:
+            raise CommandError("--max-age must be >= 0")
+        stats = expire_ocr_jobs(max_age=options["max_age"], dry_run=options["dry_run"])
+        self.stdout.write(json.dumps(stats, indent=2))
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from ...services.admission import ocr_admission_stats
+
+
+class Command(BaseCommand):
+    help = "Print OCR admission counters (admitted/queued/rejected), running uploads and queue depth (as JSON)."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--reset", action="store_true", help="Reset the counters after printing them.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        self.stdout.write(json.dumps(ocr_admission_stats(reset=options["reset"]), indent=2))
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from ...services.blob_store import purge_image_blobs, recompress_image_blobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Apply the retention policy to stored original bill images: unlink images of old bills and "
+        "delete image files no bill links to any more, then recompress remaining files to "
+        "OCR_BLOB_FORMAT. Prints a JSON summary."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--unlinked-days", type=int, default=None,
+            help="Delete unlinked images unused for this many days (default: OCR_BLOB_UNLINKED_RETENTION_DAYS).",
+        )
+        parser.add_argument(
+            "--linked-days", type=int, default=None,
+            help="Unlink images of bills created this many days ago or earlier (default: OCR_BLOB_RETENTION_DAYS).",
+        )
+        parser.add_argument(
+            "--recompress-limit", type=int, default=None,
+            help="Recompress at most this many images per run (default: all pending).",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Only report what would be removed or recompressed.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        for opt in ("unlinked_days", "linked_days", "recompress_limit"):
+            if options[opt] is not None and options[opt] < 0:
+                raise CommandError(f"--{opt.replace('_', '-')} must be >= 0")
+        stats = purge_image_blobs(
+            unlinked_days=options["unlinked_days"], linked_days=options["linked_days"], dry_run=options["dry_run"]
+        )
+        stats.update(recompress_image_blobs(limit=options["recompress_limit"], dry_run=options["dry_run"]))
+        self.stdout.write(json.dumps(stats, indent=2))
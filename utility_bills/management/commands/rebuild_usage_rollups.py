@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from typing import Any, Iterator
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db.models import Exists, OuterRef
+
+from ...models import MonthlyUsageRollup, UtilityBill
+from ...services.rollups import diff_user_rollups, rebuild_user_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild MonthlyUsageRollup rows from bills, one user at a time. "
+        "Processing is chunked by user id and can be resumed with --start-after."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--user-id", type=int, action="append", dest="user_ids", help="Only process these user ids (repeatable).")
+        parser.add_argument("--start-after", type=int, default=0, help="Resume after this user id (printed as progress).")
+        parser.add_argument("--chunk-size", type=int, default=200, help="Number of user ids fetched per batch.")
+        parser.add_argument("--check", action="store_true", help="Only compare rollups with bills; do not write.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        chunk_size = options["chunk_size"]
+        if chunk_size < 1:
+            raise CommandError("--chunk-size must be >= 1")
+
+        user_ids = self._user_ids(options["user_ids"], options["start_after"], chunk_size)
+        check = options["check"]
+        mismatches = 0
+        processed = 0
+
+        for user_id in user_ids:
+            if check:
+                problems = diff_user_rollups(user_id)
+                for line in problems:
+                    self.stdout.write(line)
+                mismatches += len(problems)
+            else:
+                written = rebuild_user_rollups(user_id)
+                self.stdout.write(f"user={user_id} rows={written}")
+            processed += 1
+            if processed % chunk_size == 0:
+                self.stdout.write(f"progress: processed {processed} users, resume with --start-after {user_id}")
+
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} users."))
+        if check and mismatches:
+            raise CommandError(f"{mismatches} rollup mismatches found; run without --check to rebuild.")
+
+    def _user_ids(self, explicit: list[int] | None, start_after: int, chunk_size: int) -> Iterator[int]:
+        if explicit:
+            yield from sorted(i for i in explicit if i > start_after)
+            return
+
+        # Users with bills or with stale rollups; iterate in id order, one chunk per query.
+        User = get_user_model()
+        last = start_after
+        while True:
+            chunk = list(
+                User.objects.filter(pk__gt=last)
+                .filter(
+                    Exists(UtilityBill.objects.filter(user_id=OuterRef("pk")))
+                    | Exists(MonthlyUsageRollup.objects.filter(user_id=OuterRef("pk")))
+                )
+                .order_by("pk")
+                .values_list("pk", flat=True)[:chunk_size]
+            )
+            if not chunk:
+                return
+            yield from chunk
+            last = chunk[-1]
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import os
+import socket
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from ...services.ocr_engine import start_paddle_prewarm
+from ...services.ocr_jobs import claim_next_job, run_job
+
+
+class Command(BaseCommand):
+    help = "Process queued OCR jobs (OcrJob). Run several instances to add workers."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--once", action="store_true", help="Exit when the queue is empty instead of polling.")
+        parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds to sleep when the queue is empty.")
+        parser.add_argument("--max-jobs", type=int, default=0, help="Exit after this many jobs (0 = no limit).")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        worker = f"{socket.gethostname()}:{os.getpid()}"
+        processed = 0
+        start_paddle_prewarm()
+
+        while True:
+            job = claim_next_job(worker)
+            if job is None:
+                if options["once"]:
+                    break
+                time.sleep(options["poll_interval"])
+                continue
+
+            job = run_job(job)
+            processed += 1
+            self.stdout.write(f"job={job.pk} status={job.status} attempts={job.attempts}")
+            if options["max_jobs"] and processed >= options["max_jobs"]:
+                break
+
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} jobs."))
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:28
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('utility_bills', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyUsageRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('utility_type', models.CharField(choices=[('electricity', 'Electricity'), ('water', 'Water')], max_length=32)),
+                ('year', models.PositiveSmallIntegerField()),
+                ('month', models.PositiveSmallIntegerField()),
+                ('total_amount', models.DecimalField(decimal_places=3, default=Decimal('0.000'), max_digits=14)),
+                ('bill_count', models.PositiveIntegerField(default=0)),
+                ('import_kwh', models.IntegerField(default=0)),
+                ('export_kwh', models.IntegerField(default=0)),
+                ('net_kwh', models.IntegerField(default=0)),
+                ('billed_kwh', models.IntegerField(default=0)),
+                ('consumption_m3', models.IntegerField(default=0)),
+                ('billed_m3', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('meter', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='usage_rollups', to='utility_bills.utilitymeter')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='utility_usage_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'year'], name='utility_bil_user_id_8b835c_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'meter', 'year', 'month'), name='ub_rollup_unique_bucket')],
+            },
+        ),
+    ]
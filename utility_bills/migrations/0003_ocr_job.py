@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:32
+
+import django.core.serializers.json
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('utility_bills', '0002_monthly_usage_rollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OcrJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('utility_type', models.CharField(choices=[('electricity', 'Electricity'), ('water', 'Water')], max_length=32)),
+                ('engine', models.CharField(max_length=32)),
+                ('image_names', models.JSONField(default=list)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=16)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('worker', models.CharField(blank=True, default='', max_length=128)),
+                ('error', models.TextField(blank=True, default='')),
+                ('ocr_engine', models.CharField(blank=True, default='', max_length=32)),
+                ('ocr_text', models.TextField(blank=True, default='')),
+                ('layout', models.CharField(blank=True, default='', max_length=64)),
+                ('parsed', models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='utility_ocr_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'created_at'], name='utility_bil_status_006ac9_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:33
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('utility_bills', '0003_ocr_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OcrCacheEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('image_sha256', models.CharField(max_length=64)),
+                ('engine', models.CharField(max_length=32)),
+                ('options', models.CharField(blank=True, default='', max_length=64)),
+                ('text', models.TextField(blank=True, default='')),
+                ('confidence', models.FloatField(blank=True, null=True)),
+                ('hits', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_used_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['last_used_at'], name='utility_bil_last_us_39938e_idx')],
+                'constraints': [models.UniqueConstraint(fields=('image_sha256', 'engine', 'options'), name='ub_ocr_cache_unique_key')],
+            },
+        ),
+    ]
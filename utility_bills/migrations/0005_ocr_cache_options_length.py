@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('utility_bills', '0004_ocr_cache_entry'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ocrcacheentry',
+            name='options',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('utility_bills', '0005_ocr_cache_options_length'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ocrjob',
+            name='layout_hint',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('utility_bills', '0006_ocr_job_layout_hint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ocrjob',
+            name='ocr_confidence',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:45
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('utility_bills', '0007_ocr_job_confidence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ocrjob',
+            name='image_digests',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.CreateModel(
+            name='ImageBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('file', models.FileField(max_length=255, upload_to='')),
+                ('content_type', models.CharField(blank=True, default='', max_length=64)),
+                ('original_size', models.PositiveBigIntegerField(default=0)),
+                ('stored_size', models.PositiveBigIntegerField(default=0)),
+                ('width', models.PositiveIntegerField(blank=True, null=True)),
+                ('height', models.PositiveIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_used_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['last_used_at'], name='utility_bil_last_us_655e07_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='BillImage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveSmallIntegerField(default=1)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('bill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='images', to='utility_bills.utilitybill')),
+                ('blob', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='bill_links', to='utility_bills.imageblob')),
+            ],
+            options={
+                'ordering': ['bill', 'position'],
+                'constraints': [models.UniqueConstraint(fields=('bill', 'position'), name='ub_bill_image_unique_position')],
+            },
+        ),
+    ]
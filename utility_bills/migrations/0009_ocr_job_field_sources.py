@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('utility_bills', '0008_image_blobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ocrjob',
+            name='field_sources',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('utility_bills', '0009_ocr_job_field_sources'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='monthlyusagerollup',
+            name='ub_rollup_unique_bucket',
+        ),
+        migrations.AddConstraint(
+            model_name='monthlyusagerollup',
+            constraint=models.UniqueConstraint(fields=('user', 'meter', 'utility_type', 'year', 'month'), name='ub_rollup_unique_bucket'),
+        ),
+    ]
@@ -0,0 +1,75 @@
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, F, Sum, Value
+from django.db.models.functions import Coalesce, TruncMonth
+
+
+_MEASURES = (
+    "total_amount",
+    "bill_count",
+    "import_kwh",
+    "export_kwh",
+    "net_kwh",
+    "billed_kwh",
+    "consumption_m3",
+    "billed_m3",
+)
+
+
+def backfill_rollups(apps, schema_editor):
+    # Bills saved before 0002 have no rollup rows, and the dashboard reads only rollups.
+    # A frozen copy of services.aggregations.usage_rows on the historical models, so later
+    # model or service changes can't break this migration. Cached dashboards expire on
+    # their own (DASHBOARD_CACHE_TIMEOUT); the cache is not touched from here.
+    UtilityBill = apps.get_model("utility_bills", "UtilityBill")
+    MonthlyUsageRollup = apps.get_model("utility_bills", "MonthlyUsageRollup")
+
+    zero_amount = Value(Decimal("0.000"), output_field=models.DecimalField(max_digits=12, decimal_places=3))
+    zero_int = Value(0, output_field=models.IntegerField())
+    import_kwh = F("electricity__import_current") - F("electricity__import_previous")
+    export_kwh = Coalesce(F("electricity__export_current") - F("electricity__export_previous"), zero_int)
+    rows = (
+        UtilityBill.objects.order_by()
+        .annotate(month=TruncMonth("period_end"))
+        .values("user_id", "meter_id", "utility_type", "month")
+        .annotate(
+            total_amount=Coalesce(Sum("total_amount"), zero_amount),
+            bill_count=Count("pk"),
+            import_kwh=Coalesce(Sum(import_kwh), zero_int),
+            export_kwh=Coalesce(Sum(export_kwh), zero_int),
+            net_kwh=Coalesce(Sum(import_kwh - export_kwh), zero_int),
+            billed_kwh=Coalesce(Sum("electricity__billed_kwh"), zero_int),
+            consumption_m3=Coalesce(Sum(F("water__current_reading") - F("water__previous_reading")), zero_int),
+            billed_m3=Coalesce(Sum("water__billed_m3"), zero_int),
+        )
+    )
+
+    MonthlyUsageRollup.objects.all().delete()
+    batch = []
+    for row in rows.iterator():
+        batch.append(
+            MonthlyUsageRollup(
+                user_id=row["user_id"],
+                meter_id=row["meter_id"],
+                utility_type=row["utility_type"],
+                year=row["month"].year,
+                month=row["month"].month,
+                **{name: row[name] for name in _MEASURES},
+            )
+        )
+        if len(batch) >= 1000:
+            MonthlyUsageRollup.objects.bulk_create(batch)
+            batch = []
+    MonthlyUsageRollup.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('utility_bills', '0010_rollup_bucket_utility_type'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
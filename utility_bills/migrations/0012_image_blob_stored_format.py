@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('utility_bills', '0011_backfill_usage_rollups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imageblob',
+            name='stored_format',
+            field=models.CharField(blank=True, default='', max_length=16),
+        ),
+    ]
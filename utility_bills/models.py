@@ -6,6 +6,7 @@ from __future__ import annotations
 from decimal import Decimal
 from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.utils import timezone
 
@@ -20,6 +21,13 @@ class DataSource(models.TextChoices):
     OCR = "ocr", "OCR"
 
 
+class OcrJobStatus(models.TextChoices):
+    PENDING = "pending", "Pending"
+    RUNNING = "running", "Running"
+    DONE = "done", "Done"
+    FAILED = "failed", "Failed"
+
+
 class Currency(models.TextChoices):
     JOD = "JOD", "JOD"
 
@@ -184,3 +192,172 @@ class WaterBill(models.Model):
 
     def __str__(self) -> str:
         return f"WaterBill({self.bill_id})"
+
+
+class MonthlyUsageRollup(models.Model):
+    """Pre-aggregated usage per user / meter / utility type / month.
+
+    Maintained incrementally by `services.rollups` whenever a bill (or its electricity/water
+    details) is saved or deleted, and rebuilt from scratch by `manage.py rebuild_usage_rollups`.
+    Dashboards read from here so their cost grows with months, not bills.
+
+    Rows are kept with zero values when their last bill is deleted, so `updated_at`
+    always reflects the latest bill change for the user.
+    """
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="utility_usage_rollups")
+    meter = models.ForeignKey(UtilityMeter, on_delete=models.CASCADE, related_name="usage_rollups")
+    utility_type = models.CharField(max_length=32, choices=UtilityType.choices)
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField()
+
+    total_amount = models.DecimalField(max_digits=14, decimal_places=3, default=Decimal("0.000"))
+    bill_count = models.PositiveIntegerField(default=0)
+
+    import_kwh = models.IntegerField(default=0)
+    export_kwh = models.IntegerField(default=0)
+    net_kwh = models.IntegerField(default=0)
+    billed_kwh = models.IntegerField(default=0)
+
+    consumption_m3 = models.IntegerField(default=0)
+    billed_m3 = models.IntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            # utility_type is part of the bucket: a bill's type may differ from its meter's.
+            models.UniqueConstraint(fields=["user", "meter", "utility_type", "year", "month"], name="ub_rollup_unique_bucket"),
+        ]
+        indexes = [
+            models.Index(fields=["user", "year"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.user_id}:{self.meter_id}:{self.utility_type}:{self.year}-{self.month:02d}"
+
+
+class OcrJob(models.Model):
+    """An OCR upload processed in the background by `manage.py run_ocr_worker`.
+
+    Uploaded images are kept in default storage (`image_names`) until the job finishes;
+    results mirror what the synchronous upload view renders.
+    """
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="utility_ocr_jobs")
+    utility_type = models.CharField(max_length=32, choices=UtilityType.choices)
+    engine = models.CharField(max_length=32)
+    layout_hint = models.CharField(max_length=64, blank=True, default="")
+    image_names = models.JSONField(default=list)
+    # ImageBlob digests of the originals, in upload order (linked to the bill on save).
+    image_digests = models.JSONField(default=list, blank=True)
+
+    status = models.CharField(max_length=16, choices=OcrJobStatus.choices, default=OcrJobStatus.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    worker = models.CharField(max_length=128, blank=True, default="")
+    error = models.TextField(blank=True, default="")
+
+    # Results
+    ocr_engine = models.CharField(max_length=32, blank=True, default="")
+    ocr_confidence = models.FloatField(null=True, blank=True)
+    ocr_text = models.TextField(blank=True, default="")
+    layout = models.CharField(max_length=64, blank=True, default="")
+    parsed = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    # Parsed field -> image (1-based) its value was read from.
+    field_sources = models.JSONField(default=dict, blank=True)
+
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "created_at"]),
+        ]
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (OcrJobStatus.DONE, OcrJobStatus.FAILED)
+
+    def __str__(self) -> str:
+        return f"OcrJob({self.pk}:{self.status})"
+
+
+class OcrCacheEntry(models.Model):
+    """OCR text of one image, keyed by the SHA-256 of its bytes and the engine options.
+
+    Lets a re-uploaded screenshot skip OCR entirely. Least recently used entries are
+    evicted once the table exceeds `UTILITY_BILLS_OCR_CACHE_MAX_ENTRIES`.
+    """
+
+    image_sha256 = models.CharField(max_length=64)
+    engine = models.CharField(max_length=32)
+    options = models.CharField(max_length=255, blank=True, default="")
+
+    text = models.TextField(blank=True, default="")
+    confidence = models.FloatField(null=True, blank=True)
+
+    hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(default=timezone.now)
+    last_used_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["image_sha256", "engine", "options"], name="ub_ocr_cache_unique_key"),
+        ]
+        indexes = [
+            models.Index(fields=["last_used_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"OcrCacheEntry({self.engine}:{self.image_sha256[:12]})"
+
+
+class ImageBlob(models.Model):
+    """An original uploaded image, stored once per distinct content.
+
+    The file is named after the SHA-256 of the uploaded bytes, so identical uploads (from
+    any user) share one blob. It may be recompressed later (`UTILITY_BILLS_OCR_BLOB_FORMAT`);
+    `sha256` always identifies the original bytes.
+    """
+
+    sha256 = models.CharField(max_length=64, unique=True)
+    file = models.FileField(max_length=255)
+    content_type = models.CharField(max_length=64, blank=True, default="")
+    original_size = models.PositiveBigIntegerField(default=0)
+    stored_size = models.PositiveBigIntegerField(default=0)
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    # OCR_BLOB_FORMAT the file was last processed for ("original" as uploaded); see
+    # services.blob_store.recompress_image_blobs.
+    stored_format = models.CharField(max_length=16, blank=True, default="")
+
+    created_at = models.DateTimeField(default=timezone.now)
+    # Last upload or bill link; unlinked blobs are purged relative to this.
+    last_used_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["last_used_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"ImageBlob({self.sha256[:12]})"
+
+
+class BillImage(models.Model):
+    """Links a bill to the original images it was OCR'd from, in upload order."""
+
+    bill = models.ForeignKey(UtilityBill, on_delete=models.CASCADE, related_name="images")
+    blob = models.ForeignKey(ImageBlob, on_delete=models.PROTECT, related_name="bill_links")
+    position = models.PositiveSmallIntegerField(default=1)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["bill", "position"]
+        constraints = [
+            models.UniqueConstraint(fields=["bill", "position"], name="ub_bill_image_unique_position"),
+        ]
+
+    def __str__(self) -> str:
+        return f"BillImage({self.bill_id}#{self.position})"
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Optional, Sequence
+
+
+def parse_until(
+    fn: Callable[[str], dict[str, Any]], pages: Sequence[str], deadline: Optional[float]
+) -> list[Optional[dict[str, Any]]]:
+    """`fn` of each page, or None for the pages not started by `deadline` (a `time.time()`).
+
+    Runs in parse worker processes too (see `services/page_parsing.py`), so this module must
+    not import Django.
+    """
+    results: list[Optional[dict[str, Any]]] = []
+    for page in pages:
+        if deadline is not None and time.time() > deadline:
+            results.extend(None for _ in pages[len(results) :])
+            break
+        results.append(fn(page))
+    return results
@@ -4,10 +4,10 @@
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from datetime import date
 from decimal import Decimal
-from typing import Optional
+from typing import Any, Optional
 
 from ..services.normalizers import normalize_digits, parse_decimal_maybe
 
@@ -42,121 +42,143 @@ def _parse_date(s: str) -> Optional[date]:
     return date(y, mo, d)
 
 
-def parse_electricity_text(raw_text: str) -> ElectricityParsed:
+# Labelled fields, compiled once at import. Where a field has several variants they are tried
+# in precedence order and the first one found wins. (One alternation of every label scanned in
+# a single pass was measured slower: CPython's `re` finds each pattern's literal label with a
+# fast substring search, which an alternation of labels can't use.)
+#
+# Every pattern does a bounded amount of work per label occurrence, so a parse is linear in the
+# text's length whatever the OCR produced: values are looked for only in a window right after
+# their label, and numbers read as integers are at most _MAX_DIGITS long (a longer digit run is
+# OCR garbage, and `int()` of one is quadratic or raises ValueError beyond 4300 digits).
+_DATE = r"(\d{4}/\d{2}/\d{2})"
+_MAX_DIGITS = 12
+_INT = rf"(\-?\d{{1,{_MAX_DIGITS}}})(?!\d)"
+_UINT = rf"(\d{{1,{_MAX_DIGITS}}})(?!\d)"
+# Characters between "from <date>" and "to <date>" on an English period line.
+_PERIOD_GAP = 120
+_METER_RES = (
+    re.compile(r"رقم العداد\s*(\d+)"),
+    re.compile(r"Meter\s*No\s*(\d+)", re.IGNORECASE),
+)
+_PERIOD_RES = (
+    re.compile(rf"من\s*{_DATE}\s*الى\s*{_DATE}"),
+    re.compile(rf"from\s*{_DATE}.{{0,{_PERIOD_GAP}}}to\s*{_DATE}", re.IGNORECASE),
+)
+_READING_DATE_RES = (
+    re.compile(rf"تاريخ القراءة\s*{_DATE}"),
+    re.compile(rf"Reading\s*date\s*{_DATE}", re.IGNORECASE),
+)
+# Header lines that open a bill in a statement with several bills
+# (see `services/page_parsing.py::iter_bills`): kind -> patterns.
+BILL_ANCHORS: dict[str, tuple[re.Pattern[str], ...]] = {"meter_number": _METER_RES, "period": _PERIOD_RES}
+_IMPORT_PREVIOUS_RE = re.compile(rf"القراءة السابقة\s*{_UINT}")
+_IMPORT_CURRENT_RE = re.compile(rf"القراءة الحالية\s*{_UINT}")
+# Imported row sometimes: 'المستجرة من الشبكة 16128 15364 764'
+_IMPORT_ROW_RE = re.compile(rf"المستجرة\s+من\s+الشبكة\s+{_UINT}\s+{_UINT}\s+{_UINT}")
+_EXPORT_ROW_RE = re.compile(rf"المصدرة\s+إلى\s+الشبكة\s+{_UINT}\s+{_UINT}\s+{_UINT}")
+_BILLED_RES = (
+    re.compile(rf"الكمية المفوترة\s*{_INT}"),
+    re.compile(rf"Net\s*consumption\s*quantity\s*{_INT}", re.IGNORECASE),
+)
+_TOTAL_DECIMAL_RE = re.compile(r"Total\s*bill\s*value\s*([\d\.]+)", re.IGNORECASE)
+_TOTAL_DINAR_FILS_RE = re.compile(rf"قيمة\s*الفاتورة\s*{_INT}\s+(\d{{3}})")
+_CONSUMPTION_DECIMAL_RE = re.compile(r"قيم\s*الاستهلاك\s*([\d\.]+)")
+_CONSUMPTION_DINAR_FILS_RE = re.compile(rf"قيمة\s*الاستهلاك\s*{_INT}\s+(\d{{3}})")
+_FIXED_SUBSIDY_RE = re.compile(r"(?:Fixed\s*subsidy\s*amount|قيمة\s*الخصم\s*الثابت)\s*([\-\d\.]+)", re.IGNORECASE)
+_NETWORK_FEE_RE = re.compile(r"(?:Network\s*services\s*fees|بدل\s*خدمات\s*الشبكة)\s*([\-\d\.]+)", re.IGNORECASE)
+
+
+def _first(patterns: tuple[re.Pattern[str], ...], t: str) -> tuple[int, Optional[re.Match[str]]]:
+    """(rank, match) of the first variant (in precedence order) found in `t`."""
+    for rank, pattern in enumerate(patterns):
+        m = pattern.search(t)
+        if m:
+            return rank, m
+    return 0, None
+
+
+def _dinar_fils(m: re.Match[str]) -> Decimal:
+    return Decimal(int(m.group(1))) + (Decimal(int(m.group(2))) / Decimal(1000))
+
+
+def electricity_fields(raw_text: str) -> dict[str, tuple[int, Any]]:
+    """The fields found in `raw_text` as `{field: (rank, value)}`.
+
+    `rank` is the precedence of the label variant that matched (0 = preferred); it lets the
+    fields of several pages be merged the way a parse of the joined text would pick them
+    (see `services/page_parsing.py`). Fields with no match are absent.
+    """
     t = normalize_digits(raw_text or "")
+    found: dict[str, tuple[int, Any]] = {}
 
     # Meter number: Arabic / English variants
-    meter = None
-    m = re.search(r"رقم العداد\s*(\d+)", t)
+    rank, m = _first(_METER_RES, t)
     if m:
-        meter = m.group(1)
-    else:
-        m = re.search(r"Meter\s*No\s*(\d+)", t, re.IGNORECASE)
-        if m:
-            meter = m.group(1)
+        found["meter_number"] = (rank, m.group(1))
 
     # Period
-    ps = None
-    pe = None
-    m = re.search(r"من\s*(\d{4}/\d{2}/\d{2})\s*الى\s*(\d{4}/\d{2}/\d{2})", t)
-    if m:
-        ps = _parse_date(m.group(1))
-        pe = _parse_date(m.group(2))
-    else:
-        m = re.search(r"from\s*(\d{4}/\d{2}/\d{2}).*to\s*(\d{4}/\d{2}/\d{2})", t, re.IGNORECASE)
-        if m:
-            ps = _parse_date(m.group(1))
-            pe = _parse_date(m.group(2))
-
-    rd = None
-    m = re.search(r"تاريخ القراءة\s*(\d{4}/\d{2}/\d{2})", t)
+    rank, m = _first(_PERIOD_RES, t)
     if m:
-        rd = _parse_date(m.group(1))
-    else:
-        m = re.search(r"Reading\s*date\s*(\d{4}/\d{2}/\d{2})", t, re.IGNORECASE)
-        if m:
-            rd = _parse_date(m.group(1))
+        found["period_start"] = (rank, _parse_date(m.group(1)))
+        found["period_end"] = (rank, _parse_date(m.group(2)))
 
-    # Summary readings (imported)
-    imp_prev = None
-    imp_cur = None
-    m = re.search(r"القراءة السابقة\s*(\d+)", t)
+    rank, m = _first(_READING_DATE_RES, t)
     if m:
-        imp_prev = int(m.group(1))
-    m = re.search(r"القراءة الحالية\s*(\d+)", t)
-    if m:
-        imp_cur = int(m.group(1))
-
-    # Detailed energy table: imported/exported
-    exp_prev = None
-    exp_cur = None
+        found["reading_date"] = (rank, _parse_date(m.group(1)))
 
-    # Imported row sometimes: 'المستجرة من الشبكة 16128 15364 764'
-    m = re.search(r"المستجرة\s+من\s+الشبكة\s+(\d+)\s+(\d+)\s+(\d+)", t)
+    # Detailed energy table: imported/exported. The imported row wins over the summary readings.
+    m = _IMPORT_ROW_RE.search(t)
     if m:
-        imp_cur = int(m.group(1))
-        imp_prev = int(m.group(2))
+        found["import_current"] = (0, int(m.group(1)))
+        found["import_previous"] = (0, int(m.group(2)))
+    else:
+        # Summary readings (imported)
+        m = _IMPORT_PREVIOUS_RE.search(t)
+        if m:
+            found["import_previous"] = (1, int(m.group(1)))
+        m = _IMPORT_CURRENT_RE.search(t)
+        if m:
+            found["import_current"] = (1, int(m.group(1)))
 
-    m = re.search(r"المصدرة\s+إلى\s+الشبكة\s+(\d+)\s+(\d+)\s+(\d+)", t)
+    m = _EXPORT_ROW_RE.search(t)
     if m:
-        exp_cur = int(m.group(1))
-        exp_prev = int(m.group(2))
+        found["export_current"] = (0, int(m.group(1)))
+        found["export_previous"] = (0, int(m.group(2)))
 
     # Billed quantity
-    billed = None
-    m = re.search(r"الكمية المفوترة\s*(\-?\d+)", t)
+    rank, m = _first(_BILLED_RES, t)
     if m:
-        billed = int(m.group(1))
-    else:
-        m = re.search(r"Net\s*consumption\s*quantity\s*(\-?\d+)", t, re.IGNORECASE)
-        if m:
-            billed = int(m.group(1))
+        found["billed_kwh"] = (rank, int(m.group(1)))
 
     # Monetary fields
-    total = None
-    m = re.search(r"Total\s*bill\s*value\s*([\d\.]+)", t, re.IGNORECASE)
+    m = _TOTAL_DECIMAL_RE.search(t)
     if m:
-        total = parse_decimal_maybe(m.group(1))
+        found["total_bill_value"] = (0, parse_decimal_maybe(m.group(1)))
     else:
-        m = re.search(r"قيمة\s*الفاتورة\s*(\-?\d+)\s+(\d{3})", t)
+        m = _TOTAL_DINAR_FILS_RE.search(t)
         if m:
-            din = int(m.group(1))
-            fils = int(m.group(2))
-            total = Decimal(din) + (Decimal(fils) / Decimal(1000))
+            found["total_bill_value"] = (1, _dinar_fils(m))
 
-    consumption_val = None
-    m = re.search(r"قيم\s*الاستهلاك\s*([\d\.]+)", t)
+    m = _CONSUMPTION_DECIMAL_RE.search(t)
     if m:
-        consumption_val = parse_decimal_maybe(m.group(1))
+        found["consumption_value"] = (0, parse_decimal_maybe(m.group(1)))
     else:
-        m = re.search(r"قيمة\s*الاستهلاك\s*(\-?\d+)\s+(\d{3})", t)
+        m = _CONSUMPTION_DINAR_FILS_RE.search(t)
         if m:
-            din = int(m.group(1))
-            fils = int(m.group(2))
-            consumption_val = Decimal(din) + (Decimal(fils) / Decimal(1000))
+            found["consumption_value"] = (1, _dinar_fils(m))
 
-    fixed_sub = None
-    m = re.search(r"(?:Fixed\s*subsidy\s*amount|قيمة\s*الخصم\s*الثابت)\s*([\-\d\.]+)", t, re.IGNORECASE)
+    m = _FIXED_SUBSIDY_RE.search(t)
     if m:
-        fixed_sub = parse_decimal_maybe(m.group(1))
+        found["fixed_subsidy_amount"] = (0, parse_decimal_maybe(m.group(1)))
 
-    network_fee = None
-    m = re.search(r"(?:Network\s*services\s*fees|بدل\s*خدمات\s*الشبكة)\s*([\-\d\.]+)", t, re.IGNORECASE)
+    m = _NETWORK_FEE_RE.search(t)
     if m:
-        network_fee = parse_decimal_maybe(m.group(1))
-
-    return ElectricityParsed(
-        meter_number=meter,
-        period_start=ps,
-        period_end=pe,
-        reading_date=rd,
-        import_previous=imp_prev,
-        import_current=imp_cur,
-        export_previous=exp_prev,
-        export_current=exp_cur,
-        billed_kwh=billed,
-        total_bill_value=total,
-        consumption_value=consumption_val,
-        network_services_fees=network_fee,
-        fixed_subsidy_amount=fixed_sub,
-    )
+        found["network_services_fees"] = (0, parse_decimal_maybe(m.group(1)))
+
+    return found
+
+
+def parse_electricity_text(raw_text: str) -> ElectricityParsed:
+    found = electricity_fields(raw_text)
+    return ElectricityParsed(**{f.name: found[f.name][1] if f.name in found else None for f in fields(ElectricityParsed)})
@@ -4,9 +4,9 @@
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from datetime import date
-from typing import Optional
+from typing import Any, Optional
 
 from ..services.normalizers import normalize_digits
 
@@ -21,32 +21,38 @@ class WaterParsed:
     billed_m3: Optional[int]
 
 
-def parse_water_text(raw_text: str) -> WaterParsed:
+# Readings are read as integers of at most 12 digits: longer digit runs are OCR garbage, and
+# `int()` of one is quadratic (see electricity_parser).
+_UINT = r"(\d{1,12})(?!\d)"
+_METER_RE = re.compile(r"رقم\s*العداد\s*(\d+)")
+_PREVIOUS_RE = re.compile(rf"القراءة\s*السابقة\s*{_UINT}")
+_CURRENT_RE = re.compile(rf"القراءة\s*الحالية\s*{_UINT}")
+_BILLED_RE = re.compile(rf"الكمية\s*المفوترة\s*{_UINT}")
+
+
+# Header lines that open a bill in a statement with several bills: kind -> patterns.
+BILL_ANCHORS: dict[str, tuple[re.Pattern[str], ...]] = {"meter_number": (_METER_RE,)}
+
+
+def water_fields(raw_text: str) -> dict[str, tuple[int, Any]]:
+    """The fields found in `raw_text` as `{field: (rank, value)}` (one label per field, so rank 0)."""
     t = normalize_digits(raw_text or "")
-    meter = None
-    m = re.search(r"رقم\s*العداد\s*(\d+)", t)
+    found: dict[str, tuple[int, Any]] = {}
+    m = _METER_RE.search(t)
     if m:
-        meter = m.group(1)
-
-    prev = None
-    cur = None
-    m = re.search(r"القراءة\s*السابقة\s*(\d+)", t)
+        found["meter_number"] = (0, m.group(1))
+    m = _PREVIOUS_RE.search(t)
     if m:
-        prev = int(m.group(1))
-    m = re.search(r"القراءة\s*الحالية\s*(\d+)", t)
+        found["previous_reading"] = (0, int(m.group(1)))
+    m = _CURRENT_RE.search(t)
     if m:
-        cur = int(m.group(1))
-
-    billed = None
-    m = re.search(r"الكمية\s*المفوترة\s*(\d+)", t)
+        found["current_reading"] = (0, int(m.group(1)))
+    m = _BILLED_RE.search(t)
     if m:
-        billed = int(m.group(1))
-
-    return WaterParsed(
-        meter_number=meter,
-        period_start=None,
-        period_end=None,
-        previous_reading=prev,
-        current_reading=cur,
-        billed_m3=billed,
-    )
+        found["billed_m3"] = (0, int(m.group(1)))
+    return found
+
+
+def parse_water_text(raw_text: str) -> WaterParsed:
+    found = water_fields(raw_text)
+    return WaterParsed(**{f.name: found[f.name][1] if f.name in found else None for f in fields(WaterParsed)})
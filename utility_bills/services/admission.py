@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import time
+import uuid
+from types import TracebackType
+from typing import Any, Optional
+
+from django.core.cache import BaseCache, caches
+
+from ..conf import app_setting
+from .counters import CacheCounters
+from .ocr_engine import OcrEngineError
+
+
+_KEY_PREFIX = "utility_bills:ocr_admission"
+_stats = CacheCounters(_KEY_PREFIX, "OCR_ADMISSION_CACHE_ALIAS", ("admitted", "queued", "rejected"))
+_POLL_SECONDS = 0.2
+
+
+class OcrBusy(OcrEngineError):
+    """OCR capacity is saturated; the client should retry after `retry_after` seconds."""
+
+    def __init__(self, message: str, retry_after: int) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _cache() -> BaseCache:
+    return caches[app_setting("OCR_ADMISSION_CACHE_ALIAS")]
+
+
+def _take(cache: BaseCache, pool: str, size: int, token: str, lease: int) -> Optional[str]:
+    """Claim a free slot of `pool` (slots are cache keys with a lease); returns its key."""
+    for i in range(size):
+        key = f"{_KEY_PREFIX}:{pool}:{i}"
+        if cache.add(key, token, timeout=lease):
+            return key
+    return None
+
+
+def _give_back(cache: BaseCache, key: str, token: str) -> None:
+    # Only free the slot if the lease is still ours (it may have expired and been re-taken).
+    if cache.get(key) == token:
+        cache.delete(key)
+
+
+class OcrAdmission:
+    """Admission ticket for one OCR run of `user_id`, used around the OCR engines.
+
+    A run needs a slot of the global pool (UTILITY_BILLS_OCR_MAX_CONCURRENT) and of the user's
+    pool (..._PER_USER). Without free slots the request waits in a bounded queue
+    (UTILITY_BILLS_OCR_MAX_QUEUED) for up to OCR_QUEUE_WAIT_SECONDS, else `OcrBusy` is raised.
+    Slots are cache keys with a lease (OCR_ADMISSION_LEASE_SECONDS), so limits hold across
+    processes sharing the cache and a crashed process can't leak capacity for long.
+    """
+
+    def __init__(self, user_id: Any) -> None:
+        self.user_id = user_id
+        self.token = uuid.uuid4().hex
+        self._held: list[str] = []
+
+    def __enter__(self) -> OcrAdmission:
+        self.acquire()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.release()
+
+    def _try_admit(self, cache: BaseCache, lease: int) -> bool:
+        held = []
+        per_user = app_setting("OCR_MAX_CONCURRENT_PER_USER")
+        if per_user:
+            key = _take(cache, f"user:{self.user_id}", per_user, self.token, lease)
+            if key is None:
+                return False
+            held.append(key)
+        total = app_setting("OCR_MAX_CONCURRENT")
+        if total:
+            key = _take(cache, "global", total, self.token, lease)
+            if key is None:
+                for k in held:
+                    _give_back(cache, k, self.token)
+                return False
+            held.append(key)
+        self._held = held
+        return True
+
+    def acquire(self) -> None:
+        cache = _cache()
+        lease = app_setting("OCR_ADMISSION_LEASE_SECONDS")
+        if self._try_admit(cache, lease):
+            _stats.incr("admitted")
+            return
+
+        retry_after = app_setting("OCR_RETRY_AFTER_SECONDS")
+        wait = app_setting("OCR_QUEUE_WAIT_SECONDS")
+        queue_key = _take(cache, "queue", app_setting("OCR_MAX_QUEUED"), self.token, wait + 5)
+        if queue_key is None:
+            _stats.incr("rejected")
+            raise OcrBusy("OCR is at capacity and the wait queue is full.", retry_after)
+
+        _stats.incr("queued")
+        try:
+            deadline = time.monotonic() + wait
+            while time.monotonic() < deadline:
+                time.sleep(_POLL_SECONDS)
+                if self._try_admit(cache, lease):
+                    _stats.incr("admitted")
+                    return
+        finally:
+            _give_back(cache, queue_key, self.token)
+        _stats.incr("rejected")
+        raise OcrBusy(f"OCR is at capacity; no slot freed up within {wait}s.", retry_after)
+
+    def release(self) -> None:
+        """Free the slots (idempotent)."""
+        cache = _cache()
+        for key in self._held:
+            _give_back(cache, key, self.token)
+        self._held = []
+
+
+def _in_use(cache: BaseCache, pool: str, size: int) -> int:
+    if not size:
+        return 0
+    keys = [f"{_KEY_PREFIX}:{pool}:{i}" for i in range(size)]
+    return len(cache.get_many(keys))
+
+
+def ocr_admission_stats(reset: bool = False) -> dict[str, Any]:
+    """Current OCR runs and queue depth, plus admitted/queued/rejected counters."""
+    cache = _cache()
+    stats: dict[str, Any] = _stats.read(reset=reset)
+    stats["running"] = _in_use(cache, "global", app_setting("OCR_MAX_CONCURRENT"))
+    stats["queue_depth"] = _in_use(cache, "queue", app_setting("OCR_MAX_QUEUED"))
+    stats["limits"] = {
+        "max_concurrent": app_setting("OCR_MAX_CONCURRENT"),
+        "max_concurrent_per_user": app_setting("OCR_MAX_CONCURRENT_PER_USER"),
+        "max_queued": app_setting("OCR_MAX_QUEUED"),
+    }
+    return stats
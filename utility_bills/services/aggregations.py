@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any
+
+from django.db.models import Count, DecimalField, F, IntegerField, Q, QuerySet, Sum, Value
+from django.db.models.functions import Coalesce, TruncMonth
+
+from ..models import UtilityType
+
+
+_ZERO_AMOUNT = Value(Decimal("0.000"), output_field=DecimalField(max_digits=12, decimal_places=3))
+
+
+@dataclass
+class MonthlySpending:
+    """Spending for one year, split by month and by utility type."""
+
+    monthly: list[Decimal] = field(default_factory=lambda: [Decimal("0.000")] * 12)
+    by_utility: dict[str, Decimal] = field(
+        default_factory=lambda: {ut: Decimal("0.000") for ut in UtilityType.values}
+    )
+
+    @property
+    def total(self) -> Decimal:
+        return sum(self.monthly, Decimal("0.000"))
+
+
+@dataclass
+class MonthlyEnergy:
+    """Electricity kWh for one year, per `period_end` month."""
+
+    import_kwh: list[int] = field(default_factory=lambda: [0] * 12)
+    export_kwh: list[int] = field(default_factory=lambda: [0] * 12)
+    net_kwh: list[int] = field(default_factory=lambda: [0] * 12)
+    billed_kwh: list[int] = field(default_factory=lambda: [0] * 12)
+
+    @property
+    def total_import_kwh(self) -> int:
+        return sum(self.import_kwh)
+
+    @property
+    def total_export_kwh(self) -> int:
+        return sum(self.export_kwh)
+
+    @property
+    def total_net_kwh(self) -> int:
+        return sum(self.net_kwh)
+
+
+_ZERO_INT = Value(0, output_field=IntegerField())
+
+
+def _kwh_expressions(prefix: str = "") -> dict[str, Coalesce]:
+    """SQL equivalents of ElectricityBill.import_kwh / export_kwh / net_kwh, summed.
+
+    Export is only counted when both export readings are present, matching the
+    model property (NULL - x is NULL, which Coalesce turns into 0).
+    `prefix` is the lookup path to ElectricityBill (e.g. "electricity__").
+    """
+    import_kwh = F(f"{prefix}import_current") - F(f"{prefix}import_previous")
+    export_kwh = Coalesce(F(f"{prefix}export_current") - F(f"{prefix}export_previous"), _ZERO_INT)
+    return {
+        "import_kwh": Coalesce(Sum(import_kwh), _ZERO_INT),
+        "export_kwh": Coalesce(Sum(export_kwh), _ZERO_INT),
+        "net_kwh": Coalesce(Sum(import_kwh - export_kwh), _ZERO_INT),
+        "billed_kwh": Coalesce(Sum(f"{prefix}billed_kwh"), _ZERO_INT),
+    }
+
+
+def usage_rows(bills: QuerySet) -> QuerySet:
+    """Group UtilityBill rows by (user, meter, utility_type, month) with every rollup measure.
+
+    This is the source of truth for MonthlyUsageRollup; each row maps 1:1 onto a rollup row.
+    Electricity and water details are LEFT JOINed through the one-to-one relations, so a
+    bill of the other utility simply contributes zero.
+    """
+    return (
+        bills.order_by()
+        .annotate(month=TruncMonth("period_end"))
+        .values("user_id", "meter_id", "utility_type", "month")
+        .annotate(
+            total_amount=Coalesce(Sum("total_amount"), _ZERO_AMOUNT),
+            bill_count=Count("pk"),
+            consumption_m3=Coalesce(Sum(F("water__current_reading") - F("water__previous_reading")), _ZERO_INT),
+            billed_m3=Coalesce(Sum("water__billed_m3"), _ZERO_INT),
+            **_kwh_expressions("electricity__"),
+        )
+    )
+
+
+def rollup_monthly(rollups: QuerySet) -> tuple[MonthlySpending, MonthlyEnergy]:
+    """Read spending and energy series for one year from MonthlyUsageRollup rows.
+
+    Cost is proportional to the number of months (at most 12 grouped rows), not bills.
+    """
+    rows = (
+        rollups.order_by()
+        .values("month")
+        .annotate(
+            total=Coalesce(Sum("total_amount"), _ZERO_AMOUNT),
+            import_kwh_sum=Coalesce(Sum("import_kwh"), _ZERO_INT),
+            export_kwh_sum=Coalesce(Sum("export_kwh"), _ZERO_INT),
+            net_kwh_sum=Coalesce(Sum("net_kwh"), _ZERO_INT),
+            billed_kwh_sum=Coalesce(Sum("billed_kwh"), _ZERO_INT),
+            **{
+                f"total_{ut}": Coalesce(Sum("total_amount", filter=Q(utility_type=ut)), _ZERO_AMOUNT)
+                for ut in UtilityType.values
+            },
+        )
+    )
+
+    spending = MonthlySpending()
+    energy = MonthlyEnergy()
+    for row in rows:
+        idx = row["month"] - 1
+        spending.monthly[idx] += row["total"]
+        for ut in UtilityType.values:
+            spending.by_utility[ut] += row[f"total_{ut}"]
+        energy.import_kwh[idx] += row["import_kwh_sum"]
+        energy.export_kwh[idx] += row["export_kwh_sum"]
+        energy.net_kwh[idx] += row["net_kwh_sum"]
+        energy.billed_kwh[idx] += row["billed_kwh_sum"]
+    return spending, energy
+
+
+def rollup_monthly_by_meter(rollups: QuerySet) -> list[dict[str, Any]]:
+    """Per-meter monthly series for one year, read from MonthlyUsageRollup rows.
+
+    Only meter ids are included, so the result can be cached across meter edits; see
+    `services.dashboard.label_meter_series` for the meter numbers and nicknames.
+    """
+    rows = (
+        rollups.order_by("meter_id", "month")
+        .values("meter_id", "utility_type", "month",
+                "total_amount", "import_kwh", "export_kwh", "net_kwh", "billed_kwh", "consumption_m3")
+    )
+
+    series: dict[int, dict[str, Any]] = {}
+    for row in rows:
+        meter = series.get(row["meter_id"])
+        if meter is None:
+            meter = series[row["meter_id"]] = {
+                "meter_id": row["meter_id"],
+                "utility_type": row["utility_type"],
+                "monthly_total_amount": [0.0] * 12,
+                "electricity_import_kwh": [0] * 12,
+                "electricity_export_kwh": [0] * 12,
+                "electricity_net_kwh": [0] * 12,
+                "electricity_billed_kwh": [0] * 12,
+                "water_consumption_m3": [0] * 12,
+            }
+        idx = row["month"] - 1
+        meter["monthly_total_amount"][idx] += float(row["total_amount"])
+        meter["electricity_import_kwh"][idx] += row["import_kwh"]
+        meter["electricity_export_kwh"][idx] += row["export_kwh"]
+        meter["electricity_net_kwh"][idx] += row["net_kwh"]
+        meter["electricity_billed_kwh"][idx] += row["billed_kwh"]
+        meter["water_consumption_m3"][idx] += row["consumption_m3"]
+    return list(series.values())
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import io
+import logging
+from datetime import timedelta
+from typing import Any, Iterable, Optional
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.base import ContentFile, File
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from ..conf import app_setting
+from ..models import BillImage, ImageBlob, UtilityBill
+from .ocr_cache import image_digest
+from .ocr_engine import ImageSource, OcrMemoryBusy, reserve_image_memory
+
+
+logger = logging.getLogger(__name__)
+
+_BLOB_DIR = "utility_bills/blobs"
+
+_FORMATS = {
+    # name: (Pillow format, extension, content type, save options)
+    "webp": ("WEBP", ".webp", "image/webp", {"method": 4}),
+    "webp_lossless": ("WEBP", ".webp", "image/webp", {"lossless": True, "method": 4}),
+    "png": ("PNG", ".png", "image/png", {"optimize": True}),
+}
+
+_CONTENT_TYPES = {"JPEG": "image/jpeg", "PNG": "image/png", "WEBP": "image/webp", "GIF": "image/gif", "TIFF": "image/tiff"}
+
+
+def _probe(source: ImageSource) -> tuple[str, str, Optional[tuple[int, int]]]:
+    """(extension, content type, size) from the image header; the pixels are not decoded."""
+    from PIL import Image  # type: ignore
+
+    if not isinstance(source, str):
+        source.seek(0)
+    try:
+        with Image.open(source) as img:
+            fmt, size = img.format or "", img.size
+    except Exception:
+        return "", "application/octet-stream", None
+    finally:
+        if not isinstance(source, str):
+            source.seek(0)
+    ext = f".{fmt.lower()}".replace(".jpeg", ".jpg") if fmt else ""
+    return ext, _CONTENT_TYPES.get(fmt, ""), size
+
+
+def _save_stream(name: str, source: ImageSource) -> int:
+    """Copy `source` to `name` in default storage in chunks; returns its size in bytes."""
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            saved = default_storage.save(name, File(f))
+            size = f.tell()
+    else:
+        source.seek(0)
+        saved = default_storage.save(name, File(source))
+        size = source.seek(0, io.SEEK_END)
+        source.seek(0)
+    if saved != name:
+        # Another request stored the same content first; keep that file.
+        default_storage.delete(saved)
+    return size
+
+
+def store_image_blob(source: ImageSource) -> ImageBlob:
+    """Store an original image once per distinct content and return its blob.
+
+    Files are named `utility_bills/blobs/<aa>/<sha256><ext>` in default storage (MEDIA_ROOT
+    with the file system backend). Re-uploading existing content only refreshes `last_used_at`.
+    The upload is streamed to storage as-is; recompression (UTILITY_BILLS_OCR_BLOB_FORMAT)
+    happens later, in `recompress_image_blobs`, so a request never decodes it for storage.
+    """
+    digest = image_digest(source)
+    blob = ImageBlob.objects.filter(sha256=digest).first()
+    if blob is not None:
+        ImageBlob.objects.filter(pk=blob.pk).update(last_used_at=timezone.now())
+        return blob
+
+    ext, content_type, size = _probe(source)
+    name = f"{_BLOB_DIR}/{digest[:2]}/{digest}{ext}"
+    if default_storage.exists(name):
+        nbytes = default_storage.size(name)
+    else:
+        nbytes = _save_stream(name, source)
+    try:
+        with transaction.atomic():
+            return ImageBlob.objects.create(
+                sha256=digest,
+                file=name,
+                content_type=content_type,
+                original_size=nbytes,
+                stored_size=nbytes,
+                width=size[0] if size else None,
+                height=size[1] if size else None,
+                stored_format="original",
+            )
+    except IntegrityError:
+        return ImageBlob.objects.get(sha256=digest)
+
+
+def _recompress(blob: ImageBlob, fmt: str) -> Optional[tuple[str, str, int]]:
+    """Re-encode a blob's file to `fmt`; (name, content type, size) of the new file, or None to keep it."""
+    from PIL import Image  # type: ignore
+
+    if not blob.width or not blob.height:
+        return None
+    max_pixels = app_setting("OCR_MAX_IMAGE_PIXELS")
+    if max_pixels and blob.width * blob.height > max_pixels:
+        return None
+    pil_format, ext, content_type, options = _FORMATS[fmt]
+    if pil_format == "WEBP" and not options.get("lossless"):
+        options = {**options, "quality": app_setting("OCR_BLOB_WEBP_QUALITY")}
+    buf = io.BytesIO()
+    # Decoding takes the same memory budget as OCR, so it waits while large images are in flight.
+    with reserve_image_memory(blob.width, blob.height), default_storage.open(blob.file.name, "rb") as f:
+        try:
+            with Image.open(f) as img:
+                img.save(buf, pil_format, **options)
+        except (OSError, ValueError):
+            logger.warning("Could not recompress blob %s to %s; keeping the original", blob.sha256, fmt, exc_info=True)
+            return None
+    if buf.tell() >= blob.stored_size:
+        return None
+    name = default_storage.save(f"{_BLOB_DIR}/{blob.sha256[:2]}/{blob.sha256}{ext}", ContentFile(buf.getvalue()))
+    return name, content_type, buf.tell()
+
+
+def recompress_image_blobs(limit: Optional[int] = None, dry_run: bool = False) -> dict[str, Any]:
+    """Apply UTILITY_BILLS_OCR_BLOB_FORMAT to blobs stored in another format.
+
+    Runs from `manage.py purge_image_blobs`, not in requests. Each image is decoded within the
+    OCR memory budget and skipped above OCR_MAX_IMAGE_PIXELS. A re-encoded file replaces the
+    stored one only when it is smaller; either way the blob is marked as processed for the
+    format, so it is not decoded again until the setting changes.
+    """
+    fmt = app_setting("OCR_BLOB_FORMAT")
+    if fmt != "original" and fmt not in _FORMATS:
+        raise ImproperlyConfigured(f"Unknown OCR_BLOB_FORMAT {fmt!r}; use original, {', '.join(_FORMATS)}.")
+    stats: dict[str, Any] = {"blobs_checked": 0, "blobs_recompressed": 0, "bytes_saved": 0}
+    if fmt == "original":
+        return stats
+    pending = ImageBlob.objects.exclude(stored_format=fmt).order_by("pk")
+    if dry_run:
+        stats["blobs_checked"] = pending.count() if limit is None else min(pending.count(), limit)
+        return stats
+    for blob in pending[:limit].iterator() if limit is not None else pending.iterator():
+        try:
+            result = _recompress(blob, fmt)
+        except OcrMemoryBusy:
+            # OCR is using the budget; leave the rest for the next run.
+            break
+        stats["blobs_checked"] += 1
+        if result is None:
+            ImageBlob.objects.filter(pk=blob.pk).update(stored_format=fmt)
+            continue
+        name, content_type, size = result
+        old = blob.file.name
+        updated = ImageBlob.objects.filter(pk=blob.pk, file=old).update(
+            file=name, content_type=content_type, stored_size=size, stored_format=fmt
+        )
+        if updated and old != name:
+            default_storage.delete(old)
+        elif not updated:
+            # Purged meanwhile; drop the new file.
+            default_storage.delete(name)
+            continue
+        stats["blobs_recompressed"] += 1
+        stats["bytes_saved"] += blob.stored_size - size
+    return stats
+
+
+def store_image_blobs(sources: Iterable[ImageSource]) -> list[str]:
+    """Store every image (when UTILITY_BILLS_OCR_STORE_ORIGINALS is on); returns their digests."""
+    if not app_setting("OCR_STORE_ORIGINALS"):
+        return []
+    return [store_image_blob(s).sha256 for s in sources]
+
+
+def link_bill_images(bill: UtilityBill, digests: Iterable[str]) -> list[BillImage]:
+    """Attach stored originals to `bill` in the given order; unknown digests are skipped."""
+    digests = list(dict.fromkeys(digests))
+    blobs = {b.sha256: b for b in ImageBlob.objects.filter(sha256__in=digests)}
+    links = [
+        BillImage(bill=bill, blob=blobs[d], position=pos)
+        for pos, d in enumerate((d for d in digests if d in blobs), start=1)
+    ]
+    BillImage.objects.bulk_create(links)
+    ImageBlob.objects.filter(sha256__in=blobs).update(last_used_at=timezone.now())
+    return links
+
+
+def purge_image_blobs(
+    unlinked_days: Optional[int] = None,
+    linked_days: Optional[int] = None,
+    dry_run: bool = False,
+) -> dict[str, Any]:
+    """Apply the retention policy and delete blob files no bill needs any more.
+
+    - Links of bills created more than `linked_days` ago are removed (None keeps them forever).
+    - Blobs left without links and unused (uploaded or linked) for more than `unlinked_days`
+      are deleted with their files; recent uploads awaiting confirmation are kept.
+
+    Defaults come from UTILITY_BILLS_OCR_BLOB_RETENTION_DAYS / ..._UNLINKED_RETENTION_DAYS.
+    """
+    now = timezone.now()
+    unlinked_days = app_setting("OCR_BLOB_UNLINKED_RETENTION_DAYS") if unlinked_days is None else unlinked_days
+    linked_days = app_setting("OCR_BLOB_RETENTION_DAYS") if linked_days is None else linked_days
+
+    expired_links = BillImage.objects.none()
+    if linked_days is not None:
+        expired_links = BillImage.objects.filter(bill__created_at__lt=now - timedelta(days=linked_days))
+    unlinked_cutoff = now - timedelta(days=unlinked_days)
+
+    # Blobs that have no links left once the expired links are gone.
+    kept_links = BillImage.objects.exclude(pk__in=expired_links.values("pk"))
+    purgeable = ImageBlob.objects.exclude(pk__in=kept_links.values("blob_id")).filter(last_used_at__lt=unlinked_cutoff)
+
+    blobs = list(purgeable.values_list("pk", "file", "stored_size"))
+    stats: dict[str, Any] = {"links_removed": expired_links.count(), "dry_run": dry_run}
+    if dry_run:
+        stats.update(blobs_deleted=len(blobs), bytes_freed=sum(size for _, _, size in blobs))
+        return stats
+
+    expired_links.delete()
+    deleted_count = freed = 0
+    for pk, name, size in blobs:
+        # Re-check: a concurrent save may have linked (or an upload reused) the blob meanwhile.
+        deleted, _ = ImageBlob.objects.filter(
+            pk=pk, bill_links__isnull=True, last_used_at__lt=unlinked_cutoff
+        ).delete()
+        if deleted:
+            if name:
+                default_storage.delete(name)
+            deleted_count += 1
+            freed += size
+    stats.update(blobs_deleted=deleted_count, bytes_freed=freed)
+    return stats
@@ -3,23 +3,205 @@
 
 from __future__ import annotations
 
-from typing import Literal
+import copy
+import functools
+import re
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Optional
 
+from ..conf import app_setting
 from ..models import UtilityType
 
 
-LayoutType = Literal["electricity_summary", "electricity_detailed", "water_unknown", "unknown"]
+# A registered layout's name (see `get_layouts`), or UNKNOWN_LAYOUT.
+LayoutType = str
+UNKNOWN_LAYOUT = "unknown"
 
 
-def classify_layout(raw_text: str) -> LayoutType:
-    """Lightweight heuristics to route to the right parser.
+@dataclass(frozen=True)
+class Layout:
+    """A bill layout `match_layout` can recognise.
 
-    - Summary screenshots: have labels like 'Bill No' / 'Previous reading' or Arabic equivalents.
-    - Detailed electricity: contains 'المصدرة إلى الشبكة' (export to grid) or dinar/fils tables.
+    A text scores the summed weights of the distinct `keywords` it contains, and matches the
+    layout if that is at least MIN_SCORE. `parser` names
+    the page parser for bills of this layout (see `services/page_parsing.py::register_parser`;
+    the built-in ones are named after their utility type).
     """
-    t = raw_text or ""
-    if "المصدرة" in t or "المستجرة" in t or "قراءة عداد الطاقة" in t:
-        return "electricity_detailed"
-    if "Bill No" in t or "Previous reading" in t or "القراءة السابقة" in t:
-        return "electricity_summary"
-    return "unknown"
+
+    name: str
+    utility_type: str
+    parser: str
+    # (keyword, weight) pairs; keywords are matched case-sensitively.
+    keywords: tuple[tuple[str, float], ...]
+
+
+MIN_SCORE = 1.0
+
+# Built-in layouts, in priority order: the earlier layout wins a tie. Labels specific to a
+# layout weigh more than words any bill of the utility (or a letter from its provider) has,
+# which weigh too little to match on their own.
+DEFAULT_LAYOUTS: tuple[Layout, ...] = (
+    Layout(
+        name="electricity_detailed",
+        utility_type=UtilityType.ELECTRICITY,
+        parser=UtilityType.ELECTRICITY,
+        # Imported / exported energy table of official bills.
+        keywords=(("المصدرة", 3), ("المستجرة", 3), ("قراءة عداد الطاقة", 3), ("كهرباء", 0.5), ("kWh", 0.5)),
+    ),
+    Layout(
+        name="electricity_summary",
+        utility_type=UtilityType.ELECTRICITY,
+        parser=UtilityType.ELECTRICITY,
+        keywords=(("Bill No", 1), ("Previous reading", 1), ("القراءة السابقة", 1), ("كهرباء", 0.5), ("kWh", 0.5)),
+    ),
+    Layout(
+        name="water_unknown",
+        utility_type=UtilityType.WATER,
+        parser=UtilityType.WATER,
+        keywords=(
+            ("مياه", 3),
+            ("Water", 3),
+            ("الصرف الصحي", 2),
+            ("متر مكعب", 2),
+            ("القراءة السابقة", 0.5),
+            ("القراءة الحالية", 0.5),
+        ),
+    ),
+)
+
+
+def _layout_from_setting(name: str, spec: dict[str, Any]) -> Layout:
+    return Layout(
+        name=name,
+        utility_type=spec["utility_type"],
+        parser=spec.get("parser", spec["utility_type"]),
+        keywords=tuple((keyword, float(weight)) for keyword, weight in spec["keywords"].items()),
+    )
+
+
+def _layouts_with(custom: dict[str, Any]) -> tuple[Layout, ...]:
+    layouts = {layout.name: layout for layout in DEFAULT_LAYOUTS}
+    for name, spec in custom.items():
+        layouts[name] = _layout_from_setting(name, spec)
+    return tuple(layouts.values())
+
+
+def get_layouts() -> tuple[Layout, ...]:
+    """The layout registry: DEFAULT_LAYOUTS with UTILITY_BILLS_OCR_LAYOUTS applied.
+
+    A setting entry with a built-in name replaces that layout in place; other entries are
+    added after the built-ins.
+    """
+    return _registry().layouts
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """A regex matching any of `words`, shaped as a trie of their characters.
+
+    Keywords sharing a prefix share its states, so the engine tests each position once per
+    distinct next character instead of once per keyword, and a keyword that is a prefix of a
+    longer one yields the longer match.
+    """
+    trie: dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict[str, dict]) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class _KeywordMatcher:
+    """Scores a text against every layout, in one scan of it for all their keywords."""
+
+    def __init__(self, layouts: tuple[Layout, ...]) -> None:
+        self.layouts = layouts
+        # Keyword -> (index of a layout declaring it, weight).
+        self._weights: dict[str, list[tuple[int, float]]] = {}
+        for idx, layout in enumerate(layouts):
+            for keyword, weight in dict(layout.keywords).items():
+                if keyword:
+                    self._weights.setdefault(keyword, []).append((idx, weight))
+        keywords = list(self._weights)
+        self._pattern = re.compile(_trie_pattern(keywords)) if keywords else None
+        # Matches don't overlap, so a keyword contained in a longer match counts as found too.
+        self._contained = {k: tuple(other for other in keywords if other in k) for k in keywords}
+
+    def find(self, text: str) -> set[str]:
+        if self._pattern is None:
+            return set()
+        found: set[str] = set()
+        for keyword in set(self._pattern.findall(text)):
+            found.update(self._contained[keyword])
+        return found
+
+    def scores(self, text: str) -> list[float]:
+        """Each layout's score for `text`, in registry order."""
+        scores = [0.0] * len(self.layouts)
+        for keyword in self.find(text):
+            for idx, weight in self._weights[keyword]:
+                scores[idx] += weight
+        return scores
+
+
+@functools.lru_cache(maxsize=8)
+def _matcher(layouts: tuple[Layout, ...]) -> _KeywordMatcher:
+    return _KeywordMatcher(layouts)
+
+
+# (copy of the UTILITY_BILLS_OCR_LAYOUTS it was built from, matcher) for the current registry.
+_REGISTRY: Optional[tuple[dict[str, Any], _KeywordMatcher]] = None
+
+
+def _registry() -> _KeywordMatcher:
+    global _REGISTRY
+    custom = app_setting("OCR_LAYOUTS") or {}
+    cached = _REGISTRY
+    if cached is None or cached[0] != custom:
+        cached = _REGISTRY = (copy.deepcopy(custom), _KeywordMatcher(_layouts_with(custom)))
+    return cached[1]
+
+
+@dataclass
+class LayoutMatch:
+    """The best scoring layout for a text (None if none scored MIN_SCORE) and the others that scored."""
+
+    layout: Optional[Layout]
+    score: float = 0.0
+    # (layout name, score) of the other layouts with a positive score, best first.
+    runner_ups: list[tuple[str, float]] = field(default_factory=list)
+
+    @property
+    def name(self) -> LayoutType:
+        return self.layout.name if self.layout is not None else UNKNOWN_LAYOUT
+
+
+def match_layout(raw_text: str, layouts: Optional[Iterable[Layout]] = None) -> LayoutMatch:
+    """Score every layout of the registry (or `layouts`) against `raw_text`.
+
+    The text is scanned once for all keywords, however many layouts are registered. The
+    highest score of at least MIN_SCORE wins; ties go to the earlier layout.
+    """
+    matcher = _registry() if layouts is None else _matcher(tuple(layouts))
+    scores = matcher.scores(raw_text or "")
+    # A stable sort: equal scores keep registry order.
+    ranked = sorted((idx for idx, score in enumerate(scores) if score > 0), key=lambda idx: -scores[idx])
+    best = ranked[0] if ranked and scores[ranked[0]] >= MIN_SCORE else None
+    return LayoutMatch(
+        layout=matcher.layouts[best] if best is not None else None,
+        score=scores[best] if best is not None else 0.0,
+        runner_ups=[(matcher.layouts[idx].name, scores[idx]) for idx in ranked if idx != best],
+    )
+
+
+def classify_layout(raw_text: str) -> LayoutType:
+    """Name of the layout that best matches `raw_text` (see `match_layout`), or "unknown"."""
+    return match_layout(raw_text).name
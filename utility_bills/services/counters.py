@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+from django.core.cache import BaseCache, caches
+
+from ..conf import app_setting
+
+
+class CacheCounters:
+    """Named counters kept in a cache backend, so every process sharing the cache adds to them.
+
+    `alias_setting` names the app setting holding the cache alias; it is read on each use so
+    settings overrides apply. Counters never expire; `read(reset=True)` clears them.
+    """
+
+    def __init__(self, prefix: str, alias_setting: str, names: Iterable[str]) -> None:
+        self.prefix = prefix
+        self.alias_setting = alias_setting
+        self.names = tuple(names)
+
+    def _cache(self) -> BaseCache:
+        return caches[app_setting(self.alias_setting)]
+
+    def _key(self, name: str) -> str:
+        return f"{self.prefix}:stats:{name}"
+
+    def incr(self, name: str) -> None:
+        cache = self._cache()
+        key = self._key(name)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Missing key: create it, unless another process just did.
+            if not cache.add(key, 1, timeout=None):
+                cache.incr(key)
+
+    def read(self, reset: bool = False) -> dict[str, int]:
+        """Current value of every counter (0 when never incremented)."""
+        cache = self._cache()
+        keys = {name: self._key(name) for name in self.names}
+        values = cache.get_many(keys.values())
+        if reset:
+            cache.delete_many(keys.values())
+        return {name: int(values.get(key, 0)) for name, key in keys.items()}
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import hashlib
+import uuid
+from decimal import Decimal
+from typing import Any, Iterable
+
+from django.core.cache import BaseCache, caches
+from django.db import transaction
+from django.db.models import Max
+
+from ..conf import app_setting
+from ..models import MonthlyUsageRollup, UtilityMeter
+from .aggregations import rollup_monthly, rollup_monthly_by_meter
+from .counters import CacheCounters
+
+
+# Configurable constants for solar savings estimation
+SOLAR_EXPORT_RATE_JOD_PER_KWH = Decimal("0.070")  # Estimated value per exported kWh
+
+_KEY_PREFIX = "utility_bills:dashboard"
+_stats = CacheCounters(_KEY_PREFIX, "DASHBOARD_CACHE_ALIAS", ("hits", "misses", "invalidations"))
+
+
+def compute_dashboard_stats(user_id: int, year: int, utility_type: str = "", meter_id: int | None = None) -> dict[str, Any]:
+    """Compute totals, chart series and solar ratios for one dashboard filter combination."""
+    rollups = MonthlyUsageRollup.objects.filter(user_id=user_id, year=year)
+    if utility_type:
+        rollups = rollups.filter(utility_type=utility_type)
+    if meter_id:
+        rollups = rollups.filter(meter_id=meter_id)
+    spending, energy = rollup_monthly(rollups)
+
+    total_import_kwh = energy.total_import_kwh
+    total_export_kwh = energy.total_export_kwh
+    total_net_kwh = energy.total_net_kwh
+
+    # Calculate solar/consumption analytics
+    # Self-consumption ratio: portion of generated solar used on-site
+    # = (total_export_kwh / estimated_generation) but we don't have generation
+    # Instead, we compute: export_kwh / import_kwh as "export ratio"
+    # Grid dependency ratio: net_kwh / import_kwh (lower is better for solar users)
+    self_consumption_ratio: float | None = None
+    grid_dependency_ratio: float | None = None
+
+    if total_import_kwh > 0:
+        # Export ratio (how much of what we could have used did we export)
+        self_consumption_ratio = round(
+            (1 - (total_export_kwh / total_import_kwh)) * 100, 1
+        ) if total_export_kwh > 0 else 100.0
+
+        # Grid dependency (what portion of consumption came from grid)
+        grid_dependency_ratio = round((total_net_kwh / total_import_kwh) * 100, 1)
+
+    # Estimated solar savings = export_kwh * rate
+    estimated_solar_savings = Decimal(total_export_kwh) * SOLAR_EXPORT_RATE_JOD_PER_KWH
+
+    chart_payload = {
+        "labels": [f"{year}-{m:02d}" for m in range(1, 13)],
+        "monthly_total_amount": [float(v) for v in spending.monthly],
+        "electricity_import_kwh": energy.import_kwh,
+        "electricity_export_kwh": energy.export_kwh,
+        "electricity_net_kwh": energy.net_kwh,
+        "electricity_billed_kwh": energy.billed_kwh,
+    }
+
+    return {
+        "total_spent": spending.total,
+        "spent_by_utility": spending.by_utility,
+        "chart_payload": chart_payload,
+        "total_import_kwh": total_import_kwh,
+        "total_export_kwh": total_export_kwh,
+        "total_net_kwh": total_net_kwh,
+        "self_consumption_ratio": self_consumption_ratio,
+        "grid_dependency_ratio": grid_dependency_ratio,
+        "estimated_solar_savings": estimated_solar_savings,
+        "meter_series": rollup_monthly_by_meter(rollups),
+    }
+
+
+def _meter_labels(user_id: int) -> dict[int, tuple[str, str, str]]:
+    """Meter id -> (utility type, meter number, nickname) for all of the user's meters."""
+    return {
+        pk: (utility_type, number, nickname)
+        for pk, utility_type, number, nickname in UtilityMeter.objects.filter(user_id=user_id)
+        .order_by("pk")
+        .values_list("pk", "utility_type", "meter_number", "nickname")
+    }
+
+
+def label_meter_series(user_id: int, series: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Add current meter numbers and nicknames to cached per-meter series (see `rollup_monthly_by_meter`).
+
+    Meter metadata is not part of the cached stats, whose version only follows bill changes,
+    so renaming a meter shows up right away.
+    """
+    labels = _meter_labels(user_id)
+    labelled = []
+    for entry in series:
+        meter_type, number, nickname = labels.get(entry["meter_id"], (entry["utility_type"], "", ""))
+        entry = {"meter_id": entry["meter_id"], "meter_number": number, "nickname": nickname, **entry}
+        labelled.append((meter_type, number, entry))
+    return [entry for _, _, entry in sorted(labelled, key=lambda item: (item[0], item[1]))]
+
+
+def dashboard_etag(user_id: int, year: int, utility_type: str = "", meter_id: int | None = None) -> str:
+    """ETag for dashboard data: changes whenever any of the user's bills or meters changes.
+
+    Derived from the user's latest rollup modification, which every bill save/delete touches
+    (emptied rollup rows are kept rather than deleted, so the timestamp never goes backwards),
+    and from the meter numbers and nicknames shown next to the per-meter series.
+    """
+    latest = MonthlyUsageRollup.objects.filter(user_id=user_id).aggregate(m=Max("updated_at"))["m"]
+    meters = hashlib.sha1(repr(sorted(_meter_labels(user_id).items())).encode()).hexdigest()
+    raw = f"{user_id}:{latest.isoformat() if latest else '-'}:{meters}:{year}:{utility_type or 'all'}:{meter_id or 'all'}"
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _cache() -> BaseCache:
+    return caches[app_setting("DASHBOARD_CACHE_ALIAS")]
+
+
+def _version_key(user_id: int, year: int) -> str:
+    return f"{_KEY_PREFIX}:version:{user_id}:{year}"
+
+
+def get_dashboard_stats(user_id: int, year: int, utility_type: str = "", meter_id: int | None = None) -> dict[str, Any]:
+    """Return dashboard stats, served from the cache when the user's data for `year` is unchanged.
+
+    Entries are keyed by user + year + filters and by a per-user/year version token; any bill
+    change bumps the token (see `invalidate_dashboard_stats`), so stale entries are never read.
+    """
+    timeout = app_setting("DASHBOARD_CACHE_TIMEOUT")
+    if timeout == 0:
+        return compute_dashboard_stats(user_id, year, utility_type, meter_id)
+
+    cache = _cache()
+    version_key = _version_key(user_id, year)
+    version = cache.get(version_key)
+    if version is None:
+        # A fresh token (never a reset counter) so entries from an evicted version can't resurface.
+        cache.add(version_key, uuid.uuid4().hex, timeout=None)
+        version = cache.get(version_key)
+
+    key = f"{_KEY_PREFIX}:{user_id}:{year}:{version}:{utility_type or 'all'}:{meter_id or 'all'}"
+    stats = cache.get(key)
+    if stats is not None:
+        _stats.incr("hits")
+        return stats
+
+    _stats.incr("misses")
+    stats = compute_dashboard_stats(user_id, year, utility_type, meter_id)
+    cache.set(key, stats, timeout=timeout)
+    return stats
+
+
+def invalidate_dashboard_stats(user_id: int, years: Iterable[int]) -> None:
+    """Drop every cached dashboard variant of `user_id` for the given years.
+
+    The version token is replaced once the current transaction commits (right away in
+    autocommit). Replaced earlier, a concurrent request could recompute from the
+    not-yet-committed rollups and cache the old numbers under the new token.
+    """
+    years = set(years)
+    transaction.on_commit(lambda: _bump_versions(user_id, years))
+
+
+def _bump_versions(user_id: int, years: set[int]) -> None:
+    cache = _cache()
+    for year in years:
+        cache.set(_version_key(user_id, year), uuid.uuid4().hex, timeout=None)
+        _stats.incr("invalidations")
+
+
+def dashboard_cache_stats(reset: bool = False) -> dict[str, Any]:
+    """Hit/miss/invalidation counters shared through the dashboard cache backend."""
+    stats: dict[str, Any] = _stats.read(reset=reset)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else None
+    return stats
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from ..conf import app_setting
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class FieldRegion:
+    """A region of a bill image holding one group of fields.
+
+    `box` is (left, top, right, bottom) as fractions of the (preprocessed) image size.
+    Official bills print their labels next to the values, so regions are normally OCR'd
+    as-is; `prefix` is written before the recognised text for regions that hold only a
+    value, so the parser still finds its label.
+    """
+
+    name: str
+    box: tuple[float, float, float, float]
+    prefix: str = ""
+
+
+@dataclass(frozen=True)
+class LayoutTemplate:
+    layout: str
+    regions: tuple[FieldRegion, ...]
+    # ElectricityParsed fields the regions must yield; otherwise the page is OCR'd in full.
+    required_fields: tuple[str, ...]
+    # Shown on the upload form; defaults to the layout name.
+    label: str = ""
+
+
+# Built-in templates. None ship yet: boxes must be measured on a provider's real bills, and
+# guessed full-width bands OCR as many pixels as the whole page. Configure them per deployment
+# with UTILITY_BILLS_OCR_LAYOUT_TEMPLATES.
+DEFAULT_TEMPLATES: dict[str, LayoutTemplate] = {}
+
+# Templates whose regions cover more of the page than this are ignored: recognising them costs
+# about as much as a full-page pass, plus the fallback when a region check fails.
+MAX_REGION_AREA = 0.5
+
+
+def _template_from_setting(layout: str, spec: dict[str, Any]) -> LayoutTemplate:
+    return LayoutTemplate(
+        layout=layout,
+        regions=tuple(
+            FieldRegion(r["name"], tuple(r["box"]), r.get("prefix", ""))  # type: ignore[arg-type]
+            for r in spec["regions"]
+        ),
+        required_fields=tuple(spec.get("required_fields", ())),
+        label=spec.get("label", ""),
+    )
+
+
+def template_fingerprint(template: LayoutTemplate) -> str:
+    """Short hash of the template's regions and required fields (part of the OCR cache key)."""
+    spec = repr((tuple((r.name, r.box, r.prefix) for r in template.regions), template.required_fields))
+    return hashlib.sha256(spec.encode()).hexdigest()[:12]
+
+
+def region_area(template: LayoutTemplate) -> float:
+    """Fraction of the page the template's regions cover (overlaps counted twice)."""
+    return sum((right - left) * (bottom - top) for left, top, right, bottom in (r.box for r in template.regions))
+
+
+def get_layout_template(layout: str) -> Optional[LayoutTemplate]:
+    """Template for `layout`, from UTILITY_BILLS_OCR_LAYOUT_TEMPLATES or the built-in defaults.
+
+    None when there is none, or when its regions cover more than MAX_REGION_AREA of the page.
+    """
+    custom = app_setting("OCR_LAYOUT_TEMPLATES") or {}
+    template = _template_from_setting(layout, custom[layout]) if layout in custom else DEFAULT_TEMPLATES.get(layout)
+    if template is not None and region_area(template) > MAX_REGION_AREA:
+        logger.warning(
+            "Layout template %r covers %.0f%% of the page (limit %.0f%%); OCR'ing full pages instead",
+            layout, region_area(template) * 100, MAX_REGION_AREA * 100,
+        )
+        return None
+    return template
+
+
+def layout_template_choices() -> list[tuple[str, str]]:
+    """(layout, label) for each layout with a usable template: the ones region OCR is offered for."""
+    names = dict.fromkeys([*DEFAULT_TEMPLATES, *(app_setting("OCR_LAYOUT_TEMPLATES") or {})])
+    templates = [get_layout_template(name) for name in names]
+    return [(t.layout, t.label or t.layout) for t in templates if t is not None]
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from typing import Callable, Iterable, Optional
+
+from django.db.models import F
+from django.utils import timezone
+
+from ..conf import app_setting
+from ..models import OcrCacheEntry
+from .ocr_engine import ImageSource, OcrResult, join_pages, mean_confidence
+
+
+def image_digest(source: ImageSource) -> str:
+    """SHA-256 of the image file's bytes (a file object is rewound afterwards)."""
+    h = hashlib.sha256()
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(chunk)
+    else:
+        source.seek(0)
+        for chunk in iter(lambda: source.read(1024 * 1024), b""):
+            h.update(chunk)
+        source.seek(0)
+    return h.hexdigest()
+
+
+def ocr_with_cache(
+    image_paths: Iterable[ImageSource],
+    engine: str,
+    options: str,
+    run: Callable[[list[ImageSource]], OcrResult],
+) -> OcrResult:
+    """OCR images through the content-addressed result cache.
+
+    Each image is looked up by (SHA-256 of its bytes, engine, options); only the misses are
+    passed to `run`, which must return one page per image it was given. Pages are reassembled
+    in the original order and `cache_hits` reports how many images skipped OCR.
+    """
+    paths = list(image_paths)
+    if not app_setting("OCR_CACHE_ENABLED") or not paths:
+        return run(paths)
+
+    digests = [image_digest(p) for p in paths]
+    cached = {
+        e.image_sha256: e
+        for e in OcrCacheEntry.objects.filter(engine=engine, options=options, image_sha256__in=set(digests))
+    }
+
+    # OCR each distinct missing image once, even if it appears several times in the upload.
+    missing: dict[str, ImageSource] = {}
+    for digest, path in zip(digests, paths):
+        if digest not in cached:
+            missing.setdefault(digest, path)
+
+    fresh_pages: dict[str, str] = {}
+    fresh_seconds: dict[str, float] = {}
+    fresh_steps: dict[str, list[str]] = {}
+    fresh_modes: dict[str, str] = {}
+    fresh_confidences: dict[str, Optional[float]] = {}
+    engine_name = engine
+    if missing:
+        fresh = run(list(missing.values()))
+        engine_name = fresh.engine
+        fresh_pages = dict(zip(missing, fresh.pages))
+        fresh_seconds = dict(zip(missing, fresh.image_seconds))
+        fresh_steps = dict(zip(missing, fresh.preprocessing))
+        fresh_modes = dict(zip(missing, fresh.ocr_modes))
+        fresh_confidences = dict(zip(missing, fresh.page_confidences))
+        _store(engine, options, fresh_pages, fresh_confidences)
+
+    if cached:
+        OcrCacheEntry.objects.filter(pk__in=[e.pk for e in cached.values()]).update(
+            hits=F("hits") + 1, last_used_at=timezone.now()
+        )
+
+    pages = [cached[d].text if d in cached else fresh_pages[d] for d in digests]
+    confidences = [cached[d].confidence if d in cached else fresh_confidences.get(d) for d in digests]
+    return OcrResult(
+        text=join_pages(pages),
+        engine=engine_name,
+        pages=pages,
+        image_seconds=[0.0 if d in cached else fresh_seconds.get(d, 0.0) for d in digests],
+        cache_hits=sum(1 for d in digests if d in cached),
+        preprocessing=[[] if d in cached else fresh_steps.get(d, []) for d in digests],
+        ocr_modes=["cache" if d in cached else fresh_modes.get(d, "full") for d in digests],
+        confidence=mean_confidence(confidences),
+        page_confidences=confidences,
+    )
+
+
+def _store(engine: str, options: str, pages: dict[str, str], confidences: dict[str, Optional[float]]) -> None:
+    OcrCacheEntry.objects.bulk_create(
+        [
+            OcrCacheEntry(image_sha256=d, engine=engine, options=options, text=text, confidence=confidences.get(d))
+            for d, text in pages.items()
+        ],
+        ignore_conflicts=True,
+    )
+    if _store_counter.add(len(pages)):
+        evict_ocr_cache()
+
+
+class _StoreCounter:
+    """Per-process count of stored entries; signals every OCR_CACHE_EVICT_EVERY of them.
+
+    Evicting after each store cost a scan of the whole table per upload. With several
+    processes the table can exceed OCR_CACHE_MAX_ENTRIES by up to one interval per process
+    until their next eviction.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stored = 0
+
+    def add(self, n: int) -> bool:
+        every = app_setting("OCR_CACHE_EVICT_EVERY")
+        if not every:
+            return False
+        with self._lock:
+            self._stored += n
+            if self._stored < every:
+                return False
+            self._stored = 0
+            return True
+
+
+_store_counter = _StoreCounter()
+
+
+def evict_ocr_cache(max_entries: int | None = None) -> int:
+    """Delete least recently used entries beyond the configured size; returns the number removed.
+
+    Runs every OCR_CACHE_EVICT_EVERY stores and from `manage.py evict_ocr_cache`. Only the
+    excess rows are read (oldest first), instead of skipping over the newest `max_entries`.
+    """
+    limit = app_setting("OCR_CACHE_MAX_ENTRIES") if max_entries is None else max_entries
+    if limit is None:
+        return 0
+    excess = OcrCacheEntry.objects.count() - limit
+    if excess <= 0:
+        return 0
+    stale = list(OcrCacheEntry.objects.order_by("last_used_at", "pk").values_list("pk", flat=True)[:excess])
+    deleted, _ = OcrCacheEntry.objects.filter(pk__in=stale).delete()
+    return deleted
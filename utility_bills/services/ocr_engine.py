@@ -3,8 +3,37 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Iterable, Optional
+import importlib.util
+import logging
+import math
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, NamedTuple, Optional, Union
+
+from django.core.exceptions import ImproperlyConfigured
+
+from ..conf import app_setting
+from .preprocessing import configured_steps, preprocess_image
+
+
+logger = logging.getLogger(__name__)
+
+# An image to OCR: a file path, or a seekable binary file object (e.g. an in-memory upload).
+ImageSource = Union[str, BinaryIO]
+
+
+def decode_limits() -> dict[str, Any]:
+    """The image decoding limits in effect (reported with every OcrResult)."""
+    return {
+        "decode_max_side": app_setting("OCR_DECODE_MAX_SIDE"),
+        "max_image_pixels": app_setting("OCR_MAX_IMAGE_PIXELS"),
+        "memory_budget_mb": app_setting("OCR_MEMORY_BUDGET_MB"),
+    }
 
 
 @dataclass
@@ -12,54 +41,564 @@ class OcrResult:
     text: str
     engine: str
     confidence: Optional[float] = None
+    # Per input image, in upload order: recognised text and wall-clock OCR seconds.
+    pages: list[str] = field(default_factory=list)
+    image_seconds: list[float] = field(default_factory=list)
+    # Number of images whose text came from the OCR result cache instead of the engine.
+    cache_hits: int = 0
+    # Preprocessing steps that changed each image (e.g. "grayscale", "resize(3400->2000)").
+    preprocessing: list[list[str]] = field(default_factory=list)
+    # How each image was recognised: "full" page, "roi" (layout template regions only) or "cache".
+    ocr_modes: list[str] = field(default_factory=list)
+    # Mean word/line confidence (0..1) per image; `confidence` is their mean.
+    page_confidences: list[Optional[float]] = field(default_factory=list)
+    # Indexes of the images the "auto" engine re-OCR'd with PaddleOCR.
+    escalated: list[int] = field(default_factory=list)
+    # Decoding limits applied to the images (see `decode_limits`).
+    limits: dict[str, Any] = field(default_factory=decode_limits)
+
+    @property
+    def cache_hit(self) -> bool:
+        """True when every image was served from the cache (no OCR ran)."""
+        return bool(self.pages) and self.cache_hits == len(self.pages)
 
 
 class OcrEngineError(RuntimeError):
     pass
 
 
-def ocr_images_tesseract(image_paths: Iterable[str], lang: str = "ara+eng", psm: int = 6) -> OcrResult:
-    """OCR images using Tesseract via pytesseract.
+class OcrImageTooLarge(OcrEngineError):
+    """An image is above OCR_MAX_IMAGE_PIXELS even after decode-time downscaling."""
+
+
+class OcrMemoryBusy(OcrEngineError):
+    """The OCR memory budget stayed used up for OCR_MEMORY_WAIT_TIMEOUT; retry after `retry_after` seconds."""
+
+    def __init__(self, message: str, retry_after: int) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def join_pages(texts: Iterable[str]) -> str:
+    """Concatenate per-image texts with `--- IMAGE n ---` markers."""
+    return "".join(f"\n\n--- IMAGE {idx} ---\n{text}" for idx, text in enumerate(texts, start=1)).strip()
+
+
+# Only the marker line itself: matching the blank lines around it in the pattern backtracks
+# over every run of newlines, which made splitting quadratic. They are trimmed below instead.
+_PAGE_MARKER_RE = re.compile(r"^--- IMAGE \d+ ---$", re.MULTILINE)
+
+
+def split_pages(text: str) -> list[str]:
+    """The per-image texts of a `join_pages` text; text without markers is a single page."""
+    parts = _PAGE_MARKER_RE.split(text)
+    if len(parts) == 1:
+        return [text]
+    # Newlines before a marker belong to the separator, as does the one right after it.
+    parts = [part.rstrip("\n") for part in parts[:-1]] + parts[-1:]
+    pre, *pages = [parts[0]] + [part[1:] if part.startswith("\n") else part for part in parts[1:]]
+    return [pre, *pages] if pre.strip() else pages
+
+
+class _Page(NamedTuple):
+    text: str
+    seconds: float
+    preprocessing: list[str]
+    confidence: Optional[float]
+
+
+def mean_confidence(values: Iterable[Optional[float]]) -> Optional[float]:
+    """Mean of the known confidences, rounded to 4 places (None if there are none)."""
+    known = [v for v in values if v is not None]
+    return round(sum(known) / len(known), 4) if known else None
+
+
+# Rough peak memory per decoded pixel while an image is OCR'd: the RGB(A) frame plus the
+# copies made by preprocessing and the engine's input conversion.
+_BYTES_PER_PIXEL_ESTIMATE = 8
+
+
+class _MemoryBudget:
+    """Per-process budget for the images being decoded/OCR'd at the same time.
+
+    Each image reserves its estimated peak memory before it is decoded and releases it once
+    OCR is done; when the budget is used up, further images wait (up to
+    OCR_MEMORY_WAIT_TIMEOUT) instead of pushing the process out of memory. An image larger
+    than the whole budget waits until it can run alone.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._used = 0
+
+    @contextmanager
+    def reserve(self, nbytes: int) -> Iterator[float]:
+        """Reserve `nbytes`; yields the seconds spent waiting."""
+        budget_mb = app_setting("OCR_MEMORY_BUDGET_MB")
+        if not budget_mb:
+            yield 0.0
+            return
+        limit = budget_mb * 1024 * 1024
+        nbytes = min(nbytes, limit)
+        started = time.perf_counter()
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._used + nbytes <= limit, timeout=app_setting("OCR_MEMORY_WAIT_TIMEOUT")):
+                raise OcrMemoryBusy(
+                    "Timed out waiting for OCR memory budget; too many large images in progress.",
+                    app_setting("OCR_RETRY_AFTER_SECONDS"),
+                )
+            self._used += nbytes
+        waited = time.perf_counter() - started
+        try:
+            yield waited
+        finally:
+            with self._cond:
+                self._used -= nbytes
+                self._cond.notify_all()
+
+
+_memory_budget = _MemoryBudget()
+
+
+@contextmanager
+def reserve_image_memory(width: int, height: int) -> Iterator[float]:
+    """Hold the OCR memory budget while decoding a `width` x `height` image outside OCR.
+
+    Yields the seconds spent waiting; raises OcrMemoryBusy like OCR does.
+    """
+    with _memory_budget.reserve(width * height * _BYTES_PER_PIXEL_ESTIMATE) as waited:
+        yield waited
+
+
+def _decode_bounded(img: Any, steps: list[str]) -> str:
+    """Ask the decoder for a smaller image (JPEG draft mode) when it exceeds OCR_DECODE_MAX_SIDE.
+
+    Draft mode decodes at 1/2, 1/4 or 1/8 scale directly, so the full-size frame is never
+    held in memory. Requesting half the limit makes the decoder pick the largest scale that
+    still fits under it. Returns a description for `OcrResult.preprocessing` ("" if unchanged).
+    """
+    max_side = app_setting("OCR_DECODE_MAX_SIDE")
+    w, h = img.size
+    if not max_side or max(w, h) <= max_side or img.format != "JPEG":
+        return ""
+    scale = max_side / max(w, h) / 2
+    img.draft("L" if "grayscale" in steps else None, (math.ceil(w * scale), math.ceil(h * scale)))
+    if img.size == (w, h):
+        return ""
+    return f"draft({w}x{h}->{img.size[0]}x{img.size[1]})"
+
+
+def _reduce_bounded(img: Any) -> tuple[Any, str]:
+    """Integer-factor downscale of a decoded image still above OCR_DECODE_MAX_SIDE (non-JPEG)."""
+    max_side = app_setting("OCR_DECODE_MAX_SIDE")
+    w, h = img.size
+    if not max_side or max(w, h) <= max_side:
+        return img, ""
+    reduced = img.reduce(math.ceil(max(w, h) / max_side))
+    return reduced, f"reduce({w}x{h}->{reduced.size[0]}x{reduced.size[1]})"
+
+
+@contextmanager
+def _open_image(source: ImageSource, preprocess: Optional[Iterable[str]]) -> Iterator[tuple[Any, list[str]]]:
+    """Decode an image within the memory limits and run the preprocessing pipeline.
+
+    Yields the preprocessed image and the steps applied (decode-time downscaling first); the
+    image's memory budget is held until the `with` block, i.e. the OCR call, ends. Raises
+    OcrImageTooLarge for images above OCR_MAX_IMAGE_PIXELS even after downscaling, and
+    OcrMemoryBusy when the memory budget doesn't free up in time.
+    """
+    from PIL import Image  # type: ignore
+
+    if not isinstance(source, str):
+        # The same upload may be read more than once (cache digest, cascade, ROI fallback).
+        source.seek(0)
+    steps = configured_steps(preprocess)
+    img = Image.open(source)  # reads the header only
+    applied = [d for d in [_decode_bounded(img, steps)] if d]
+
+    w, h = img.size
+    max_pixels = app_setting("OCR_MAX_IMAGE_PIXELS")
+    if max_pixels and w * h > max_pixels:
+        img.close()
+        raise OcrImageTooLarge(
+            f"Image is {w}x{h} ({w * h / 1e6:.1f} MP), above the {max_pixels / 1e6:.1f} MP limit (OCR_MAX_IMAGE_PIXELS)."
+        )
+
+    with _memory_budget.reserve(w * h * _BYTES_PER_PIXEL_ESTIMATE) as waited:
+        if waited >= 1:
+            logger.info("Waited %.1fs for OCR memory budget (%dx%d image)", waited, w, h)
+        img.load()
+        img, reduced = _reduce_bounded(img)
+        if reduced:
+            applied.append(reduced)
+        img, pre_applied = preprocess_image(img, steps)
+        yield img, applied + pre_applied
+
+
+def _result(engine: str, pages: list[_Page]) -> OcrResult:
+    texts = [p.text for p in pages]
+    return OcrResult(
+        text=join_pages(texts),
+        engine=engine,
+        confidence=mean_confidence(p.confidence for p in pages),
+        page_confidences=[p.confidence for p in pages],
+        pages=texts,
+        image_seconds=[round(p.seconds, 3) for p in pages],
+        preprocessing=[p.preprocessing for p in pages],
+        ocr_modes=["full"] * len(pages),
+    )
+
+
+class _TessApiPool:
+    """Per-process pool of in-process Tesseract handles (tesserocr), keyed by (lang, psm).
+
+    Creating a handle loads the traineddata (the slow part of a `tesseract` run); handles
+    are kept and reused across images and requests. A handle is used by one thread at a
+    time, and there are never more handles than threads that used Tesseract concurrently.
+    tesserocr releases the GIL while recognising, so worker threads still run in parallel.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._idle: dict[tuple[str, int], list[Any]] = {}
+
+    @contextmanager
+    def api(self, lang: str, psm: int) -> Iterator[Any]:
+        import tesserocr  # type: ignore
+
+        key = (lang, psm)
+        with self._lock:
+            idle = self._idle.get(key)
+            api = idle.pop() if idle else None
+        if api is None:
+            try:
+                api = tesserocr.PyTessBaseAPI(lang=lang, psm=psm)
+            except RuntimeError as e:  # e.g. traineddata for `lang` not found
+                raise OcrEngineError(f"Could not initialise Tesseract ({lang}): {e}") from e
+        try:
+            yield api
+        finally:
+            api.Clear()
+            with self._lock:
+                self._idle.setdefault(key, []).append(api)
+
+
+_tess_api_pool = _TessApiPool()
+
+
+def tesseract_backend() -> str:
+    """The Tesseract binding to use: "tesserocr" (in-process) or "pytesseract" (subprocess).
+
+    Follows UTILITY_BILLS_OCR_TESSERACT_BACKEND; "auto" prefers tesserocr when it is installed.
+    """
+    backend = app_setting("OCR_TESSERACT_BACKEND")
+    if backend not in ("auto", "tesserocr", "pytesseract"):
+        raise ImproperlyConfigured(f"Unknown OCR_TESSERACT_BACKEND {backend!r}; use auto, tesserocr or pytesseract.")
+    candidates = ["tesserocr", "pytesseract"] if backend == "auto" else [backend]
+    for name in candidates:
+        if importlib.util.find_spec(name) is not None:
+            return name
+    raise OcrEngineError("Tesseract OCR requested but dependencies are missing. Install optional extra: ocr_tesseract")
+
+
+def _tidy(raw: str) -> str:
+    # Same shape as the pytesseract path: one line per text line, words single-spaced.
+    lines = (" ".join(line.split()) for line in raw.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def _tesserocr_result(api: Any) -> tuple[str, Optional[float]]:
+    raw = api.GetUTF8Text()
+    confs = [c / 100 for c in api.AllWordConfidences() if c >= 0]
+    return _tidy(raw), (sum(confs) / len(confs) if confs else None)
+
+
+def _tesserocr_read(img: Any, lang: str, psm: int) -> tuple[str, Optional[float]]:
+    with _tess_api_pool.api(lang, psm) as api:
+        api.SetImage(img)
+        return _tesserocr_result(api)
+
+
+def _pytesseract_words(img: Any, lang: str, psm: int) -> Iterator[tuple[str, float, tuple[int, int, int], int]]:
+    """(word, confidence, line key, vertical centre) for each word of one `tesseract` run."""
+    import pytesseract  # type: ignore
+
+    data = pytesseract.image_to_data(img, lang=lang, config=f"--psm {psm}", output_type=pytesseract.Output.DICT)
+    rows = zip(data["text"], data["conf"], data["block_num"], data["par_num"], data["line_num"], data["top"], data["height"])
+    for word, conf, block, par, line, top, height in rows:
+        word = (word or "").strip()
+        if word:
+            yield word, float(conf), (block, par, line), top + height // 2
+
+
+def _pytesseract_text(words: Iterable[tuple[str, float, tuple[int, int, int], int]]) -> tuple[str, Optional[float]]:
+    lines: dict[tuple[int, int, int], list[str]] = {}
+    confs: list[float] = []
+    for word, conf, key, _ in words:
+        lines.setdefault(key, []).append(word)
+        if conf >= 0:
+            confs.append(conf / 100)
+    text = "\n".join(" ".join(line) for _, line in sorted(lines.items()))
+    return text, (sum(confs) / len(confs) if confs else None)
+
+
+def tesseract_read(img: Any, lang: str, psm: int) -> tuple[str, Optional[float]]:
+    """Recognise a PIL image with word confidences.
+
+    Returns the text (words re-joined per line) and the mean word confidence in 0..1
+    (None when no words were found). Uses the in-process binding when available
+    (see `tesseract_backend`), otherwise one `tesseract` subprocess per call.
+    """
+    if tesseract_backend() == "tesserocr":
+        return _tesserocr_read(img, lang, psm)
+    return _pytesseract_text(_pytesseract_words(img, lang, psm))
+
+
+# Blank rows between regions stacked for one pytesseract run, so no text line spans two.
+_REGION_GAP = 16
+
+# Region (text, confidence) pairs, in box order.
+RegionTexts = list[tuple[str, Optional[float]]]
+
+
+class RegionRead(NamedTuple):
+    regions: RegionTexts
+    # Full-page (text, confidence) when `accept` rejected the regions, else None.
+    full: Optional[tuple[str, Optional[float]]]
+    preprocessing: list[str]
+
+
+def _tesserocr_regions(
+    img: Any, rects: list[tuple[int, int, int, int]], lang: str, psm: int, accept: Optional[Callable[[RegionTexts], bool]]
+) -> tuple[RegionTexts, Optional[tuple[str, Optional[float]]]]:
+    # One handle and one SetImage for all regions; SetRectangle limits recognition to each box.
+    with _tess_api_pool.api(lang, psm) as api:
+        api.SetImage(img)
+        regions = []
+        for left, top, right, bottom in rects:
+            api.SetRectangle(left, top, right - left, bottom - top)
+            regions.append(_tesserocr_result(api))
+        if accept is None or accept(regions):
+            return regions, None
+        api.SetRectangle(0, 0, *img.size)
+        return regions, _tesserocr_result(api)
+
+
+def _pytesseract_regions(img: Any, rects: list[tuple[int, int, int, int]], lang: str, psm: int) -> RegionTexts:
+    from PIL import Image  # type: ignore
+
+    # Stack the crops into one sheet so all regions cost one `tesseract` run, then hand each
+    # word back to the region its vertical centre falls in.
+    crops = [img.crop(rect) for rect in rects]
+    height = sum(c.height for c in crops) + _REGION_GAP * max(len(crops) - 1, 0)
+    sheet = Image.new(img.mode, (max((c.width for c in crops), default=1) or 1, height or 1), "white")
+    bottoms = []
+    y = 0
+    for crop in crops:
+        sheet.paste(crop, (0, y))
+        y += crop.height
+        bottoms.append(y + _REGION_GAP // 2)
+        y += _REGION_GAP
+    per_region: list[list[tuple[str, float, tuple[int, int, int], int]]] = [[] for _ in crops]
+    for word in _pytesseract_words(sheet, lang, psm):
+        idx = next((i for i, bottom in enumerate(bottoms) if word[3] < bottom), len(crops) - 1)
+        per_region[idx].append(word)
+    return [_pytesseract_text(words) for words in per_region]
+
+
+def ocr_regions_tesseract(
+    path: ImageSource,
+    boxes: Iterable[tuple[float, float, float, float]],
+    lang: str = "ara+eng",
+    psm: int = 6,
+    preprocess: Optional[Iterable[str]] = None,
+    accept: Optional[Callable[[RegionTexts], bool]] = None,
+) -> RegionRead:
+    """OCR only the given regions of one image.
+
+    `boxes` are (left, top, right, bottom) fractions of the preprocessed image size. All
+    regions go through one Tesseract handle (tesserocr) or one `tesseract` run (pytesseract).
+    If `accept` is given and returns False for the region texts, the whole image is OCR'd too,
+    reusing the decoded image (and, with tesserocr, the same handle).
+    """
+    with _open_image(path, preprocess) as (img, applied):
+        w, h = img.size
+        rects = [
+            (round(left * w), round(top * h), round(right * w), round(bottom * h)) for left, top, right, bottom in boxes
+        ]
+        if tesseract_backend() == "tesserocr":
+            regions, full = _tesserocr_regions(img, rects, lang, psm, accept)
+        else:
+            regions = _pytesseract_regions(img, rects, lang, psm)
+            full = None if accept is None or accept(regions) else tesseract_read(img, lang, psm)
+    return RegionRead(regions, full, applied)
+
+
+def _tesseract_one(path: ImageSource, lang: str, psm: int, preprocess: Optional[Iterable[str]]) -> _Page:
+    started = time.perf_counter()
+    with _open_image(path, preprocess) as (img, applied):
+        # image_to_data gives text and word confidences from a single tesseract run.
+        text, conf = tesseract_read(img, lang, psm)
+    return _Page(text, time.perf_counter() - started, applied, conf)
+
+
+def ocr_images_tesseract(
+    image_paths: Iterable[ImageSource],
+    lang: str = "ara+eng",
+    psm: int = 6,
+    workers: Optional[int] = None,
+    preprocess: Optional[Iterable[str]] = None,
+) -> OcrResult:
+    """OCR images using Tesseract (tesserocr in-process, or pytesseract).
 
     Notes:
-    - Requires `pytesseract` and OS-level tesseract installed.
+    - Requires `tesserocr` or `pytesseract` (plus OS-level tesseract) installed.
     - For multiple images, we concatenate outputs separated by markers.
+    - With `workers` > 1 (default: OCR_TESSERACT_WORKERS) images are OCR'd concurrently.
+      Threads are enough here: each one waits on its own tesseract subprocess (or a
+      tesserocr call that releases the GIL). Output order always follows the input order.
+    - Images go through `services.preprocessing` first (`preprocess`: step names, None = configured).
+    """
+    tesseract_backend()  # fail early when no binding is installed
+
+    paths = list(image_paths)
+    workers = app_setting("OCR_TESSERACT_WORKERS") if workers is None else workers
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ub-tesseract") as pool:
+            pages = list(pool.map(lambda p: _tesseract_one(p, lang, psm, preprocess), paths))
+    else:
+        pages = [_tesseract_one(p, lang, psm, preprocess) for p in paths]
+
+    return _result("tesseract", pages)
+
+
+class _PaddlePool:
+    """Per-process pool of initialised PaddleOCR engines, keyed by language.
+
+    Loading the detection/recognition/angle models takes seconds and hundreds of MB, so
+    engines are created once and reused. At most `OCR_PADDLE_POOL_SIZE` engines exist per
+    language; extra concurrent requests wait for a free engine instead of loading another.
+    A PaddleOCR instance is only ever used by one thread at a time.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._idle: dict[str, list[Any]] = {}
+        self._created: dict[str, int] = {}
+
+    def _new_engine(self, lang: str) -> Any:
+        try:
+            from paddleocr import PaddleOCR  # type: ignore
+        except ImportError as e:
+            raise OcrEngineError("PaddleOCR requested but dependency is missing. Install optional extra: ocr_paddle") from e
+        # PaddleOCR language codes: 'ar' for Arabic, 'en' for English.
+        return PaddleOCR(use_angle_cls=True, lang=lang)
+
+    def _reserve(self, lang: str, timeout: Optional[float]) -> Optional[Any]:
+        """Take an idle engine, or reserve a slot to create one (returns None)."""
+        with self._cond:
+            ready = self._cond.wait_for(
+                lambda: self._idle.get(lang) or self._created.get(lang, 0) < app_setting("OCR_PADDLE_POOL_SIZE"),
+                timeout=timeout,
+            )
+            if not ready:
+                raise OcrEngineError(f"Timed out waiting for a free PaddleOCR engine ({lang}).")
+            if self._idle.get(lang):
+                return self._idle[lang].pop()
+            self._created[lang] = self._created.get(lang, 0) + 1
+            return None
+
+    def _create(self, lang: str) -> Any:
+        # Model loading happens outside the lock so other languages are not blocked.
+        try:
+            return self._new_engine(lang)
+        except BaseException:
+            with self._cond:
+                self._created[lang] -= 1
+                self._cond.notify_all()
+            raise
+
+    def _release(self, lang: str, engine: Any) -> None:
+        with self._cond:
+            self._idle.setdefault(lang, []).append(engine)
+            self._cond.notify_all()
+
+    @contextmanager
+    def engine(self, lang: str) -> Iterator[Any]:
+        engine = self._reserve(lang, app_setting("OCR_PADDLE_ACQUIRE_TIMEOUT"))
+        if engine is None:
+            engine = self._create(lang)
+        try:
+            yield engine
+        finally:
+            self._release(lang, engine)
+
+    def prewarm(self, lang: str) -> None:
+        """Load one engine for `lang` if none exists yet."""
+        with self._cond:
+            if self._created.get(lang, 0):
+                return
+            self._created[lang] = 1
+        self._release(lang, self._create(lang))
+
+
+_paddle_pool = _PaddlePool()
+
+
+def prewarm_paddle(langs: Iterable[str]) -> None:
+    """Load PaddleOCR engines ahead of the first request (errors are logged, not raised)."""
+    for lang in langs:
+        try:
+            _paddle_pool.prewarm(lang)
+        except Exception:
+            logger.warning("Could not pre-warm PaddleOCR engine for lang=%r", lang, exc_info=True)
+
+
+def start_paddle_prewarm() -> Optional[threading.Thread]:
+    """Pre-warm OCR_PADDLE_PREWARM_LANGS in a background thread; returns it (None if none are set).
+
+    Called by `run_ocr_worker`; web servers opt in by calling it from their wsgi.py/asgi.py after
+    the application is loaded. Model loading takes seconds, so startup isn't blocked on it.
     """
-    try:
-        import pytesseract  # type: ignore
-        from PIL import Image  # type: ignore
-    except ImportError as e:
-        raise OcrEngineError("Tesseract OCR requested but dependencies are missing. Install optional extra: ocr_tesseract") from e
+    langs = list(app_setting("OCR_PADDLE_PREWARM_LANGS") or [])
+    if not langs:
+        return None
+    thread = threading.Thread(target=prewarm_paddle, args=(langs,), name="ub-paddle-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+
+def _paddle_input(img: Any) -> Any:
+    """PaddleOCR takes file paths or BGR ndarrays; preprocessing yields PIL images."""
+    import numpy as np  # type: ignore  (installed with paddleocr)
 
-    parts = []
-    for idx, p in enumerate(image_paths, start=1):
-        img = Image.open(p)
-        text = pytesseract.image_to_string(img, lang=lang, config=f"--psm {psm}")
-        parts.append(f"\n\n--- IMAGE {idx} ---\n{text}")
-    return OcrResult(text="".join(parts).strip(), engine="tesseract")
+    return np.asarray(img.convert("RGB"))[:, :, ::-1]
 
 
-def ocr_images_paddle(image_paths: Iterable[str], lang: str = "ar") -> OcrResult:
+def ocr_images_paddle(image_paths: Iterable[ImageSource], lang: str = "ar", preprocess: Optional[Iterable[str]] = None) -> OcrResult:
     """OCR images using PaddleOCR.
 
     Notes:
     - Heavier dependency; best for structured tables (preserves boxes).
+    - Engines come from a per-process pool (see `_PaddlePool`) instead of being loaded per call.
+    - Images go through `services.preprocessing` first (`preprocess`: step names, None = configured).
     - Here we return a flattened text output; callers can switch to box-based parsing later.
     """
-    try:
-        from paddleocr import PaddleOCR  # type: ignore
-    except ImportError as e:
-        raise OcrEngineError("PaddleOCR requested but dependency is missing. Install optional extra: ocr_paddle") from e
-
-    # PaddleOCR language codes: 'ar' for Arabic, 'en' for English.
-    ocr = PaddleOCR(use_angle_cls=True, lang=lang)
-    lines = []
-    for idx, p in enumerate(image_paths, start=1):
-        result = ocr.ocr(p, cls=True)
-        lines.append(f"\n\n--- IMAGE {idx} ---")
-        for page in result:
-            for item in page:
-                txt = item[1][0]
-                conf = float(item[1][1])
-                lines.append(txt)
-    return OcrResult(text="\n".join(lines).strip(), engine="paddleocr")
+    pages: list[_Page] = []
+    with _paddle_pool.engine(lang) as ocr:
+        for p in image_paths:
+            started = time.perf_counter()
+            with _open_image(p, preprocess) as (img, applied):
+                result = ocr.ocr(_paddle_input(img), cls=True)
+            lines = []
+            confs = []
+            for page in result or []:
+                for item in page or []:
+                    txt = item[1][0]
+                    conf = float(item[1][1])
+                    lines.append(txt)
+                    confs.append(conf)
+            pages.append(_Page("\n".join(lines), time.perf_counter() - started, applied, mean_confidence(confs)))
+    return _result("paddleocr", pages)
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import dataclasses
+import logging
+import os
+import uuid
+from contextlib import ExitStack
+from datetime import timedelta
+from typing import Any, Iterable, Optional
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import UploadedFile
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from ..conf import app_setting
+from ..models import OcrJob, OcrJobStatus
+from .blob_store import store_image_blobs
+from .ocr_pipeline import process_upload
+
+
+logger = logging.getLogger(__name__)
+
+_UPLOAD_DIR = "utility_bills/ocr_jobs"
+
+
+def enqueue_ocr_job(
+    user: Any, utility_type: str, engine: str, files: Iterable[UploadedFile], layout_hint: str = ""
+) -> OcrJob:
+    """Persist uploaded images to default storage and create a pending job for the worker."""
+    batch = uuid.uuid4().hex
+    names: list[str] = []
+    for idx, f in enumerate(files, start=1):
+        # Never trust the client-supplied file name for the storage path; keep only its extension.
+        ext = os.path.splitext(f.name or "")[1].lower()[:10]
+        names.append(default_storage.save(f"{_UPLOAD_DIR}/{batch}/{idx}{ext}", f))
+    return OcrJob.objects.create(
+        user=user, utility_type=utility_type, engine=engine, layout_hint=layout_hint, image_names=names
+    )
+
+
+def claim_next_job(worker: str) -> Optional[OcrJob]:
+    """Atomically claim the oldest runnable job, or return None when the queue is empty.
+
+    Runnable means pending, or running with a `started_at` older than OCR_JOB_STALE_SECONDS
+    (its worker died mid-job). Rows locked by other workers are skipped rather than waited on,
+    so several workers can poll the same table.
+    """
+    stale_before = timezone.now() - timedelta(seconds=app_setting("OCR_JOB_STALE_SECONDS"))
+    runnable = Q(status=OcrJobStatus.PENDING) | Q(status=OcrJobStatus.RUNNING, started_at__lt=stale_before)
+
+    with transaction.atomic():
+        job = (
+            OcrJob.objects.select_for_update(skip_locked=True)
+            .filter(runnable)
+            .order_by("created_at", "pk")
+            .first()
+        )
+        if job is None:
+            return None
+
+        # Guarded update: on backends without row locks (SQLite) only one worker wins this race.
+        claimed = OcrJob.objects.filter(pk=job.pk, status=job.status, attempts=job.attempts).update(
+            status=OcrJobStatus.RUNNING,
+            attempts=job.attempts + 1,
+            worker=worker,
+            started_at=timezone.now(),
+        )
+        if not claimed:
+            return None
+
+    job.refresh_from_db()
+    return job
+
+
+def run_job(job: OcrJob) -> OcrJob:
+    """Run OCR + layout classification + parsing for a claimed job and store the outcome."""
+    if job.attempts > app_setting("OCR_JOB_MAX_ATTEMPTS"):
+        return _finish(job, OcrJobStatus.FAILED, error="Too many attempts; the worker kept stopping during this job.")
+
+    try:
+        # File objects rather than local paths, so remote storages (S3, GCS, ...) work too.
+        with ExitStack() as stack:
+            images = [stack.enter_context(default_storage.open(name, "rb")) for name in job.image_names]
+            job.image_digests = store_image_blobs(images)
+            outcome = process_upload(images, job.engine, job.utility_type, job.layout_hint)
+    except Exception as e:
+        logger.exception("OCR job %s failed", job.pk)
+        return _finish(job, OcrJobStatus.FAILED, error=f"{type(e).__name__}: {e}")
+
+    job.ocr_engine = outcome.ocr.engine
+    job.ocr_confidence = outcome.ocr.confidence
+    job.ocr_text = outcome.ocr.text
+    job.layout = outcome.layout
+    job.parsed = dataclasses.asdict(outcome.parsed) if outcome.parsed is not None else None
+    job.field_sources = outcome.field_sources
+    return _finish(job, OcrJobStatus.DONE)
+
+
+def _finish(job: OcrJob, status: str, error: str = "") -> OcrJob:
+    job.status = status
+    job.error = error
+    job.finished_at = timezone.now()
+    job.save()
+    _delete_images(job)
+    return job
+
+
+def _delete_images(job: OcrJob) -> None:
+    # image_names is cleared only once the files are gone, so `expire_ocr_jobs` can retry
+    # the deletion for jobs whose worker stopped in between.
+    for name in job.image_names:
+        default_storage.delete(name)
+    job.image_names = []
+    OcrJob.objects.filter(pk=job.pk).update(image_names=[])
+
+
+def expire_ocr_jobs(max_age: Optional[int] = None, dry_run: bool = False) -> dict[str, int]:
+    """Fail jobs no worker finished within `max_age` seconds and delete leftover job images.
+
+    A job can outlive its images' usefulness when no worker is running to claim it, or when
+    its worker stopped after recording the result but before deleting the images. `max_age`
+    defaults to OCR_JOB_EXPIRE_SECONDS. Returns counts of expired jobs and deleted images.
+    """
+    max_age = app_setting("OCR_JOB_EXPIRE_SECONDS") if max_age is None else max_age
+    cutoff = timezone.now() - timedelta(seconds=max_age)
+    unfinished = OcrJob.objects.filter(
+        status__in=(OcrJobStatus.PENDING, OcrJobStatus.RUNNING), created_at__lt=cutoff
+    )
+    leftover = OcrJob.objects.filter(
+        status__in=(OcrJobStatus.DONE, OcrJobStatus.FAILED), finished_at__lt=cutoff
+    ).exclude(image_names=[])
+
+    stats = {"expired_jobs": 0, "deleted_images": 0}
+    for job in unfinished.order_by("pk").iterator():
+        stats["expired_jobs"] += 1
+        stats["deleted_images"] += len(job.image_names)
+        if not dry_run:
+            _finish(job, OcrJobStatus.FAILED, error=f"Expired: not processed within {max_age}s.")
+    for job in leftover.order_by("pk").iterator():
+        stats["deleted_images"] += len(job.image_names)
+        if not dry_run:
+            _delete_images(job)
+    return stats
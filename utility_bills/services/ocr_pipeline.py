@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, Optional, Union
+
+from ..conf import app_setting
+from ..models import UtilityType
+from ..parsers.electricity_parser import ElectricityParsed
+from .classifiers import Layout, LayoutType, match_layout
+from .ocr_cache import ocr_with_cache
+from .ocr_engine import (
+    ImageSource,
+    OcrEngineError,
+    OcrResult,
+    join_pages,
+    mean_confidence,
+    ocr_images_paddle,
+    ocr_images_tesseract,
+)
+from .layout_templates import get_layout_template, template_fingerprint
+from .page_parsing import PageFields, PagesParse, merge_page_fields, page_fields, parse_pages
+from .preprocessing import preprocessing_signature
+from .roi_ocr import ocr_images_roi
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OcrOutcome:
+    """Everything the confirm page needs from one upload: OCR text, layout and parsed fields."""
+
+    ocr: OcrResult
+    layout: LayoutType
+    parsed: Optional[ElectricityParsed]
+    # Parsed field -> image (1-based) its value was read from.
+    field_sources: dict[str, int] = field(default_factory=dict)
+    # (layout, score) of the other layouts the text matched, best first.
+    layout_runner_ups: list[tuple[str, float]] = field(default_factory=list)
+
+
+@dataclass
+class PageProgress:
+    """One image of a streamed upload: its OCR result and the parse of all pages so far."""
+
+    index: int
+    total: int
+    ocr: OcrResult
+    parsed: Optional[ElectricityParsed]
+    field_sources: dict[str, int] = field(default_factory=dict)
+
+
+def run_ocr(image_paths: Iterable[ImageSource], engine: str, utility_type: str, layout_hint: str = "") -> OcrResult:
+    """Dispatch to the selected OCR engine with the language settings used for bills.
+
+    Results go through the content-addressed OCR cache, so re-uploaded images skip OCR;
+    the preprocessing configuration is part of the cache key. With Tesseract and a
+    `layout_hint` that has a template, only the template's field regions are recognised.
+    `engine="auto"` runs the Tesseract/PaddleOCR cascade (see `run_ocr_auto`).
+    """
+    if engine == "auto":
+        return run_ocr_auto(image_paths, utility_type, layout_hint)
+    pre = preprocessing_signature()
+    template = get_layout_template(layout_hint) if layout_hint else None
+    if engine == "tesseract" and template is not None:
+        return ocr_with_cache(
+            image_paths,
+            "tesseract-roi",
+            # The boxes and the fallback threshold decide the text, so both are part of the key.
+            f"lang=ara+eng;psm=6;layout={template.layout};tpl={template_fingerprint(template)};"
+            f"min_conf={app_setting('OCR_ROI_MIN_CONFIDENCE')};pre={pre}",
+            lambda paths: ocr_images_roi(paths, template, lang="ara+eng", psm=6),
+        )
+    if engine == "paddleocr":
+        lang = "ar" if utility_type == UtilityType.ELECTRICITY else "en"
+        return ocr_with_cache(
+            image_paths, "paddleocr", f"lang={lang};pre={pre}", lambda paths: ocr_images_paddle(paths, lang=lang)
+        )
+    return ocr_with_cache(
+        image_paths, "tesseract", f"lang=ara+eng;psm=6;pre={pre}", lambda paths: ocr_images_tesseract(paths, lang="ara+eng", psm=6)
+    )
+
+
+def missing_fields(pages: list[str], utility_type: str) -> list[str]:
+    """Fields from UTILITY_BILLS_OCR_AUTO_REQUIRED_FIELDS that the parser can't find in the pages."""
+    required = (app_setting("OCR_AUTO_REQUIRED_FIELDS") or {}).get(utility_type, ())
+    parsed = parse_pages(pages, utility_type).parsed if required else None
+    if parsed is None:
+        return []
+    return [f for f in required if getattr(parsed, f, None) is None]
+
+
+def run_ocr_auto(image_paths: Iterable[ImageSource], utility_type: str, layout_hint: str = "") -> OcrResult:
+    """Tesseract first; re-OCR with PaddleOCR only the images that need it.
+
+    Images whose Tesseract confidence is below OCR_AUTO_MIN_CONFIDENCE (or unknown) are
+    escalated first. If the required fields are still missing from the combined text, the
+    remaining images are escalated too. `OcrResult.escalated` lists the re-OCR'd images and
+    the engine reads e.g. "auto:tesseract+paddleocr". When PaddleOCR is unavailable the
+    Tesseract result is returned as is.
+    """
+    paths = list(image_paths)
+    return _auto_fields_stage(_auto_confidence_stage(paths, utility_type, layout_hint), paths, utility_type)
+
+
+def _auto_confidence_stage(paths: list[ImageSource], utility_type: str, layout_hint: str) -> OcrResult:
+    result = run_ocr(paths, "tesseract", utility_type, layout_hint)
+    min_conf = app_setting("OCR_AUTO_MIN_CONFIDENCE")
+    low = [i for i, c in enumerate(result.page_confidences) if c is None or c < min_conf]
+    return _try_escalate(result, paths, low, utility_type)
+
+
+def _auto_fields_stage(result: OcrResult, paths: list[ImageSource], utility_type: str) -> OcrResult:
+    """Escalate the remaining images if required fields are missing, and label the engine."""
+    base_engine = result.engine
+    if missing_fields(result.pages, utility_type):
+        rest = [i for i in range(len(paths)) if i not in result.escalated]
+        result = _try_escalate(result, paths, rest, utility_type)
+    result.engine = f"auto:{base_engine}+paddleocr" if result.escalated else f"auto:{base_engine}"
+    return result
+
+
+def _try_escalate(result: OcrResult, paths: list[ImageSource], indices: list[int], utility_type: str) -> OcrResult:
+    if not indices:
+        return result
+    try:
+        return _escalate(result, paths, indices, utility_type)
+    except OcrEngineError:
+        logger.warning("PaddleOCR unavailable; keeping Tesseract output for %d image(s)", len(indices), exc_info=True)
+        return result
+
+
+def _escalate(result: OcrResult, paths: list[ImageSource], indices: list[int], utility_type: str) -> OcrResult:
+    """Replace the pages at `indices` with their PaddleOCR output."""
+    paddle = run_ocr([paths[i] for i in indices], "paddleocr", utility_type)
+    pages = list(result.pages)
+    seconds = list(result.image_seconds)
+    steps = list(result.preprocessing)
+    modes = list(result.ocr_modes)
+    confidences = list(result.page_confidences)
+    for j, i in enumerate(indices):
+        pages[i] = paddle.pages[j]
+        # Time spent on the image by both engines.
+        seconds[i] = round(seconds[i] + paddle.image_seconds[j], 3)
+        steps[i] = paddle.preprocessing[j]
+        modes[i] = paddle.ocr_modes[j]
+        confidences[i] = paddle.page_confidences[j]
+    return OcrResult(
+        text=join_pages(pages),
+        engine=result.engine,
+        confidence=mean_confidence(confidences),
+        pages=pages,
+        image_seconds=seconds,
+        cache_hits=sum(1 for m in modes if m == "cache"),
+        preprocessing=steps,
+        ocr_modes=modes,
+        page_confidences=confidences,
+        escalated=sorted(set(result.escalated) | set(indices)),
+    )
+
+
+def merge_results(results: list[OcrResult]) -> OcrResult:
+    """Combine results of consecutive image batches into one, as if OCR'd in a single call."""
+    pages: list[str] = []
+    escalated: list[int] = []
+    for r in results:
+        escalated.extend(len(pages) + i for i in r.escalated)
+        pages.extend(r.pages)
+    engines = [r.engine for r in results]
+    confidences = [c for r in results for c in r.page_confidences]
+    return OcrResult(
+        text=join_pages(pages),
+        # Mirrors `ocr_images_roi`: the upload counts as region OCR if any image used it.
+        engine="tesseract-roi" if "tesseract-roi" in engines else (engines[0] if engines else ""),
+        confidence=mean_confidence(confidences),
+        pages=pages,
+        image_seconds=[s for r in results for s in r.image_seconds],
+        cache_hits=sum(r.cache_hits for r in results),
+        preprocessing=[p for r in results for p in r.preprocessing],
+        ocr_modes=[m for r in results for m in r.ocr_modes],
+        page_confidences=confidences,
+        escalated=escalated,
+    )
+
+
+def _parse(pages: list[str], utility_type: str, layout: Optional[Layout] = None) -> PagesParse:
+    # Only electricity bills have a confirm form to pre-fill for now.
+    if utility_type != UtilityType.ELECTRICITY:
+        return PagesParse(parsed=None)
+    # The detected layout's parser, unless the text looks like another utility's bill.
+    parser = layout.parser if layout is not None and layout.utility_type == utility_type else utility_type
+    return parse_pages(pages, parser)
+
+
+def iter_upload(
+    image_paths: Iterable[ImageSource], engine: str, utility_type: str, layout_hint: str = ""
+) -> Iterator[Union[PageProgress, OcrOutcome]]:
+    """`process_upload` one image at a time.
+
+    Yields a `PageProgress` as soon as each image is OCR'd (with the parse of the text so
+    far), then the final `OcrOutcome` for the whole upload. Images are only OCR'd when the
+    consumer asks for the next item, so closing the generator early skips the rest.
+    Each page is parsed once, when it arrives; progress merges the pages parsed so far.
+    """
+    paths = list(image_paths)
+    done: list[OcrResult] = []
+    parsed_pages: list[PageFields] = []
+    for idx, path in enumerate(paths):
+        if engine == "auto":
+            # Field checks need the whole upload; they run once all pages are in.
+            res = _auto_confidence_stage([path], utility_type, layout_hint)
+        else:
+            res = run_ocr([path], engine, utility_type, layout_hint)
+        done.append(res)
+        progress = PagesParse(parsed=None)
+        if utility_type == UtilityType.ELECTRICITY:
+            parsed_pages.extend(page_fields(res.pages, utility_type))
+            progress = merge_page_fields(parsed_pages, utility_type)
+        yield PageProgress(
+            index=idx, total=len(paths), ocr=res, parsed=progress.parsed, field_sources=progress.sources
+        )
+
+    ocr_res = merge_results(done)
+    if engine == "auto":
+        ocr_res = _auto_fields_stage(ocr_res, paths, utility_type)
+    yield _outcome(ocr_res, utility_type)
+
+
+def _outcome(ocr_res: OcrResult, utility_type: str) -> OcrOutcome:
+    match = match_layout(ocr_res.text)
+    result = _parse(ocr_res.pages, utility_type, match.layout)
+    return OcrOutcome(
+        ocr=ocr_res,
+        layout=match.name,
+        parsed=result.parsed,
+        field_sources=result.sources,
+        layout_runner_ups=match.runner_ups,
+    )
+
+
+def process_upload(image_paths: Iterable[ImageSource], engine: str, utility_type: str, layout_hint: str = "") -> OcrOutcome:
+    """OCR the images, classify the layout and parse the bill fields (electricity only for now).
+
+    The layout registry (see `services/classifiers.py::match_layout`) picks the layout and,
+    through it, the parser. Each image's text is parsed on its own and the fields merged, with
+    the image each value came from in `OcrOutcome.field_sources`.
+    """
+    return _outcome(run_ocr(image_paths, engine, utility_type, layout_hint), utility_type)
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import dataclasses
+import secrets
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from django.core.cache import BaseCache, caches
+
+from ..conf import app_setting
+
+
+_KEY_PREFIX = "utility_bills:ocr_session"
+
+
+@dataclass
+class OcrSession:
+    """An OCR result awaiting confirmation, kept server-side between the result page and `ocr_save`."""
+
+    user_id: Any
+    utility_type: str
+    engine: str
+    ocr_text: str
+    layout: str = ""
+    confidence: Optional[float] = None
+    # Parsed fields as a dict (`dataclasses.asdict` of the parser output), or None.
+    parsed: Optional[dict[str, Any]] = None
+    image_digests: list[str] = field(default_factory=list)
+
+
+def _cache() -> BaseCache:
+    return caches[app_setting("OCR_SESSION_CACHE_ALIAS")]
+
+
+def _key(token: str) -> str:
+    return f"{_KEY_PREFIX}:{token}"
+
+
+def create_ocr_session(session: OcrSession) -> str:
+    """Store `session` for UTILITY_BILLS_OCR_SESSION_TIMEOUT seconds and return its token."""
+    token = secrets.token_urlsafe(24)
+    _cache().set(_key(token), dataclasses.asdict(session), timeout=app_setting("OCR_SESSION_TIMEOUT"))
+    return token
+
+
+def get_ocr_session(token: str, user_id: Any) -> Optional[OcrSession]:
+    """The session for `token` if it exists, hasn't expired and belongs to `user_id`."""
+    if not token:
+        return None
+    data = _cache().get(_key(token))
+    if data is None or data.get("user_id") != user_id:
+        return None
+    return OcrSession(**data)
+
+
+def discard_ocr_session(token: str) -> None:
+    """Drop a session once its bill is saved, so the confirm form can't be submitted twice."""
+    _cache().delete(_key(token))
@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import dataclasses
+import io
+import logging
+import math
+import multiprocessing
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Iterable, Iterator, NamedTuple, Optional, Sequence, Union
+
+from ..conf import app_setting
+from ..models import UtilityType
+from ..parsers import electricity_parser, water_parser
+from ..parsers.batch import parse_until
+from ..parsers.electricity_parser import ElectricityParsed, electricity_fields
+from ..parsers.water_parser import WaterParsed, water_fields
+from .normalizers import normalize_digits
+from .ocr_engine import split_pages
+
+
+logger = logging.getLogger(__name__)
+
+PageFields = dict[str, tuple[int, Any]]
+
+# utility type: (per-page field extractor, parsed dataclass, bill header anchors)
+_PARSERS: dict[str, tuple[Callable[[str], PageFields], type, dict[str, tuple[re.Pattern[str], ...]]]] = {
+    UtilityType.ELECTRICITY: (electricity_fields, ElectricityParsed, electricity_parser.BILL_ANCHORS),
+    UtilityType.WATER: (water_fields, WaterParsed, water_parser.BILL_ANCHORS),
+}
+
+
+def register_parser(
+    name: str,
+    fields_fn: Callable[[str], PageFields],
+    parsed_cls: type,
+    anchors: Optional[dict[str, tuple[re.Pattern[str], ...]]] = None,
+) -> None:
+    """Make a parser available under `name` for `parse_pages` and layouts (`Layout.parser`).
+
+    `fields_fn` returns `{field: (rank, value)}` like `electricity_fields`, with the fields of
+    the `parsed_cls` dataclass. It must be a module-level function so parse workers can
+    import it. `anchors` are the header patterns `iter_bills` splits bills on.
+    """
+    _PARSERS[name] = (fields_fn, parsed_cls, anchors or {})
+
+
+@dataclass
+class PagesParse:
+    """Fields parsed from an upload's pages, and the image (1-based) each value came from."""
+
+    parsed: Optional[Any]
+    sources: dict[str, int] = field(default_factory=dict)
+
+
+class _ParsePool:
+    """Worker processes for parsing large uploads, started on first use and kept for the process' lifetime.
+
+    Parsing is pure-Python regex work that holds the GIL, so it only runs in parallel in
+    separate processes. They are spawned (not forked) so they don't inherit the web process'
+    threads and connections; the parsers don't need Django set up.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def map(
+        self, fn: Callable[[str], PageFields], pages: Sequence[str], workers: int, deadline: Optional[float]
+    ) -> list[Optional[PageFields]]:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            executor = self._executor
+        # One chunk per worker: per-page parsing is far cheaper than a round trip to a worker.
+        size = math.ceil(len(pages) / workers)
+        chunks = [pages[i : i + size] for i in range(0, len(pages), size)]
+        try:
+            return [
+                found
+                for chunk in executor.map(parse_until, [fn] * len(chunks), chunks, [deadline] * len(chunks))
+                for found in chunk
+            ]
+        except BrokenProcessPool:
+            logger.warning("Parse worker pool broke; parsing %d page(s) in process", len(pages), exc_info=True)
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            return parse_until(fn, pages, deadline)
+
+
+_POOL = _ParsePool()
+
+
+def _capped(text: str) -> str:
+    """`text` cut to OCR_PARSE_MAX_CHARS characters."""
+    limit = app_setting("OCR_PARSE_MAX_CHARS")
+    if limit is not None and len(text) > limit:
+        logger.warning("OCR text of %d characters cut to %d for parsing", len(text), limit)
+        return text[:limit]
+    return text
+
+
+def page_fields(pages: Sequence[str], utility_type: str) -> list[PageFields]:
+    """Each page's fields (see `electricity_fields`); in worker processes for large uploads.
+
+    Each page is parsed up to its first OCR_PARSE_MAX_CHARS characters, and pages not started
+    within OCR_PARSE_TIME_BUDGET seconds are left empty, so a garbage upload can't hold a CPU
+    for long.
+    """
+    fn = _PARSERS[utility_type][0]
+    pages = [_capped(page) for page in pages]
+    budget = app_setting("OCR_PARSE_TIME_BUDGET")
+    deadline = time.time() + budget if budget is not None else None
+    workers = app_setting("OCR_PARSE_WORKERS") or 1
+    if workers > 1 and len(pages) >= app_setting("OCR_PARSE_PARALLEL_MIN_PAGES"):
+        results = _POOL.map(fn, pages, workers, deadline)
+    else:
+        results = parse_until(fn, pages, deadline)
+    skipped = sum(1 for found in results if found is None)
+    if skipped:
+        logger.warning("%d of %d page(s) left unparsed: over the %ss parse time budget", skipped, len(pages), budget)
+    return [found if found is not None else {} for found in results]
+
+
+def merge_page_fields(
+    per_page: Sequence[PageFields], utility_type: str, images: Optional[Sequence[int]] = None
+) -> PagesParse:
+    """Merge per-page fields into one parse.
+
+    For every field the value with the best label rank wins, and among equal ranks the one
+    from the earliest image, which is what a parse of the joined text picks. Pages can't
+    shadow one another, though: a label on one page is never matched with a value on the next.
+    `images` numbers the pages for `sources` (default 1, 2, ...).
+    """
+    best: dict[str, tuple[int, int, Any]] = {}
+    for idx, found in enumerate(per_page):
+        for name, (rank, value) in found.items():
+            if value is not None and (name not in best or (rank, idx) < best[name][:2]):
+                best[name] = (rank, idx, value)
+    cls = _PARSERS[utility_type][1]
+    parsed = cls(**{f.name: best[f.name][2] if f.name in best else None for f in fields(cls)})
+    number = (lambda idx: images[idx]) if images is not None else (lambda idx: idx + 1)
+    return PagesParse(parsed=parsed, sources={name: number(idx) for name, (_, idx, _) in best.items()})
+
+
+def parse_pages(pages: Sequence[str], utility_type: str) -> PagesParse:
+    """Parse each image's text on its own and merge the results (see `merge_page_fields`).
+
+    `utility_type` picks the parser: a utility type or a name from `register_parser`.
+    """
+    if utility_type not in _PARSERS:
+        return PagesParse(parsed=None)
+    return merge_page_fields(page_fields(pages, utility_type), utility_type)
+
+
+def parse_ocr_text(text: str, utility_type: str) -> PagesParse:
+    """`parse_pages` for a joined OCR text, split on its `--- IMAGE n ---` markers.
+
+    The whole text is cut to OCR_PARSE_MAX_CHARS before splitting, so the split is bounded too.
+    """
+    return parse_pages(split_pages(_capped(text)), utility_type)
+
+
+@dataclass
+class BillBlock:
+    """One bill of a statement with several bills (see `iter_bills`)."""
+
+    index: int
+    # 1-based line numbers of the block in the input.
+    first_line: int
+    last_line: int
+    parsed: Any
+    # Parsed field -> image (`--- IMAGE n ---` section) its value was read from.
+    sources: dict[str, int] = field(default_factory=dict)
+
+
+_MARKER_RE = re.compile(r"^--- IMAGE (\d+) ---$")
+# A bill's header lines sit together: a repeated header at most this many lines before the
+# header that opens the next bill moves to that bill (e.g. the meter number printed above
+# each bill's period in a one-meter statement).
+_HEADER_SPAN = 5
+
+Anchors = dict[str, tuple[Any, ...]]
+
+
+class _Line(NamedTuple):
+    number: int
+    image: int
+    text: str
+    anchors: Anchors
+
+
+def _anchors(patterns: dict[str, tuple[re.Pattern[str], ...]], line: str, following: str) -> Anchors:
+    """Header kinds starting on `line` (the value may be on the `following` line), with their values."""
+    window = normalize_digits(line + following)
+    found = {}
+    for kind, variants in patterns.items():
+        for pattern in variants:
+            m = pattern.search(window)
+            if m and m.start() < len(line):
+                found[kind] = m.groups()
+                break
+    return found
+
+
+# Header kind -> (index in the block of its first line, its value).
+_Firsts = dict[str, tuple[int, tuple[Any, ...]]]
+
+
+def _firsts(block: list[_Line]) -> _Firsts:
+    firsts: _Firsts = {}
+    for idx, line in enumerate(block):
+        for kind, value in line.anchors.items():
+            firsts.setdefault(kind, (idx, value))
+    return firsts
+
+
+def _opening_line(block: list[_Line], firsts: _Firsts, anchors: Anchors) -> Optional[int]:
+    """Index in `block` where the bill opened by a line with `anchors` starts, or None if it doesn't.
+
+    Only the block's last `_HEADER_SPAN` lines are looked at, so this takes constant time
+    however long the block is.
+    """
+    if all(firsts.get(kind, (0, value))[1] == value for kind, value in anchors.items()):
+        return None
+    start = len(block)
+    # Pull in this bill's earlier header lines: repeats of header values the block already had.
+    for idx in range(len(block) - 1, max(len(block) - _HEADER_SPAN, 0) - 1, -1):
+        line = block[idx]
+        if line.anchors and all(
+            kind in firsts and firsts[kind][0] < idx and firsts[kind][1] == value for kind, value in line.anchors.items()
+        ):
+            start = idx
+    return start
+
+
+def _parse_block(fn: Callable[[str], PageFields], utility_type: str, block: list[_Line]) -> PagesParse:
+    images: list[int] = []
+    texts: list[list[str]] = []
+    for line in block:
+        if not images or images[-1] != line.image:
+            images.append(line.image)
+            texts.append([])
+        texts[-1].append(line.text)
+    return merge_page_fields([fn(_capped("".join(t))) for t in texts], utility_type, images)
+
+
+def iter_bills(
+    text: Union[str, Iterable[str]], utility_type: str, max_block_lines: int = 2000
+) -> Iterator[BillBlock]:
+    """Yield one parsed bill per bill of a statement holding several bills.
+
+    `text` is an OCR text or an iterable of its lines (e.g. an open file), read lazily: only the
+    current bill's lines are kept, at most `max_block_lines`. A bill opens at a header line
+    (electricity: meter number or billing period; water: meter number) whose value differs
+    from the current bill's header of that kind. Headers repeated within a bill (footers,
+    Arabic + English labels) don't split it. Lines before the first header belong to the first
+    bill. Each bill is parsed like a multi-image upload, with its `--- IMAGE n ---` sections
+    parsed separately; blocks where no field is found are skipped.
+    """
+    fn, _, patterns = _PARSERS[utility_type]
+    lines = io.StringIO(text) if isinstance(text, str) else iter(text)
+    count = 0
+    block: list[_Line] = []
+    firsts: _Firsts = {}
+
+    def bill(lines_: list[_Line]) -> Optional[BillBlock]:
+        nonlocal count
+        result = _parse_block(fn, utility_type, lines_)
+        if all(v is None for v in dataclasses.asdict(result.parsed).values()):
+            return None
+        count += 1
+        return BillBlock(count, lines_[0].number, lines_[-1].number, result.parsed, result.sources)
+
+    image = 1
+    number = 0
+    current = next(lines, None)
+    while current is not None:
+        following = next(lines, None)
+        number += 1
+        marker = _MARKER_RE.match(current.strip())
+        if marker:
+            image = int(marker.group(1))
+        else:
+            anchors = _anchors(patterns, current, following or "")
+            start = _opening_line(block, firsts, anchors) if anchors and block else None
+            if start is None and len(block) >= max_block_lines:
+                logger.warning("Bill starting at line %d exceeds %d lines; cut there", block[0].number, max_block_lines)
+                start = len(block)
+            if start is not None:
+                done, block = block[:start], block[start:]
+                firsts = _firsts(block)
+                if done and (found := bill(done)) is not None:
+                    yield found
+            for kind, value in anchors.items():
+                firsts.setdefault(kind, (len(block), value))
+            block.append(_Line(number, image, current, anchors))
+        current = following
+    if block and (found := bill(block)) is not None:
+        yield found
@@ -0,0 +1,473 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+import math
+import platform
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from django.utils import timezone
+
+from ..parsers.electricity_parser import parse_electricity_text
+from ..models import UtilityType
+from ..parsers.water_parser import parse_water_text
+from .classifiers import classify_layout
+from .page_parsing import iter_bills, parse_ocr_text
+from .normalizers import ARABIC_DIGITS, WESTERN_DIGITS
+
+
+FORMATS = ("electricity_summary_ar", "electricity_summary_en", "electricity_detailed", "water", "other")
+
+_TO_ARABIC_DIGITS = str.maketrans(WESTERN_DIGITS, ARABIC_DIGITS)
+
+# Lines without any parser label, mixed into the documents as OCR noise.
+_NOISE_LINES = (
+    "شركة الكهرباء الأردنية",
+    "العنوان عمان - الشميساني",
+    "اسم المشترك محمد أحمد",
+    "Customer service 117",
+    "www.example.jo",
+    "Page 1 of 1",
+    "رمز الخدمة 4471",
+    "الرجاء الدفع قبل تاريخ الاستحقاق",
+    "|||  __  ..",
+    "Account 99120341",
+)
+
+# OCR-style confusions applied by `corruption`; None drops the character.
+_CONFUSIONS: dict[str, Optional[str]] = {
+    "0": "O",
+    "1": "l",
+    "5": "S",
+    "8": "B",
+    "ة": "ه",
+    "ي": "ى",
+    "ا": "أ",
+    " ": None,
+}
+
+
+@dataclass
+class SyntheticBill:
+    """One generated bill text with the values the parsers and the classifier should find."""
+
+    format: str
+    utility_type: str
+    text: str
+    layout: str
+    # Field -> expected value as a string (dates as YYYY-MM-DD), for the format's parser.
+    expected: dict[str, str] = field(default_factory=dict)
+
+
+def _money(rng: random.Random) -> tuple[int, int]:
+    return rng.randint(0, 300), rng.randint(0, 999)
+
+
+def _period(rng: random.Random) -> tuple[date, date]:
+    year, month = rng.randint(2022, 2026), rng.randint(1, 12)
+    return date(year, month, 1), date(year, month, 28)
+
+
+def _slash(d: date) -> str:
+    return d.strftime("%Y/%m/%d")
+
+
+def _electricity_summary_ar(rng: random.Random) -> tuple[list[str], dict[str, str]]:
+    meter = str(rng.randint(10**5, 10**9))
+    start, end = _period(rng)
+    prev = rng.randint(1000, 60000)
+    cur = prev + rng.randint(50, 2500)
+    total, consumption = _money(rng), _money(rng)
+    subsidy = f"-{rng.randint(0, 9)}.{rng.randint(0, 999):03d}"
+    fee = f"{rng.randint(0, 9)}.{rng.randint(0, 999):03d}"
+    lines = [
+        "فاتورة كهرباء",
+        f"رقم العداد {meter}",
+        f"من {_slash(start)} الى {_slash(end)}",
+        f"تاريخ القراءة {_slash(end)}",
+        f"القراءة السابقة {prev}",
+        f"القراءة الحالية {cur}",
+        f"الكمية المفوترة {cur - prev}",
+        f"قيمة الفاتورة {total[0]} {total[1]:03d}",
+        f"قيمة الاستهلاك {consumption[0]} {consumption[1]:03d}",
+        f"قيمة الخصم الثابت {subsidy}",
+        f"بدل خدمات الشبكة {fee}",
+    ]
+    expected = {
+        "meter_number": meter,
+        "period_start": start.isoformat(),
+        "period_end": end.isoformat(),
+        "reading_date": end.isoformat(),
+        "import_previous": str(prev),
+        "import_current": str(cur),
+        "billed_kwh": str(cur - prev),
+        "total_bill_value": f"{total[0]}.{total[1]:03d}",
+        "consumption_value": f"{consumption[0]}.{consumption[1]:03d}",
+        "fixed_subsidy_amount": subsidy,
+        "network_services_fees": fee,
+    }
+    return lines, expected
+
+
+def _electricity_summary_en(rng: random.Random) -> tuple[list[str], dict[str, str]]:
+    meter = str(rng.randint(10**5, 10**9))
+    start, end = _period(rng)
+    billed = rng.randint(-400, 2500)
+    total = f"{rng.randint(0, 300)}.{rng.randint(0, 999):03d}"
+    subsidy = f"-{rng.randint(0, 9)}.{rng.randint(0, 999):03d}"
+    fee = f"{rng.randint(0, 9)}.{rng.randint(0, 999):03d}"
+    lines = [
+        f"Bill No {rng.randint(10**6, 10**7)}",
+        f"Meter No {meter}",
+        f"Billing period from {_slash(start)} to {_slash(end)}",
+        f"Reading date {_slash(end)}",
+        f"Previous reading {rng.randint(1000, 60000)}",
+        f"Net consumption quantity {billed}",
+        f"Fixed subsidy amount {subsidy}",
+        f"Network services fees {fee}",
+        f"Total bill value {total}",
+    ]
+    expected = {
+        "meter_number": meter,
+        "period_start": start.isoformat(),
+        "period_end": end.isoformat(),
+        "reading_date": end.isoformat(),
+        "billed_kwh": str(billed),
+        "total_bill_value": total,
+        "fixed_subsidy_amount": subsidy,
+        "network_services_fees": fee,
+    }
+    return lines, expected
+
+
+def _electricity_detailed(rng: random.Random) -> tuple[list[str], dict[str, str]]:
+    meter = str(rng.randint(10**5, 10**9))
+    start, end = _period(rng)
+    imp_prev = rng.randint(1000, 60000)
+    imp_cur = imp_prev + rng.randint(50, 2500)
+    exp_prev = rng.randint(0, 40000)
+    exp_cur = exp_prev + rng.randint(0, 2000)
+    billed = (imp_cur - imp_prev) - (exp_cur - exp_prev)
+    total = _money(rng)
+    lines = [
+        "قراءة عداد الطاقة",
+        f"رقم العداد {meter}",
+        f"من {_slash(start)} الى {_slash(end)}",
+        "البيان الحالية السابقة الفرق",
+        f"المستجرة من الشبكة {imp_cur} {imp_prev} {imp_cur - imp_prev}",
+        f"المصدرة إلى الشبكة {exp_cur} {exp_prev} {exp_cur - exp_prev}",
+        f"الكمية المفوترة {billed}",
+        f"قيمة الفاتورة {total[0]} {total[1]:03d}",
+    ]
+    expected = {
+        "meter_number": meter,
+        "period_start": start.isoformat(),
+        "period_end": end.isoformat(),
+        "import_previous": str(imp_prev),
+        "import_current": str(imp_cur),
+        "export_previous": str(exp_prev),
+        "export_current": str(exp_cur),
+        "billed_kwh": str(billed),
+        "total_bill_value": f"{total[0]}.{total[1]:03d}",
+    }
+    return lines, expected
+
+
+def _water(rng: random.Random) -> tuple[list[str], dict[str, str]]:
+    meter = str(rng.randint(10**5, 10**8))
+    prev = rng.randint(100, 9000)
+    cur = prev + rng.randint(1, 90)
+    lines = [
+        "فاتورة مياه",
+        f"رقم العداد {meter}",
+        f"القراءة السابقة {prev}",
+        f"القراءة الحالية {cur}",
+        f"الكمية المفوترة {cur - prev}",
+        f"المبلغ المستحق {rng.randint(1, 60)}.{rng.randint(0, 999):03d}",
+    ]
+    expected = {
+        "meter_number": meter,
+        "previous_reading": str(prev),
+        "current_reading": str(cur),
+        "billed_m3": str(cur - prev),
+    }
+    return lines, expected
+
+
+def _other(rng: random.Random) -> tuple[list[str], dict[str, str]]:
+    return [rng.choice(_NOISE_LINES) for _ in range(rng.randint(3, 12))], {}
+
+
+_BUILDERS: dict[str, tuple[Callable[[random.Random], tuple[list[str], dict[str, str]]], str, str]] = {
+    # format: (builder, utility type, layout the text should be classified as)
+    "electricity_summary_ar": (_electricity_summary_ar, "electricity", "electricity_summary"),
+    "electricity_summary_en": (_electricity_summary_en, "electricity", "electricity_summary"),
+    "electricity_detailed": (_electricity_detailed, "electricity", "electricity_detailed"),
+    "water": (_water, "water", "water_unknown"),
+    "other": (_other, "", "unknown"),
+}
+
+
+def _corrupt(text: str, rate: float, rng: random.Random) -> str:
+    if not rate:
+        return text
+    out = []
+    for ch in text:
+        if ch in _CONFUSIONS and rng.random() < rate:
+            swapped = _CONFUSIONS[ch]
+            if swapped is not None:
+                out.append(swapped)
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def generate_corpus(
+    docs: int,
+    seed: int = 0,
+    arabic_digits: float = 0.5,
+    noise: float = 0.3,
+    corruption: float = 0.0,
+) -> Iterator[SyntheticBill]:
+    """Synthetic bill texts in every format the parsers and `classify_layout` recognise.
+
+    Formats rotate (see FORMATS). Each document has its digits in Arabic-Indic with
+    probability `arabic_digits`, a noise line after each line with probability `noise`, and
+    each confusable character (0/O, 1/l, ة/ه, dropped spaces, ...) corrupted with probability
+    `corruption`. The same arguments always produce the same corpus.
+    """
+    rng = random.Random(seed)
+    for i in range(docs):
+        fmt = FORMATS[i % len(FORMATS)]
+        builder, utility_type, layout = _BUILDERS[fmt]
+        lines, expected = builder(rng)
+        noisy: list[str] = []
+        for line in lines:
+            noisy.append(line)
+            if rng.random() < noise:
+                noisy.append(rng.choice(_NOISE_LINES))
+        text = _corrupt("\n".join(noisy), corruption, rng)
+        if rng.random() < arabic_digits:
+            text = text.translate(_TO_ARABIC_DIGITS)
+        yield SyntheticBill(format=fmt, utility_type=utility_type, text=text, layout=layout, expected=expected)
+
+
+def save_corpus(corpus: Iterable[SyntheticBill], path: str) -> int:
+    """Write the corpus as JSON lines; returns the number of documents."""
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for doc in corpus:
+            f.write(json.dumps(dataclasses.asdict(doc), ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def load_corpus(path: str) -> Iterator[SyntheticBill]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield SyntheticBill(**json.loads(line))
+
+
+def _same(got: Any, wanted: str) -> bool:
+    if got is None:
+        return False
+    if isinstance(got, Decimal):
+        try:
+            return got == Decimal(wanted)
+        except InvalidOperation:
+            return False
+    if isinstance(got, date):
+        return got.isoformat() == wanted
+    return str(got) == wanted
+
+
+def _percentile(ordered: list[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+class _Stats:
+    def __init__(self) -> None:
+        self.seconds: list[float] = []
+        self.checked = self.correct = 0
+        self.per_field: dict[str, list[int]] = {}
+        self.per_format: dict[str, list[int]] = {}
+
+    def score(self, fmt: str, name: str, ok: bool) -> None:
+        self.checked += 1
+        self.correct += ok
+        for key, table in ((name, self.per_field), (fmt, self.per_format)):
+            counts = table.setdefault(key, [0, 0])
+            counts[0] += ok
+            counts[1] += 1
+
+    def report(self, docs: int) -> dict[str, Any]:
+        ordered = sorted(self.seconds)
+        total = sum(ordered)
+        return {
+            "docs": docs,
+            "docs_per_sec": round(len(ordered) / total, 1) if total else None,
+            "latency_us": {
+                "p50": round(_percentile(ordered, 0.50) * 1e6, 1),
+                "p99": round(_percentile(ordered, 0.99) * 1e6, 1),
+                "max": round(ordered[-1] * 1e6, 1) if ordered else 0.0,
+            },
+            "checked": self.checked,
+            "correct": self.correct,
+            "accuracy": round(self.correct / self.checked, 4) if self.checked else None,
+            "per_field": {k: round(ok / n, 4) for k, (ok, n) in sorted(self.per_field.items())},
+            "per_format": {k: round(ok / n, 4) for k, (ok, n) in sorted(self.per_format.items())},
+        }
+
+
+def _timed(fn: Callable[[str], Any], text: str, stats: _Stats, repeat: int) -> Any:
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(text)
+        stats.seconds.append(time.perf_counter() - started)
+    return result
+
+
+def run_parser_benchmark(corpus: Iterable[SyntheticBill], repeat: int = 3) -> dict[str, Any]:
+    """Time the parsers and the layout classifier on `corpus` and score what they extract.
+
+    Each document is parsed `repeat` times; throughput and latency percentiles cover every run,
+    accuracy (fields matching the expected values; layouts for the classifier) the last one.
+    """
+    parsers: dict[str, tuple[str, Callable[[str], Any]]] = {
+        "parse_electricity_text": ("electricity", parse_electricity_text),
+        "parse_water_text": ("water", parse_water_text),
+    }
+    stats = {name: _Stats() for name in (*parsers, "classify_layout")}
+    docs = {name: 0 for name in stats}
+    formats: dict[str, int] = {}
+
+    for name, (_, fn) in parsers.items():
+        fn("")  # warm up imports and compiled patterns
+    for doc in corpus:
+        formats[doc.format] = formats.get(doc.format, 0) + 1
+        for name, (utility_type, fn) in parsers.items():
+            if doc.utility_type != utility_type:
+                continue
+            docs[name] += 1
+            parsed = dataclasses.asdict(_timed(fn, doc.text, stats[name], repeat))
+            for field_name, wanted in doc.expected.items():
+                stats[name].score(doc.format, field_name, _same(parsed.get(field_name), wanted))
+        docs["classify_layout"] += 1
+        layout = _timed(classify_layout, doc.text, stats["classify_layout"], repeat)
+        stats["classify_layout"].score(doc.format, doc.layout, layout == doc.layout)
+
+    results = {name: s.report(docs[name]) for name, s in stats.items()}
+    # The classifier's "fields" are the expected layouts.
+    results["classify_layout"]["per_layout"] = results["classify_layout"].pop("per_field")
+    return {"formats": formats, "repeat": repeat, "results": results}
+
+
+# Adversarial texts of about n characters: inputs that make a regex with unbounded repetition
+# backtrack, huge numbers, and statements whose every line is a bill header.
+WORST_CASES: dict[str, Callable[[int], str]] = {
+    "period_without_end": lambda n: "from 2024/01/01 " * (n // 16),
+    "digit_run_after_label": lambda n: "القراءة السابقة " + "1" * n,
+    "table_row_of_digits": lambda n: "المستجرة من الشبكة " + "1 " * (n // 2),
+    "whitespace_after_label": lambda n: "رقم العداد" + " " * n,
+    "labels_without_values": lambda n: "قيمة الفاتورة Total bill value Fixed subsidy amount Meter No " * (n // 62),
+    "repeated_bill_header": lambda n: "Meter No 1\n" * (n // 11),
+    "alternating_bill_headers": lambda n: "".join(f"Meter No {i % 2}\n" for i in range(n // 11)),
+    "blank_lines_after_label": lambda n: "رقم العداد 1" + "\n" * n,
+    "markers_between_blank_lines": lambda n: ("\n" * 48 + "--- IMAGE 1 ---\n") * (n // 64),
+}
+
+
+def _bill_count(text: str) -> int:
+    return sum(1 for _ in iter_bills(text, UtilityType.ELECTRICITY))
+
+
+def _parse_joined(text: str) -> Any:
+    return parse_ocr_text(text, UtilityType.ELECTRICITY).parsed
+
+
+def run_worst_case_benchmark(sizes: tuple[int, ...] = (10_000, 40_000, 160_000), repeat: int = 3) -> dict[str, Any]:
+    """Time the parsers on `WORST_CASES` at growing input sizes.
+
+    For every function and case the best of `repeat` runs is reported per size, with the
+    growth exponent between the smallest and largest size: ~1 is linear, ~2 quadratic.
+    Exceptions are counted as errors.
+    """
+    functions: dict[str, Callable[[str], Any]] = {
+        "parse_electricity_text": parse_electricity_text,
+        "parse_water_text": parse_water_text,
+        "classify_layout": classify_layout,
+        "iter_bills": _bill_count,
+        # The upload path for a stored OCR text: page splitting, caps and per-page parsing.
+        "parse_ocr_text": _parse_joined,
+    }
+    sizes = tuple(sorted(sizes))
+    results: dict[str, Any] = {}
+    for name, fn in functions.items():
+        cases: dict[str, Any] = {}
+        for case, build in WORST_CASES.items():
+            ms: dict[str, float] = {}
+            errors: dict[str, str] = {}
+            for size in sizes:
+                text = build(size)
+                best = math.inf
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    try:
+                        fn(text)
+                    except Exception as exc:
+                        errors[str(size)] = type(exc).__name__
+                    best = min(best, time.perf_counter() - started)
+                ms[str(size)] = round(best * 1000, 3)
+            first, last = ms[str(sizes[0])], ms[str(sizes[-1])]
+            exponent = None
+            if len(sizes) > 1 and first > 0 and last > 0:
+                exponent = round(math.log(last / first) / math.log(sizes[-1] / sizes[0]), 2)
+            cases[case] = {"ms": ms, "exponent": exponent, "errors": errors}
+        exponents = [c["exponent"] for c in cases.values() if c["exponent"] is not None]
+        results[name] = {
+            "max_exponent": max(exponents) if exponents else None,
+            "errors": sum(len(c["errors"]) for c in cases.values()),
+            "cases": cases,
+        }
+    return {"sizes": list(sizes), "repeat": repeat, "worst_case": results}
+
+
+def benchmark_environment() -> dict[str, Any]:
+    try:
+        from importlib.metadata import version
+
+        package = version("utility-bills")
+    except Exception:
+        package = None
+    return {
+        "created_at": timezone.now().isoformat(),
+        "package_version": package,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+    }
+
+
+def compare_reports(current: dict[str, Any], baseline: dict[str, Any]) -> dict[str, Any]:
+    """Throughput and p99 ratios (current / baseline) and accuracy deltas per benchmarked function."""
+    out: dict[str, Any] = {}
+    for name, now in current.get("results", {}).items():
+        before = baseline.get("results", {}).get(name)
+        if not before:
+            continue
+        entry: dict[str, Any] = {}
+        if now.get("docs_per_sec") and before.get("docs_per_sec"):
+            entry["throughput_ratio"] = round(now["docs_per_sec"] / before["docs_per_sec"], 3)
+        if now["latency_us"]["p99"] and before["latency_us"]["p99"]:
+            entry["p99_ratio"] = round(now["latency_us"]["p99"] / before["latency_us"]["p99"], 3)
+        if now.get("accuracy") is not None and before.get("accuracy") is not None:
+            entry["accuracy_delta"] = round(now["accuracy"] - before["accuracy"], 4)
+        out[name] = entry
+    return out
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable, Optional
+
+from django.core.exceptions import ImproperlyConfigured
+
+from ..conf import app_setting
+
+
+# Each step takes a PIL image and returns (image, description); description is "" when the step
+# didn't change anything (e.g. an image already below the target height is not resized).
+Step = Callable[[Any], "tuple[Any, str]"]
+
+
+def _grayscale(img: Any) -> tuple[Any, str]:
+    if img.mode == "L":
+        return img, ""
+    return img.convert("L"), "grayscale"
+
+
+def _resize(img: Any) -> tuple[Any, str]:
+    """Downscale to the target height (phone screenshots are often 3000+ px tall)."""
+    from PIL import Image  # type: ignore
+
+    target = app_setting("OCR_PREPROCESS_TARGET_HEIGHT")
+    w, h = img.size
+    if not target or h <= target:
+        return img, ""
+    new_size = (max(1, round(w * target / h)), target)
+    return img.resize(new_size, Image.Resampling.LANCZOS), f"resize({h}->{target})"
+
+
+def _otsu_threshold(histogram: list[int]) -> int:
+    total = sum(histogram)
+    sum_all = sum(i * c for i, c in enumerate(histogram))
+    sum_bg = 0.0
+    weight_bg = 0
+    best_t, best_var = 127, -1.0
+    for t, count in enumerate(histogram):
+        weight_bg += count
+        if weight_bg == 0:
+            continue
+        weight_fg = total - weight_bg
+        if weight_fg == 0:
+            break
+        sum_bg += t * count
+        mean_bg = sum_bg / weight_bg
+        mean_fg = (sum_all - sum_bg) / weight_fg
+        var = weight_bg * weight_fg * (mean_bg - mean_fg) ** 2
+        if var > best_var:
+            best_t, best_var = t, var
+    return best_t
+
+
+def _binarize(img: Any) -> tuple[Any, str]:
+    """Black text on white using Otsu's global threshold."""
+    gray = img if img.mode == "L" else img.convert("L")
+    threshold = _otsu_threshold(gray.histogram()[:256])
+    return gray.point(lambda v: 255 if v > threshold else 0, mode="L"), f"binarize({threshold})"
+
+
+def _estimate_skew(gray: Any, max_angle: float, step: float) -> float:
+    """Projection-profile skew estimate: the rotation whose row sums are sharpest wins."""
+    from PIL import Image, ImageOps  # type: ignore
+
+    thumb = ImageOps.invert(gray)
+    thumb.thumbnail((600, 600))
+    w, h = thumb.size
+    best_angle, best_score = 0.0, -1.0
+    angle = -max_angle
+    while angle <= max_angle + 1e-9:
+        rotated = thumb.rotate(angle, resample=Image.Resampling.BILINEAR, fillcolor=0)
+        # Resizing to width 1 yields the mean of every row, computed in C.
+        profile = list(rotated.resize((1, h), Image.Resampling.BOX).getdata())
+        score = sum((a - b) ** 2 for a, b in zip(profile, profile[1:]))
+        if score > best_score:
+            best_angle, best_score = angle, score
+        angle += step
+    return best_angle
+
+
+def _deskew(img: Any) -> tuple[Any, str]:
+    from PIL import Image  # type: ignore
+
+    gray = img if img.mode == "L" else img.convert("L")
+    angle = _estimate_skew(gray, app_setting("OCR_PREPROCESS_DESKEW_MAX_ANGLE"), 0.5)
+    if abs(angle) < 0.5:
+        return img, ""
+    fill = 255 if img.mode == "L" else (255,) * len(img.getbands())
+    rotated = img.rotate(angle, resample=Image.Resampling.BICUBIC, expand=True, fillcolor=fill)
+    return rotated, f"deskew({angle:+.1f})"
+
+
+def _autocrop(img: Any) -> tuple[Any, str]:
+    """Trim uniform light margins around the content."""
+    from PIL import ImageOps  # type: ignore
+
+    gray = img if img.mode == "L" else img.convert("L")
+    # Anything noticeably darker than paper counts as content.
+    mask = ImageOps.invert(gray).point(lambda v: 255 if v > 40 else 0)
+    box = mask.getbbox()
+    if box is None:
+        return img, ""
+    pad = 10
+    w, h = img.size
+    box = (max(0, box[0] - pad), max(0, box[1] - pad), min(w, box[2] + pad), min(h, box[3] + pad))
+    if box == (0, 0, w, h):
+        return img, ""
+    return img.crop(box), f"autocrop({w}x{h}->{box[2] - box[0]}x{box[3] - box[1]})"
+
+
+STEPS: dict[str, Step] = {
+    "grayscale": _grayscale,
+    "autocrop": _autocrop,
+    "deskew": _deskew,
+    "resize": _resize,
+    "binarize": _binarize,
+}
+
+
+def configured_steps(steps: Optional[Iterable[str]] = None) -> list[str]:
+    """Validated step names: `steps` if given, else UTILITY_BILLS_OCR_PREPROCESS_STEPS."""
+    names = list(app_setting("OCR_PREPROCESS_STEPS") if steps is None else steps)
+    unknown = [n for n in names if n not in STEPS]
+    if unknown:
+        raise ImproperlyConfigured(f"Unknown OCR preprocessing steps {unknown}; available: {sorted(STEPS)}")
+    return names
+
+
+def preprocessing_signature(steps: Optional[Iterable[str]] = None) -> str:
+    """Identifies the preprocessing configuration (part of the OCR cache key)."""
+    names = configured_steps(steps)
+    parts = list(names)
+    if "resize" in names:
+        parts.append(f"h={app_setting('OCR_PREPROCESS_TARGET_HEIGHT')}")
+    if "deskew" in names:
+        parts.append(f"a={app_setting('OCR_PREPROCESS_DESKEW_MAX_ANGLE')}")
+    # Decode-time downscaling (OCR_DECODE_MAX_SIDE) changes the pixels OCR sees as well.
+    parts.append(f"max={app_setting('OCR_DECODE_MAX_SIDE')}")
+    return ",".join(parts)
+
+
+def preprocess_image(img: Any, steps: Optional[Iterable[str]] = None) -> tuple[Any, list[str]]:
+    """Run the preprocessing pipeline on a PIL image.
+
+    Returns the processed image and a description of every step that changed it.
+    """
+    applied: list[str] = []
+    for name in configured_steps(steps):
+        img, description = STEPS[name](img)
+        if description:
+            applied.append(description)
+    return img, applied
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import time
+from typing import Iterable, Optional
+
+from ..conf import app_setting
+from ..parsers.electricity_parser import parse_electricity_text
+from .layout_templates import LayoutTemplate
+from .ocr_engine import ImageSource, OcrResult, RegionTexts, join_pages, mean_confidence, ocr_regions_tesseract
+
+
+def ocr_images_roi(
+    image_paths: Iterable[ImageSource],
+    template: LayoutTemplate,
+    lang: str = "ara+eng",
+    psm: int = 6,
+    preprocess: Optional[Iterable[str]] = None,
+) -> OcrResult:
+    """OCR only the field regions of a known layout, falling back to full-page OCR per image.
+
+    An image falls back when the mean word confidence of its regions is below
+    OCR_ROI_MIN_CONFIDENCE or when the region text doesn't yield the template's required
+    fields. The fallback reuses the decoded image and Tesseract handle. `OcrResult.ocr_modes`
+    records "roi" or "full" per image.
+    """
+    min_conf = app_setting("OCR_ROI_MIN_CONFIDENCE")
+    pages: list[str] = []
+    seconds: list[float] = []
+    steps: list[list[str]] = []
+    modes: list[str] = []
+    confidences: list[Optional[float]] = []
+
+    def region_text(regions: RegionTexts) -> str:
+        return "\n".join(
+            f"{region.prefix} {region_text}".strip() for region, (region_text, _) in zip(template.regions, regions)
+        )
+
+    def region_conf(regions: RegionTexts) -> float:
+        region_confs = [conf for _, conf in regions if conf is not None]
+        return sum(region_confs) / len(region_confs) if region_confs else 0.0
+
+    def accept(regions: RegionTexts) -> bool:
+        if region_conf(regions) < min_conf:
+            return False
+        parsed = parse_electricity_text(region_text(regions))
+        return all(getattr(parsed, f) is not None for f in template.required_fields)
+
+    boxes = [r.box for r in template.regions]
+    for path in image_paths:
+        started = time.perf_counter()
+        read = ocr_regions_tesseract(path, boxes, lang, psm, preprocess, accept=accept)
+        seconds.append(time.perf_counter() - started)
+        steps.append(read.preprocessing)
+        if read.full is None:
+            pages.append(region_text(read.regions))
+            modes.append("roi")
+            confidences.append(region_conf(read.regions))
+        else:
+            pages.append(read.full[0])
+            modes.append("full")
+            confidences.append(read.full[1])
+
+    return OcrResult(
+        text=join_pages(pages),
+        engine="tesseract-roi" if "roi" in modes else "tesseract",
+        confidence=mean_confidence(confidences),
+        page_confidences=[None if c is None else round(c, 4) for c in confidences],
+        pages=pages,
+        image_seconds=[round(s, 3) for s in seconds],
+        preprocessing=steps,
+        ocr_modes=modes,
+    )
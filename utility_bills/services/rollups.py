@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Iterable, NamedTuple
+
+from django.db import transaction
+
+from ..models import MonthlyUsageRollup, UtilityBill
+from .aggregations import usage_rows
+from .dashboard import invalidate_dashboard_stats
+
+
+_MEASURES = (
+    "total_amount",
+    "bill_count",
+    "import_kwh",
+    "export_kwh",
+    "net_kwh",
+    "billed_kwh",
+    "consumption_m3",
+    "billed_m3",
+)
+
+
+class RollupBucket(NamedTuple):
+    user_id: int
+    meter_id: int
+    utility_type: str
+    year: int
+    month: int
+
+
+def bucket_for(user_id: int, meter_id: int, utility_type: str, period_end: date) -> RollupBucket:
+    return RollupBucket(user_id, meter_id, utility_type, period_end.year, period_end.month)
+
+
+def bucket_for_bill_id(bill_id: int) -> RollupBucket | None:
+    """Look up the bucket of a bill by primary key (None if the bill is already gone)."""
+    row = (
+        UtilityBill.objects.filter(pk=bill_id)
+        .values("user_id", "meter_id", "utility_type", "period_end")
+        .first()
+    )
+    if row is None:
+        return None
+    return bucket_for(row["user_id"], row["meter_id"], row["utility_type"], row["period_end"])
+
+
+def refresh_bucket(bucket: RollupBucket) -> MonthlyUsageRollup:
+    """Recompute one rollup row from the bills that fall into it.
+
+    Only the bills of a single user/meter/utility type/month are read, so the cost of
+    keeping rollups current is independent of the user's history size.
+    """
+    bills = UtilityBill.objects.filter(
+        user_id=bucket.user_id,
+        meter_id=bucket.meter_id,
+        utility_type=bucket.utility_type,
+        period_end__year=bucket.year,
+        period_end__month=bucket.month,
+    )
+    values = {name: 0 for name in _MEASURES}
+    for row in usage_rows(bills):
+        for name in _MEASURES:
+            values[name] += row[name]
+
+    rollup, _ = MonthlyUsageRollup.objects.update_or_create(
+        user_id=bucket.user_id,
+        meter_id=bucket.meter_id,
+        utility_type=bucket.utility_type,
+        year=bucket.year,
+        month=bucket.month,
+        defaults=values,
+    )
+    return rollup
+
+
+def refresh_buckets(buckets: Iterable[RollupBucket | None]) -> None:
+    """Refresh the given rollup rows and drop the cached dashboards that read them."""
+    for bucket in set(b for b in buckets if b is not None):
+        refresh_bucket(bucket)
+        invalidate_dashboard_stats(bucket.user_id, [bucket.year])
+
+
+def rebuild_user_rollups(user_id: int) -> int:
+    """Replace every rollup row of a user with values recomputed from their bills.
+
+    Returns the number of rollup rows written.
+    """
+    rows = [
+        MonthlyUsageRollup(
+            user_id=row["user_id"],
+            meter_id=row["meter_id"],
+            utility_type=row["utility_type"],
+            year=row["month"].year,
+            month=row["month"].month,
+            **{name: row[name] for name in _MEASURES},
+        )
+        for row in usage_rows(UtilityBill.objects.filter(user_id=user_id))
+    ]
+    existing = MonthlyUsageRollup.objects.filter(user_id=user_id)
+    with transaction.atomic():
+        years = set(existing.values_list("year", flat=True)) | {r.year for r in rows}
+        existing.delete()
+        MonthlyUsageRollup.objects.bulk_create(rows)
+    invalidate_dashboard_stats(user_id, years)
+    return len(rows)
+
+
+def diff_user_rollups(user_id: int) -> list[str]:
+    """Compare stored rollups with values recomputed from bills; return human-readable mismatches."""
+    expected = {
+        (row["meter_id"], row["utility_type"], row["month"].year, row["month"].month): {
+            name: row[name] for name in _MEASURES
+        }
+        for row in usage_rows(UtilityBill.objects.filter(user_id=user_id))
+    }
+    stored = {
+        (r["meter_id"], r["utility_type"], r["year"], r["month"]): {name: r[name] for name in _MEASURES}
+        for r in MonthlyUsageRollup.objects.filter(user_id=user_id).values(
+            "meter_id", "utility_type", "year", "month", *_MEASURES
+        )
+    }
+
+    problems: list[str] = []
+    for key in sorted(set(expected) | set(stored)):
+        want = expected.get(key) or {name: 0 for name in _MEASURES}
+        have = stored.get(key) or {name: 0 for name in _MEASURES}
+        for name in _MEASURES:
+            if want[name] != have[name]:
+                meter_id, utility_type, year, month = key
+                problems.append(
+                    f"user={user_id} meter={meter_id} {utility_type} {year}-{month:02d} {name}: "
+                    f"stored={have[name]} expected={want[name]}"
+                )
+    return problems
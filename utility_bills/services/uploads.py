@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import logging
+from types import TracebackType
+from typing import Iterable, Optional
+
+from django.core.files.uploadedfile import UploadedFile
+
+from .ocr_engine import ImageSource
+
+
+logger = logging.getLogger(__name__)
+
+
+class UploadedImages:
+    """OCR sources for a request's uploaded images, without copying them to disk.
+
+    Uploads Django kept in memory (up to FILE_UPLOAD_MAX_MEMORY_SIZE) are handed to Pillow as
+    file objects; larger ones were already spilled by Django's upload handler and are read
+    from that temporary file. `temp_bytes` counts the bytes written to temp storage for the
+    request. Use as a context manager: the uploads, and with them Django's temporary files,
+    are closed on exit, also when OCR fails.
+    """
+
+    def __init__(self, files: Iterable[UploadedFile]) -> None:
+        self.files = list(files)
+        self.sources: list[ImageSource] = []
+        self.temp_bytes = 0
+        for f in self.files:
+            if hasattr(f, "temporary_file_path"):
+                self.sources.append(f.temporary_file_path())
+                self.temp_bytes += f.size or 0
+            else:
+                self.sources.append(f.file)
+
+    def __enter__(self) -> UploadedImages:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for f in self.files:
+            try:
+                f.close()  # TemporaryUploadedFile deletes its file on close
+            except OSError:
+                logger.warning("Could not close uploaded file %r", f.name, exc_info=True)
+        logger.info(
+            "OCR upload: %d image(s), %d byte(s) written to temp storage", len(self.files), self.temp_bytes
+        )
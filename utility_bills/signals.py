@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import ElectricityBill, UtilityBill, WaterBill
+from .services.rollups import bucket_for, bucket_for_bill_id, refresh_buckets
+
+
+# Keep MonthlyUsageRollup in sync with bill writes from any entry point
+# (manual forms, OCR save, admin). Bulk queryset updates bypass signals;
+# use `manage.py rebuild_usage_rollups` after those.
+
+
+@receiver(pre_save, sender=UtilityBill)
+def _remember_previous_bucket(sender: type[UtilityBill], instance: UtilityBill, **kwargs: Any) -> None:
+    instance._rollup_previous_bucket = bucket_for_bill_id(instance.pk) if instance.pk else None
+
+
+@receiver(post_save, sender=UtilityBill)
+def _bill_saved(sender: type[UtilityBill], instance: UtilityBill, **kwargs: Any) -> None:
+    current = bucket_for(instance.user_id, instance.meter_id, instance.utility_type, instance.period_end)
+    previous = getattr(instance, "_rollup_previous_bucket", None)
+    refresh_buckets([current, previous])
+
+
+@receiver(post_delete, sender=UtilityBill)
+def _bill_deleted(sender: type[UtilityBill], instance: UtilityBill, **kwargs: Any) -> None:
+    refresh_buckets([bucket_for(instance.user_id, instance.meter_id, instance.utility_type, instance.period_end)])
+
+
+@receiver(post_save, sender=ElectricityBill)
+@receiver(post_save, sender=WaterBill)
+@receiver(post_delete, sender=ElectricityBill)
+@receiver(post_delete, sender=WaterBill)
+def _bill_details_changed(sender: type, instance: ElectricityBill | WaterBill, **kwargs: Any) -> None:
+    # When the parent bill is being deleted, its own post_delete handles the refresh.
+    refresh_buckets([bucket_for_bill_id(instance.bill_id)])
@@ -8,10 +8,14 @@ app_name = "utility_bills"
 
 urlpatterns = [
     path("", views.dashboard, name="dashboard"),
+    path("charts/", views.chart_data, name="chart_data"),
     path("meters/", views.meters_list, name="meters_list"),
     path("meters/add/", views.meter_add, name="meter_add"),
     path("bills/add/", views.bill_add, name="bill_add"),
     path("bills/<int:bill_id>/", views.bill_detail, name="bill_detail"),
+    path("bills/<int:bill_id>/images/<int:position>/", views.bill_image, name="bill_image"),
     path("ocr/upload/", views.ocr_upload, name="ocr_upload"),
     path("ocr/save/", views.ocr_save, name="ocr_save"),
+    path("ocr/jobs/<int:job_id>/", views.ocr_job, name="ocr_job"),
+    path("ocr/jobs/<int:job_id>/status/", views.ocr_job_status, name="ocr_job_status"),
 ]
@@ -3,18 +3,21 @@
 
 from __future__ import annotations
 
+import dataclasses
 import json
-import tempfile
+import logging
 from datetime import date
 from decimal import Decimal
-from typing import Any
+from typing import Any, Iterator
 
 from django.contrib.auth.decorators import login_required
-from django.db.models import Sum
-from django.http import HttpRequest, HttpResponse
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import FileResponse, HttpRequest, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
+from django.views.decorators.http import condition, require_GET
 
+from .conf import app_setting
 from .forms import (
     DashboardFilterForm,
     ElectricityManualBillForm,
@@ -24,36 +27,50 @@ from .forms import (
     WaterManualBillForm,
 )
 from .models import (
+    BillImage,
     DataSource,
     ElectricityBill,
+    OcrJob,
+    OcrJobStatus,
     UtilityBill,
     UtilityMeter,
     UtilityType,
     WaterBill,
 )
-from .parsers.electricity_parser import parse_electricity_text
-from .services.classifiers import classify_layout
-from .services.ocr_engine import ocr_images_paddle, ocr_images_tesseract
+from .services.admission import OcrAdmission, OcrBusy
+from .services.blob_store import link_bill_images, store_image_blobs
+from .services.dashboard import dashboard_etag, get_dashboard_stats, label_meter_series
+from .services.ocr_engine import OcrEngineError, OcrImageTooLarge, OcrMemoryBusy
+from .services.ocr_jobs import enqueue_ocr_job
+from .services.ocr_pipeline import PageProgress, iter_upload, process_upload
+from .services.ocr_sessions import OcrSession, create_ocr_session, discard_ocr_session, get_ocr_session
+from .services.uploads import UploadedImages
 
 
-def _year_default() -> int:
-    return date.today().year
+logger = logging.getLogger(__name__)
 
 
-# Configurable constants for solar savings estimation
-SOLAR_EXPORT_RATE_JOD_PER_KWH = Decimal("0.070")  # Estimated value per exported kWh
+def _year_default() -> int:
+    return date.today().year
 
 
-@login_required
-def dashboard(request: HttpRequest) -> HttpResponse:
+def _dashboard_filters(request: HttpRequest) -> tuple[DashboardFilterForm, str, int | None, int]:
     form = DashboardFilterForm(request.GET or None)
     form.is_valid()
 
-    utility_type = form.cleaned_data.get("utility_type") if form.cleaned_data else ""
-    meter_id = form.cleaned_data.get("meter_id") if form.cleaned_data else None
-    year = form.cleaned_data.get("year") if form.cleaned_data else None
+    # An unbound form (no query string) has no cleaned_data; the defaults apply then.
+    cleaned = getattr(form, "cleaned_data", {})
+    utility_type = cleaned.get("utility_type")
+    meter_id = cleaned.get("meter_id")
+    year = cleaned.get("year")
     if not year:
         year = _year_default()
+    return form, utility_type or "", meter_id, year
+
+
+@login_required
+def dashboard(request: HttpRequest) -> HttpResponse:
+    form, utility_type, meter_id, year = _dashboard_filters(request)
 
     qs = UtilityBill.objects.filter(user=request.user, period_end__year=year)
     if utility_type:
@@ -61,71 +78,8 @@ def dashboard(request: HttpRequest) -> HttpResponse:
     if meter_id:
         qs = qs.filter(meter_id=meter_id)
 
-    total_spent = qs.aggregate(s=Sum("total_amount"))["s"] or Decimal("0.000")
-
-    # Chart: monthly totals (simple)
-    monthly: list[float] = []
-    for m in range(1, 13):
-        msum = qs.filter(period_end__month=m).aggregate(s=Sum("total_amount"))["s"] or Decimal("0.000")
-        monthly.append(float(msum))
-
-    # Chart: electricity net kWh by month (if present)
-    elec_net: list[int] = [0] * 12
-    elec_import: list[int] = [0] * 12
-    elec_export: list[int] = [0] * 12
-    elec_billed: list[int] = [0] * 12
-
-    # Yearly totals for ratios
-    total_import_kwh = 0
-    total_export_kwh = 0
-    total_net_kwh = 0
-
-    elec_bills = ElectricityBill.objects.filter(
-        bill__in=qs.filter(utility_type=UtilityType.ELECTRICITY)
-    ).select_related("bill")
-
-    for eb in elec_bills:
-        idx = eb.bill.period_end.month - 1
-        elec_import[idx] += eb.import_kwh
-        elec_export[idx] += eb.export_kwh
-        elec_net[idx] += eb.net_kwh
-
-        total_import_kwh += eb.import_kwh
-        total_export_kwh += eb.export_kwh
-        total_net_kwh += eb.net_kwh
-
-        if eb.billed_kwh is not None:
-            elec_billed[idx] += int(eb.billed_kwh)
-
-    # Calculate solar/consumption analytics
-    # Self-consumption ratio: portion of generated solar used on-site
-    # = (total_export_kwh / estimated_generation) but we don't have generation
-    # Instead, we compute: export_kwh / import_kwh as "export ratio"
-    # Grid dependency ratio: net_kwh / import_kwh (lower is better for solar users)
-    self_consumption_ratio: float | None = None
-    grid_dependency_ratio: float | None = None
-    estimated_solar_savings = Decimal("0.000")
-
-    if total_import_kwh > 0:
-        # Export ratio (how much of what we could have used did we export)
-        self_consumption_ratio = round(
-            (1 - (total_export_kwh / total_import_kwh)) * 100, 1
-        ) if total_export_kwh > 0 else 100.0
-
-        # Grid dependency (what portion of consumption came from grid)
-        grid_dependency_ratio = round((total_net_kwh / total_import_kwh) * 100, 1)
-
-    # Estimated solar savings = export_kwh * rate
-    estimated_solar_savings = Decimal(total_export_kwh) * SOLAR_EXPORT_RATE_JOD_PER_KWH
-
-    chart_payload = {
-        "labels": [f"{year}-{m:02d}" for m in range(1, 13)],
-        "monthly_total_amount": monthly,
-        "electricity_import_kwh": elec_import,
-        "electricity_export_kwh": elec_export,
-        "electricity_net_kwh": elec_net,
-        "electricity_billed_kwh": elec_billed,
-    }
+    # Totals, chart series and solar ratios (cached per user/year/filters)
+    stats = get_dashboard_stats(request.user.pk, year, utility_type, meter_id)
 
     meters = UtilityMeter.objects.filter(user=request.user, is_active=True).order_by("utility_type", "meter_number")
 
@@ -137,22 +91,48 @@ def dashboard(request: HttpRequest) -> HttpResponse:
         "utility_bills/dashboard.html",
         {
             "form": form,
-            "total_spent": total_spent,
+            "total_spent": stats["total_spent"],
+            "spent_by_utility": stats["spent_by_utility"],
             "meters": meters,
             "latest_bills": latest_bills,
-            "chart_payload_json": json.dumps(chart_payload),
+            "chart_payload_json": json.dumps(stats["chart_payload"]),
             "year": year,
             # New analytics
-            "total_import_kwh": total_import_kwh,
-            "total_export_kwh": total_export_kwh,
-            "total_net_kwh": total_net_kwh,
-            "self_consumption_ratio": self_consumption_ratio,
-            "grid_dependency_ratio": grid_dependency_ratio,
-            "estimated_solar_savings": estimated_solar_savings,
+            "total_import_kwh": stats["total_import_kwh"],
+            "total_export_kwh": stats["total_export_kwh"],
+            "total_net_kwh": stats["total_net_kwh"],
+            "self_consumption_ratio": stats["self_consumption_ratio"],
+            "grid_dependency_ratio": stats["grid_dependency_ratio"],
+            "estimated_solar_savings": stats["estimated_solar_savings"],
         },
     )
 
 
+def _chart_data_etag(request: HttpRequest) -> str | None:
+    if not request.user.is_authenticated:
+        return None
+    _, utility_type, meter_id, year = _dashboard_filters(request)
+    return dashboard_etag(request.user.pk, year, utility_type, meter_id)
+
+
+@login_required
+@require_GET
+@condition(etag_func=_chart_data_etag)
+def chart_data(request: HttpRequest) -> HttpResponse:
+    """Dashboard chart payload (plus per-meter series) as JSON, with ETag / If-None-Match support."""
+    _, utility_type, meter_id, year = _dashboard_filters(request)
+    stats = get_dashboard_stats(request.user.pk, year, utility_type, meter_id)
+    return JsonResponse(
+        {
+            "year": year,
+            "utility_type": utility_type,
+            "meter_id": meter_id,
+            **stats["chart_payload"],
+            "meters": label_meter_series(request.user.pk, stats["meter_series"]),
+        }
+    )
+
+
 @login_required
 def meters_list(request: HttpRequest) -> HttpResponse:
     meters = UtilityMeter.objects.filter(user=request.user).order_by("-created_at")
@@ -238,7 +218,89 @@ def bill_add(request: HttpRequest) -> HttpResponse:
 @login_required
 def bill_detail(request: HttpRequest, bill_id: int) -> HttpResponse:
     bill = get_object_or_404(UtilityBill.objects.select_related("meter"), id=bill_id, user=request.user)
-    return render(request, "utility_bills/bill_detail.html", {"bill": bill})
+    return render(request, "utility_bills/bill_detail.html", {"bill": bill, "images": bill.images.select_related("blob")})
+
+
+@login_required
+@require_GET
+def bill_image(request: HttpRequest, bill_id: int, position: int) -> HttpResponse:
+    """Serve an original image of one of the user's bills."""
+    link = get_object_or_404(
+        BillImage.objects.select_related("blob"), bill_id=bill_id, bill__user=request.user, position=position
+    )
+    blob = link.blob
+    return FileResponse(blob.file.open("rb"), content_type=blob.content_type or "application/octet-stream")
+
+
+def _render_ocr_result(
+    request: HttpRequest,
+    *,
+    utility_type: str,
+    ocr_text: str,
+    engine: str,
+    layout: str,
+    parsed: Any,
+    confidence: float | None = None,
+    image_digests: list[str] | None = None,
+    field_sources: dict[str, int] | None = None,
+    form: OcrUploadForm | None = None,
+) -> HttpResponse:
+    """Render the OCR preview / confirm page.
+
+    `parsed` is an ElectricityParsed (synchronous upload) or its dict form (stored OcrJob);
+    the template and the confirm form accept either. The OCR result is kept in a server-side
+    session; the confirm form only carries its token. `field_sources` (parsed field -> image
+    number) is shown next to the fields when values came from images other than the first.
+    """
+    confirm_form = None
+    if utility_type == UtilityType.ELECTRICITY and parsed is not None:
+        values = parsed if isinstance(parsed, dict) else dataclasses.asdict(parsed)
+        token = create_ocr_session(
+            OcrSession(
+                user_id=request.user.pk,
+                utility_type=utility_type,
+                engine=engine,
+                ocr_text=ocr_text,
+                layout=layout,
+                confidence=confidence,
+                parsed=values,
+                image_digests=list(image_digests or []),
+            )
+        )
+        # Pre-populate confirmation form with parsed values
+        initial_data: dict[str, Any] = {
+            "meter_number": values["meter_number"] or "",
+            "period_start": values["period_start"],
+            "period_end": values["period_end"],
+            "reading_date": values["reading_date"],
+            "import_previous": values["import_previous"],
+            "import_current": values["import_current"],
+            "export_previous": values["export_previous"],
+            "export_current": values["export_current"],
+            "billed_kwh": values["billed_kwh"],
+            "total_amount": values["total_bill_value"],
+            "consumption_value": values["consumption_value"],
+            "network_services_fees": values["network_services_fees"],
+            "fixed_subsidy_amount": values["fixed_subsidy_amount"],
+            "ocr_token": token,
+        }
+        confirm_form = OcrConfirmElectricityForm(initial=initial_data)
+
+    return render(
+        request,
+        "utility_bills/ocr_result.html",
+        {
+            "form": form,
+            "ocr_text": ocr_text,
+            "engine": engine,
+            "confidence": confidence,
+            "layout": layout,
+            "parsed": parsed,
+            "field_sources": field_sources if any(n != 1 for n in (field_sources or {}).values()) else None,
+            "confirm_form": confirm_form,
+            "utility_type": utility_type,
+        },
+    )
 
 
 @login_required
@@ -248,69 +310,203 @@ def ocr_upload(request: HttpRequest) -> HttpResponse:
         if form.is_valid():
             utility_type = form.cleaned_data["utility_type"]
             engine = form.cleaned_data["engine"]
+            layout_hint = form.cleaned_data.get("layout") or ""
             files = request.FILES.getlist("images")
 
-            # Save uploads temporarily
-            tmpdir = tempfile.mkdtemp(prefix="ub_ocr_")
-            paths: list[str] = []
-            for f in files:
-                p = tmpdir + "/" + f.name
-                with open(p, "wb") as out:
-                    for chunk in f.chunks():
-                        out.write(chunk)
-                paths.append(p)
-
-            if engine == "paddleocr":
-                ocr_res = ocr_images_paddle(paths, lang="ar" if utility_type == UtilityType.ELECTRICITY else "en")
+            if app_setting("OCR_ASYNC"):
+                # Hand the images to the background worker; the job page polls for the result.
+                job = enqueue_ocr_job(request.user, utility_type, engine, files, layout_hint)
+                return redirect(reverse("utility_bills:ocr_job", kwargs={"job_id": job.id}))
+
+            # OCR straight from the uploads (no copies on disk); closed even if OCR fails.
+            images = UploadedImages(files)
+            admission = OcrAdmission(request.user.pk)
+            if "text/event-stream" in request.headers.get("Accept", ""):
+                try:
+                    admission.acquire()
+                except OcrBusy as e:
+                    images.close()
+                    return _ocr_busy(request, form, e)
+                response: HttpResponse = StreamingHttpResponse(
+                    _ocr_event_stream(request, form, images, admission, engine, utility_type, layout_hint),
+                    content_type="text/event-stream",
+                )
+                response["Cache-Control"] = "no-cache"
+                response["X-Accel-Buffering"] = "no"  # let nginx pass events through unbuffered
             else:
-                ocr_res = ocr_images_tesseract(paths, lang="ara+eng", psm=6)
-
-            layout = classify_layout(ocr_res.text)
-
-            # Parse and prepare confirmation form
-            parsed = None
-            confirm_form = None
-            if utility_type == UtilityType.ELECTRICITY:
-                parsed = parse_electricity_text(ocr_res.text)
-                # Pre-populate confirmation form with parsed values
-                initial_data: dict[str, Any] = {
-                    "meter_number": parsed.meter_number or "",
-                    "period_start": parsed.period_start,
-                    "period_end": parsed.period_end,
-                    "reading_date": parsed.reading_date,
-                    "import_previous": parsed.import_previous,
-                    "import_current": parsed.import_current,
-                    "export_previous": parsed.export_previous,
-                    "export_current": parsed.export_current,
-                    "billed_kwh": parsed.billed_kwh,
-                    "total_amount": parsed.total_bill_value,
-                    "consumption_value": parsed.consumption_value,
-                    "network_services_fees": parsed.network_services_fees,
-                    "fixed_subsidy_amount": parsed.fixed_subsidy_amount,
-                    "ocr_engine": ocr_res.engine,
-                    "raw_ocr_text": ocr_res.text,
-                }
-                confirm_form = OcrConfirmElectricityForm(initial=initial_data)
-
-            return render(
-                request,
-                "utility_bills/ocr_result.html",
-                {
-                    "form": form,
-                    "ocr_text": ocr_res.text,
-                    "engine": ocr_res.engine,
-                    "layout": layout,
-                    "parsed": parsed,
-                    "confirm_form": confirm_form,
-                    "utility_type": utility_type,
-                },
-            )
+                try:
+                    with images, admission:
+                        digests = store_image_blobs(images.sources)
+                        outcome = process_upload(images.sources, engine, utility_type, layout_hint)
+                except OcrBusy as e:
+                    return _ocr_busy(request, form, e)
+                except OcrEngineError as e:
+                    return _ocr_failed(request, form, e)
+                response = _render_ocr_result(
+                    request,
+                    form=form,
+                    utility_type=utility_type,
+                    ocr_text=outcome.ocr.text,
+                    engine=outcome.ocr.engine,
+                    layout=outcome.layout,
+                    parsed=outcome.parsed,
+                    confidence=outcome.ocr.confidence,
+                    image_digests=digests,
+                    field_sources=outcome.field_sources,
+                )
+            response["X-OCR-Temp-Bytes"] = str(images.temp_bytes)
+            return response
     else:
         form = OcrUploadForm()
 
     return render(request, "utility_bills/ocr_upload.html", {"form": form})
 
 
+def _ocr_busy(request: HttpRequest, form: OcrUploadForm, error: OcrBusy) -> HttpResponse:
+    """HTTP 429 with Retry-After, showing the upload form again."""
+    response = render(
+        request, "utility_bills/ocr_upload.html", {"form": form, "busy_error": str(error)}, status=429
+    )
+    response["Retry-After"] = str(error.retry_after)
+    return response
+
+
+def _ocr_failed(request: HttpRequest, form: OcrUploadForm, error: OcrEngineError) -> HttpResponse:
+    """Show the upload form again after an OCR engine error.
+
+    An image above the pixel limit is an error on the images field (413); a memory budget
+    that didn't free up in time is temporary (503 with Retry-After, like `_ocr_busy`); any
+    other engine error, e.g. a missing OCR dependency, is a 503.
+    """
+    context: dict[str, Any] = {"form": form}
+    if isinstance(error, OcrImageTooLarge):
+        form.add_error("images", str(error))
+        return render(request, "utility_bills/ocr_upload.html", context, status=413)
+    if isinstance(error, OcrMemoryBusy):
+        context["busy_error"] = str(error)
+        response = render(request, "utility_bills/ocr_upload.html", context, status=503)
+        response["Retry-After"] = str(error.retry_after)
+        return response
+    logger.warning("OCR upload failed: %s", error)
+    form.add_error(None, str(error))
+    return render(request, "utility_bills/ocr_upload.html", context, status=503)
+
+
+def _sse(event: str, data: dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+
+
+def _ocr_event_stream(
+    request: HttpRequest,
+    form: OcrUploadForm,
+    images: UploadedImages,
+    admission: OcrAdmission,
+    engine: str,
+    utility_type: str,
+    layout_hint: str,
+) -> Iterator[str]:
+    """Server-sent events for a streamed OCR upload.
+
+    `page` events carry each image's text and the parse of the pages so far; the final
+    `result` event carries the merged parse and the rendered confirm page. If the client
+    disconnects, the server stops iterating and the remaining images are never OCR'd.
+    `admission` is already acquired and is released when the stream ends.
+    """
+    try:
+        with images:
+            digests = store_image_blobs(images.sources)
+            for item in iter_upload(images.sources, engine, utility_type, layout_hint):
+                if isinstance(item, PageProgress):
+                    yield _sse(
+                        "page",
+                        {
+                            "index": item.index,
+                            "total": item.total,
+                            "engine": item.ocr.engine,
+                            "confidence": item.ocr.confidence,
+                            "seconds": sum(item.ocr.image_seconds),
+                            "text": item.ocr.pages[0] if item.ocr.pages else "",
+                            "parsed": dataclasses.asdict(item.parsed) if item.parsed is not None else None,
+                            "field_sources": item.field_sources,
+                        },
+                    )
+                    continue
+                page = _render_ocr_result(
+                    request,
+                    form=form,
+                    utility_type=utility_type,
+                    ocr_text=item.ocr.text,
+                    engine=item.ocr.engine,
+                    layout=item.layout,
+                    parsed=item.parsed,
+                    confidence=item.ocr.confidence,
+                    image_digests=digests,
+                    field_sources=item.field_sources,
+                )
+                yield _sse(
+                    "result",
+                    {
+                        "engine": item.ocr.engine,
+                        "confidence": item.ocr.confidence,
+                        "layout": item.layout,
+                        "layout_runner_ups": item.layout_runner_ups,
+                        "parsed": dataclasses.asdict(item.parsed) if item.parsed is not None else None,
+                        "field_sources": item.field_sources,
+                        "html": page.content.decode(page.charset),
+                    },
+                )
+    except OcrEngineError as e:
+        # Headers are already sent, so the status `_ocr_failed` would use can't be; the
+        # event carries the same details instead.
+        logger.warning("Streamed OCR upload failed: %s", e)
+        data: dict[str, Any] = {"error": str(e)}
+        if isinstance(e, OcrImageTooLarge):
+            data["field"] = "images"
+        if isinstance(e, OcrMemoryBusy):
+            data["retry_after"] = e.retry_after
+        yield _sse("error", data)
+    except Exception as e:
+        # Headers are already sent, so report the failure as an event instead of a 500.
+        logger.exception("Streamed OCR upload failed")
+        yield _sse("error", {"error": f"{type(e).__name__}: {e}"})
+    finally:
+        admission.release()
+
+
+@login_required
+def ocr_job(request: HttpRequest, job_id: int) -> HttpResponse:
+    """Result page of a background OCR job; shows a polling placeholder until the job finishes."""
+    job = get_object_or_404(OcrJob, id=job_id, user=request.user)
+    if job.status != OcrJobStatus.DONE:
+        return render(request, "utility_bills/ocr_job.html", {"job": job})
+    return _render_ocr_result(
+        request,
+        utility_type=job.utility_type,
+        ocr_text=job.ocr_text,
+        engine=job.ocr_engine,
+        layout=job.layout,
+        parsed=job.parsed,
+        confidence=job.ocr_confidence,
+        image_digests=job.image_digests,
+        field_sources=job.field_sources,
+    )
+
+
+@login_required
+@require_GET
+def ocr_job_status(request: HttpRequest, job_id: int) -> HttpResponse:
+    job = get_object_or_404(OcrJob, id=job_id, user=request.user)
+    return JsonResponse(
+        {
+            "id": job.id,
+            "status": job.status,
+            "finished": job.is_finished,
+            "error": job.error,
+            "result_url": reverse("utility_bills:ocr_job", kwargs={"job_id": job.id}),
+        }
+    )
+
+
 @login_required
 def ocr_save(request: HttpRequest) -> HttpResponse:
     """Save OCR-parsed electricity bill after user confirmation."""
@@ -318,6 +514,17 @@ def ocr_save(request: HttpRequest) -> HttpResponse:
         return redirect(reverse("utility_bills:ocr_upload"))
 
     form = OcrConfirmElectricityForm(request.POST)
+    session = get_ocr_session(request.POST.get("ocr_token", ""), request.user.pk)
+    if session is None:
+        return render(
+            request,
+            "utility_bills/ocr_result.html",
+            {
+                "utility_type": UtilityType.ELECTRICITY,
+                "session_error": "This OCR result has expired or was already saved. Please upload the images again.",
+            },
+        )
+
     if not form.is_valid():
         return render(
             request,
@@ -325,6 +532,8 @@ def ocr_save(request: HttpRequest) -> HttpResponse:
             {
                 "confirm_form": form,
                 "utility_type": UtilityType.ELECTRICITY,
+                "ocr_text": session.ocr_text,
+                "engine": session.engine,
                 "errors": form.errors,
             },
         )
@@ -346,12 +555,14 @@ def ocr_save(request: HttpRequest) -> HttpResponse:
             {
                 "confirm_form": form,
                 "utility_type": UtilityType.ELECTRICITY,
+                "ocr_text": session.ocr_text,
+                "engine": session.engine,
                 "meter_error": f"Meter '{meter_number}' not found. Please add this meter first.",
             },
         )
 
     # Compute needs_review flag
-    needs_review, review_reasons = form.compute_needs_review(meter_found=meter_found)
+    needs_review, review_reasons = form.compute_needs_review(meter_found=meter_found, parsed=session.parsed)
 
     # Create UtilityBill
     bill = UtilityBill.objects.create(
@@ -363,8 +574,10 @@ def ocr_save(request: HttpRequest) -> HttpResponse:
         reading_date=form.cleaned_data.get("reading_date"),
         total_amount=form.cleaned_data.get("total_amount") or Decimal("0.000"),
         data_source=DataSource.OCR,
-        ocr_engine=form.cleaned_data.get("ocr_engine", ""),
-        raw_ocr_text=form.cleaned_data.get("raw_ocr_text", ""),
+        # OCR audit data comes from the server-side session, never from the posted form.
+        ocr_engine=session.engine,
+        ocr_confidence=None if session.confidence is None else Decimal(str(round(session.confidence, 4))),
+        raw_ocr_text=session.ocr_text,
         needs_review=needs_review,
     )
 
@@ -380,5 +593,7 @@ def ocr_save(request: HttpRequest) -> HttpResponse:
         network_services_fees=form.cleaned_data.get("network_services_fees"),
         fixed_subsidy_amount=form.cleaned_data.get("fixed_subsidy_amount"),
     )
+    link_bill_images(bill, session.image_digests)
+    discard_ocr_session(form.cleaned_data["ocr_token"])
 
     return redirect(reverse("utility_bills:bill_detail", kwargs={"bill_id": bill.id}))